@@ -8,6 +8,7 @@ from models.database import get_session
 from models.metrics import EvaluationType
 from models.metrics_schemas import EvaluationTypeOut
 from core.security import require_permission
+from services.dim_cache import invalidate_dims
 
 router = APIRouter(prefix="/api/v1/evaluation_types", tags=["evaluation-types"])
 
@@ -38,6 +39,7 @@ async def types_create(payload: dict, session: AsyncSession = Depends(get_sessio
     obj = EvaluationType(type_name=name)
     session.add(obj)
     await session.commit()
+    await invalidate_dims()
     await session.refresh(obj)
     return EvaluationTypeOut.model_validate(obj)
 
@@ -49,6 +51,7 @@ async def types_update(type_id: int, payload: dict, session: AsyncSession = Depe
     if "type_name" in payload and (payload["type_name"] or "").strip():
         obj.type_name = payload["type_name"].strip()
     await session.commit()
+    await invalidate_dims()
     await session.refresh(obj)
     return EvaluationTypeOut.model_validate(obj)
 
@@ -59,5 +62,6 @@ async def types_delete(type_id: int, session: AsyncSession = Depends(get_session
         raise HTTPException(status_code=404, detail="Type not found")
     await session.delete(obj)
     await session.commit()
+    await invalidate_dims()
     return {"deleted": 1}
 
@@ -1,10 +1,11 @@
 # =============================
 # app/api/endpoints/indicators.py
 # =============================
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Request
+from fastapi.responses import StreamingResponse, FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
+import functools
 import io
 from datetime import date
 import math
@@ -13,26 +14,26 @@ import numbers
 from models.common import PageResponse
 from models.metrics_schemas import MajorMetricsResponse, TypeMetricsResponse, DistrictMetricsResponse, CenterMetricsResponse, DistrictOut, MajorOut, CenterOut, EvaluationTypeOut, IndicatorSimpleOut, IndicatorDataCreate, IndicatorCenterDataCreate, IndicatorCenterDataDelete, CenterLatestQueryOut
 from models.metrics_schemas import IndicatorOut, IndicatorBase
-from models.metrics_schemas import IndicatorDataDelete
+from models.metrics_schemas import IndicatorDataDelete, PivotResponse, SeriesBatchQuery, SeriesBatchResponse
+from models.metrics_schemas import IndicatorRollupOut, IndicatorRollupResponse, IndicatorCenterRollupOut, IndicatorCenterRollupResponse
 from models.metrics_schemas import IndicatorDataOut, IndicatorCenterDataOut, IndicatorCenterDataResponse, IndicatorDataQuery, IndicatorLatestQueryOut, IndicatorDataResponse, IndicatorDashboardOut  
 from models.database import get_session
-from core.security import require_permission
-from models.metrics import IndicatorDataV2 as IndicatorData, Indicator, District, EvaluationType, Major, Center, IndicatorCenterData
-from sqlalchemy import select
-from utils.threadpool import run_pandas
+from core.security import require_permission, get_principal, Principal
+from core.response_cache import cached_response
+from core.content_negotiation import negotiated_response, parse_fields, NEGOTIATED_RESPONSES
+from core.json_response import validated_response
+from utils.threadpool import run_pandas_job
 from utils.excel_utils import (
     build_template_xlsx,
-    parse_indicator_upload_records,
-    parse_center_upload_records,
     parse_indicator_manage_upload_records,
-    build_export_xlsx,
-    build_center_pivot_xlsx,
-    build_district_pivot_xlsx,
 )
 from services.indicator_service import (
     query_metrics,
+    query_metrics_keyset,
     latest_metrics,
     query_series,
+    query_series_batch,
+    query_rollup,
     delete_metrics,
     get_indicators_by_district, 
     get_latest_indicator_data, 
@@ -49,6 +50,7 @@ from services.indicator_service import (
     get_all_centers,
     get_indicators_by_center,
     query_center_metrics,
+    query_center_metrics_keyset,
     create_center_data,
     update_center_data,
     delete_center_metrics,
@@ -56,6 +58,19 @@ from services.indicator_service import (
     query_center_series
 )
 from services.indicator_service import update_indicator_data
+from services.upload_service import import_indicator_upload, import_center_upload, import_indicator_manage_records
+from services.export_jobs import create_export_job, get_export_job, export_job_file
+from services.import_jobs import create_import_job, get_import_job, import_job_errors_file
+from services.pivot_service import query_pivot
+from services.job_store import public_job
+from services.export_service import (
+    make_export_writer,
+    stream_export,
+    write_metrics_export,
+    write_center_export,
+    write_district_pivot,
+    write_center_pivot,
+)
 
 router = APIRouter(prefix="/api/v1/metrics", tags=["metrics"])
 
@@ -91,6 +106,7 @@ async def get_evaluation_types(session: AsyncSession = Depends(get_session)):
     return await get_all_evaluation_types(session)
 
 @router.get("/circles", response_model=list[int])
+@cached_response(list[int])
 async def get_circles(session: AsyncSession = Depends(get_session)):
     """
     获取所有圈层ID列表（来自区县表去重）
@@ -98,6 +114,7 @@ async def get_circles(session: AsyncSession = Depends(get_session)):
     return await get_all_circles(session)
 
 @router.get("/centers", response_model=list[CenterOut], dependencies=[Depends(require_permission("indicator_data:view"))])
+@cached_response(list[CenterOut])
 async def get_centers(
     district_id: Optional[int] = Query(None),
     session: AsyncSession = Depends(get_session),
@@ -105,6 +122,7 @@ async def get_centers(
     return await get_all_centers(session, district_id=district_id)
 
 @router.get("/center", response_model=CenterMetricsResponse, dependencies=[Depends(require_permission("indicator_data:view"))])
+@cached_response(CenterMetricsResponse)
 async def query_center_indicators(
     center_id: int | None = None,
     center_name: str | None = None,
@@ -119,8 +137,9 @@ async def query_center_indicators(
     )
     return data
 
-@router.get("/center/query", response_model=IndicatorCenterDataResponse, dependencies=[Depends(require_permission("indicator_data:view"))])
+@router.get("/center/query", response_model=IndicatorCenterDataResponse, responses=NEGOTIATED_RESPONSES, dependencies=[Depends(require_permission("indicator_data:view"))])
 async def center_metrics_query(
+    request: Request,
     indicator_id: Optional[int] = Query(None),
     center_id: Optional[int] = Query(None),
     district_id: Optional[int] = Query(None),
@@ -132,10 +151,14 @@ async def center_metrics_query(
     size: int = Query(50, ge=1, le=1000),
     order_by: str = Query("stat_date"),
     desc: bool = Query(True),
+    paging: str = Query("offset", pattern="^(offset|cursor)$", description="offset：页码分页；cursor：游标分页"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor"),
+    with_total: str = Query("exact", pattern="^(false|exact|estimate)$", description="false：不计数；exact：精确计数（缓存）；estimate：估算"),
+    fields: Optional[str] = Query(None, description="只返回这些字段（逗号分隔，如 indicator_id,stat_date,value）；只查询对应列，跳过 ORM 与逐行校验"),
     session: AsyncSession = Depends(get_session),
 ):
-    rows, total = await query_center_metrics(
-        session=session,
+    names = parse_fields(fields, IndicatorCenterDataOut)
+    filters = dict(
         indicator_id=indicator_id,
         center_id=center_id,
         district_id=district_id,
@@ -143,12 +166,30 @@ async def center_metrics_query(
         end_date=end_date,
         major_id=major_id,
         type_id=type_id,
+    )
+    if paging == "cursor" or cursor:
+        rows, total, next_cursor = await query_center_metrics_keyset(
+            session=session,
+            cursor=cursor,
+            size=size,
+            order_by=order_by,
+            desc_order=desc,
+            with_total=with_total,
+            fields=names,
+            **filters,
+        )
+        return negotiated_response(request, {"items": rows, "total": total, "next_cursor": next_cursor}, IndicatorCenterDataOut, fields=names)
+    rows, total = await query_center_metrics(
+        session=session,
         page=page,
         size=size,
         order_by=order_by,
         desc_order=desc,
+        with_total=with_total,
+        fields=names,
+        **filters,
     )
-    return {"items": rows, "total": total}
+    return negotiated_response(request, {"items": rows, "total": total}, IndicatorCenterDataOut, fields=names)
 
 @router.get("/center/by_name_or_id", response_model=list[CenterLatestQueryOut], dependencies=[Depends(require_permission("indicator_data:view"))])
 async def get_centers_by_name_or_id(
@@ -166,15 +207,22 @@ async def get_centers_by_name_or_id(
         district_id=district_id,
     )
 
-@router.get("/center/series", response_model=IndicatorCenterDataResponse, dependencies=[Depends(require_permission("indicator_data:view"))])
+@router.get("/center/series", response_model=IndicatorCenterDataResponse, responses=NEGOTIATED_RESPONSES, dependencies=[Depends(require_permission("indicator_data:view"))])
 async def center_metrics_series(
+    request: Request,
     indicator_id: int = Query(...),
     center_id: Optional[int] = Query(None),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     size: int = Query(180, ge=1, le=1000),
+    with_total: str = Query("exact", pattern="^(false|exact|estimate)$", description="false：不计数；exact：精确计数（缓存）；estimate：估算"),
+    bucket: str = Query("day", pattern="^(day|week|month|quarter)$", description="时间粒度：day 原始数据；week / month / quarter 按 dim_date 聚合，stat_date 为桶起始日"),
+    agg: str = Query("avg", pattern="^(avg|last|min|max)$", description="桶内聚合方式（bucket≠day 时生效）"),
+    max_points: Optional[int] = Query(None, ge=3, le=5000, description="每个实体最多返回的点数（LTTB 降采样）；指定后不再按 size 截断"),
+    fields: Optional[str] = Query(None, description="只返回这些字段（逗号分隔，如 indicator_id,stat_date,value）；只查询对应列，跳过 ORM 与逐行校验"),
     session: AsyncSession = Depends(get_session),
 ):
+    names = parse_fields(fields, IndicatorCenterDataOut)
     rows, total = await query_center_series(
         session=session,
         indicator_id=indicator_id,
@@ -182,9 +230,50 @@ async def center_metrics_series(
         start_date=start_date,
         end_date=end_date,
         size=size,
+        with_total=with_total,
+        bucket=bucket,
+        agg=agg,
+        max_points=max_points,
+        fields=names,
     )
-    return {"items": rows, "total": total}
+    return negotiated_response(request, {"items": rows, "total": total}, IndicatorCenterDataOut, fields=names)
 
+@router.get("/center/rollup", response_model=IndicatorCenterRollupResponse, responses=NEGOTIATED_RESPONSES, summary="支撑中心指标周 / 月 / 季预聚合（avg / last / min / max）", dependencies=[Depends(require_permission("indicator_data:view"))])
+@cached_response(IndicatorCenterRollupResponse, item_model=IndicatorCenterRollupOut)
+async def center_metrics_rollup(
+    period: str = Query("month", pattern="^(week|month|quarter)$", description="周期：week（ISO 周）/ month / quarter"),
+    indicator_id: Optional[int] = Query(None),
+    center_id: Optional[int] = Query(None),
+    district_id: Optional[int] = Query(None),
+    circle_id: Optional[int] = Query(None),
+    major_id: Optional[int] = Query(None),
+    type_id: Optional[int] = Query(None),
+    start_date: Optional[date] = Query(None, description="周期起始日下限（所在周期包含在内）"),
+    end_date: Optional[date] = Query(None, description="周期起始日上限"),
+    page: int = Query(1, ge=1),
+    size: int = Query(50, ge=1, le=1000),
+    desc: bool = Query(True),
+    with_total: str = Query("exact", pattern="^(false|exact|estimate)$", description="false：不计数；exact：精确计数（缓存）；estimate：估算"),
+    session: AsyncSession = Depends(get_session),
+):
+    rows, total = await query_rollup(
+        session=session,
+        entity="center",
+        period=period,
+        indicator_id=indicator_id,
+        entity_id=center_id,
+        district_id=district_id,
+        circle_id=circle_id,
+        major_id=major_id,
+        type_id=type_id,
+        start_date=start_date,
+        end_date=end_date,
+        page=page,
+        size=size,
+        desc_order=desc,
+        with_total=with_total,
+    )
+    return {"items": rows, "total": total}
 
 @router.get("/list", response_model=list[IndicatorSimpleOut])
 async def get_indicators_list(session: AsyncSession = Depends(get_session)):
@@ -275,8 +364,9 @@ async def delete_data(
 #     )
 
 
-@router.get("/query", response_model=IndicatorDataResponse, dependencies=[Depends(require_permission("indicator_data:view"))])
+@router.get("/query", response_model=IndicatorDataResponse, responses=NEGOTIATED_RESPONSES, dependencies=[Depends(require_permission("indicator_data:view"))])
 async def metrics_query(
+    request: Request,
     indicator_id: Optional[int] = Query(None),
     district_id: Optional[int] = Query(None),
     district_ids: Optional[list[int]] = Query(None),
@@ -290,10 +380,14 @@ async def metrics_query(
     size: int = Query(50, ge=1, le=1000),
     order_by: str = Query("stat_date"),
     desc: bool = Query(True),
+    paging: str = Query("offset", pattern="^(offset|cursor)$", description="offset：页码分页；cursor：游标分页"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor"),
+    with_total: str = Query("exact", pattern="^(false|exact|estimate)$", description="false：不计数；exact：精确计数（缓存）；estimate：估算"),
+    fields: Optional[str] = Query(None, description="只返回这些字段（逗号分隔，如 indicator_id,stat_date,value）；只查询对应列，跳过 ORM 与逐行校验"),
     session: AsyncSession = Depends(get_session),
 ):
-    rows, total = await query_metrics(
-        session=session,
+    names = parse_fields(fields, IndicatorDataOut)
+    filters = dict(
         indicator_id=indicator_id,
         district_id=district_id,
         district_ids=district_ids,
@@ -303,22 +397,47 @@ async def metrics_query(
         end_date=end_date,
         major_id=major_id,
         type_id=type_id,
+    )
+    if paging == "cursor" or cursor:
+        rows, total, next_cursor = await query_metrics_keyset(
+            session=session,
+            cursor=cursor,
+            size=size,
+            order_by=order_by,
+            desc_order=desc,
+            with_total=with_total,
+            fields=names,
+            **filters,
+        )
+        return negotiated_response(request, {"items": rows, "total": total, "next_cursor": next_cursor}, IndicatorDataOut, fields=names)
+    rows, total = await query_metrics(
+        session=session,
         page=page,
         size=size,
         order_by=order_by,
         desc_order=desc,
+        with_total=with_total,
+        fields=names,
+        **filters,
     )
-    return {"items": rows, "total": total}
+    return negotiated_response(request, {"items": rows, "total": total}, IndicatorDataOut, fields=names)
 
-@router.get("/series", response_model=IndicatorDataResponse, dependencies=[Depends(require_permission("indicator_data:view"))])
+@router.get("/series", response_model=IndicatorDataResponse, responses=NEGOTIATED_RESPONSES, dependencies=[Depends(require_permission("indicator_data:view"))])
 async def metrics_series(
+    request: Request,
     indicator_id: int = Query(...),
     district_id: Optional[int] = Query(None),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     size: int = Query(180, ge=1, le=1000),
+    with_total: str = Query("exact", pattern="^(false|exact|estimate)$", description="false：不计数；exact：精确计数（缓存）；estimate：估算"),
+    bucket: str = Query("day", pattern="^(day|week|month|quarter)$", description="时间粒度：day 原始数据；week / month / quarter 按 dim_date 聚合，stat_date 为桶起始日"),
+    agg: str = Query("avg", pattern="^(avg|last|min|max)$", description="桶内聚合方式（bucket≠day 时生效）"),
+    max_points: Optional[int] = Query(None, ge=3, le=5000, description="每个实体最多返回的点数（LTTB 降采样）；指定后不再按 size 截断"),
+    fields: Optional[str] = Query(None, description="只返回这些字段（逗号分隔，如 indicator_id,stat_date,value）；只查询对应列，跳过 ORM 与逐行校验"),
     session: AsyncSession = Depends(get_session),
 ):
+    names = parse_fields(fields, IndicatorDataOut)
     rows, total = await query_series(
         session=session,
         indicator_id=indicator_id,
@@ -326,10 +445,35 @@ async def metrics_series(
         start_date=start_date,
         end_date=end_date,
         size=size,
+        with_total=with_total,
+        bucket=bucket,
+        agg=agg,
+        max_points=max_points,
+        fields=names,
     )
-    return {"items": rows, "total": total}
-@router.get("/snapshot", response_model=IndicatorDataResponse, dependencies=[Depends(require_permission("indicator_data:view"))])
+    return negotiated_response(request, {"items": rows, "total": total}, IndicatorDataOut, fields=names)
+
+@router.post("/series/batch", response_model=SeriesBatchResponse, summary="批量趋势（多指标 × 多区县/支撑中心，一次查询，列式返回）", dependencies=[Depends(require_permission("indicator_data:view"))])
+async def metrics_series_batch(
+    payload: SeriesBatchQuery,
+    session: AsyncSession = Depends(get_session),
+):
+    return validated_response(await query_series_batch(
+        session=session,
+        entity=payload.entity,
+        indicator_ids=payload.indicator_ids,
+        entity_ids=payload.district_ids if payload.entity == "district" else payload.center_ids,
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+        bucket=payload.bucket,
+        agg=payload.agg,
+        max_points=payload.max_points,
+    ))
+
+@router.get("/snapshot", response_model=IndicatorDataResponse, responses=NEGOTIATED_RESPONSES, dependencies=[Depends(require_permission("indicator_data:view"))])
+@cached_response(IndicatorDataResponse, item_model=IndicatorDataOut)
 async def metrics_snapshot(
+    request: Request,
     indicator_id: Optional[int] = Query(None),
     district_id: Optional[int] = Query(None),
     district_name: Optional[str] = Query(None),
@@ -340,8 +484,11 @@ async def metrics_snapshot(
     size: int = Query(50, ge=1, le=1000),
     order_by: str = Query("stat_date"),
     desc: bool = Query(True),
+    with_total: str = Query("exact", pattern="^(false|exact|estimate)$", description="false：不计数；exact：精确计数（缓存）；estimate：估算"),
+    fields: Optional[str] = Query(None, description="只返回这些字段（逗号分隔，如 indicator_id,stat_date,value）；只查询对应列，跳过 ORM 与逐行校验"),
     session: AsyncSession = Depends(get_session),
 ):
+    names = parse_fields(fields, IndicatorDataOut)
     rows, total = await latest_metrics(
         session=session,
         indicator_id=indicator_id,
@@ -354,6 +501,46 @@ async def metrics_snapshot(
         size=size,
         order_by=order_by,
         desc_order=desc,
+        with_total=with_total,
+        fields=names,
+    )
+    if names:
+        # 列投影的 dict 行直接编码（缓存层按返回的 Response 存储）
+        return negotiated_response(request, {"items": rows, "total": total}, IndicatorDataOut, fields=names)
+    return {"items": rows, "total": total}
+
+@router.get("/rollup", response_model=IndicatorRollupResponse, responses=NEGOTIATED_RESPONSES, summary="区县指标周 / 月 / 季预聚合（avg / last / min / max）", dependencies=[Depends(require_permission("indicator_data:view"))])
+@cached_response(IndicatorRollupResponse, item_model=IndicatorRollupOut)
+async def metrics_rollup(
+    period: str = Query("month", pattern="^(week|month|quarter)$", description="周期：week（ISO 周）/ month / quarter"),
+    indicator_id: Optional[int] = Query(None),
+    district_id: Optional[int] = Query(None),
+    circle_id: Optional[int] = Query(None),
+    major_id: Optional[int] = Query(None),
+    type_id: Optional[int] = Query(None),
+    start_date: Optional[date] = Query(None, description="周期起始日下限（所在周期包含在内）"),
+    end_date: Optional[date] = Query(None, description="周期起始日上限"),
+    page: int = Query(1, ge=1),
+    size: int = Query(50, ge=1, le=1000),
+    desc: bool = Query(True),
+    with_total: str = Query("exact", pattern="^(false|exact|estimate)$", description="false：不计数；exact：精确计数（缓存）；estimate：估算"),
+    session: AsyncSession = Depends(get_session),
+):
+    rows, total = await query_rollup(
+        session=session,
+        entity="district",
+        period=period,
+        indicator_id=indicator_id,
+        entity_id=district_id,
+        circle_id=circle_id,
+        major_id=major_id,
+        type_id=type_id,
+        start_date=start_date,
+        end_date=end_date,
+        page=page,
+        size=size,
+        desc_order=desc,
+        with_total=with_total,
     )
     return {"items": rows, "total": total}
 
@@ -392,7 +579,7 @@ async def download_upload_template(session: AsyncSession = Depends(get_session))
         "零容忍值": 0,
         "得分": 95.5,
     }
-    xlsx = await run_pandas(build_template_xlsx, columns, desc_row, sample_row, "模板")
+    xlsx = await run_pandas_job(build_template_xlsx, columns, desc_row, sample_row, "模板")
     buf = io.BytesIO(xlsx)
     return StreamingResponse(buf, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", headers={"Content-Disposition": "attachment; filename=indicator_import_template.xlsx"})
 @router.post("/upload", status_code=201, dependencies=[Depends(require_permission("indicator_data:add"))])
@@ -409,128 +596,53 @@ async def upload_indicator_data(
 
     try:
         contents = await file.read()
-        records, row_count = await run_pandas(parse_indicator_upload_records, contents)
-
-        # Process each row
-        # To optimize, we should cache indicators and districts
-        indicators = (await session.execute(select(Indicator))).scalars().all()
-        ind_map = {i.indicator_name: i for i in indicators}
-        
-        districts = (await session.execute(select(District))).scalars().all()
-        dist_map = {d.district_name: d for d in districts}
-        dist_simple_map = {d.simple_name: d for d in districts}
-        eval_types = (await session.execute(select(EvaluationType))).scalars().all()
-        type_name_map = {t.type_name: t.type_id for t in eval_types}
-        
-        new_data = []
-        errors = []
-        
-        for index, row in enumerate(records):
-            ind_name = row.get("indicator_name")
-            dist_name = row.get("district_name")
-            
-            if ind_name not in ind_map:
-                errors.append(f"Row {index+1}: Indicator '{ind_name}' not found")
-                continue
-            dist = dist_map.get(dist_name) or dist_simple_map.get(dist_name)
-            if not dist:
-                errors.append(f"Row {index+1}: District '{dist_name}' not found")
-                continue
-                
-            ind = ind_map[ind_name]
-            
-            # Determine type_id from excel or indicator default
-            provided_type_id = None
-            if "type_id" in row and row.get("type_id") is not None:
-                try:
-                    provided_type_id = int(row.get('type_id'))
-                except Exception:
-                    errors.append(f"Row {index+1}: Invalid type_id value")
-                    continue
-            elif "type_name" in row and row.get("type_name") is not None:
-                tname = str(row.get('type_name')).strip()
-                if tname in type_name_map:
-                    provided_type_id = type_name_map[tname]
-                else:
-                    errors.append(f"Row {index+1}: Evaluation type '{tname}' not found")
-                    continue
-
-            # Validate provided type if any
-            if provided_type_id is not None and ind.type_id is not None and provided_type_id != ind.type_id:
-                errors.append(f"Row {index+1}: type_id mismatch with indicator definition")
-                continue
-
-            final_type_id = provided_type_id or ind.type_id
-
-            # Check for existing data
-            stat_date = row.get("stat_date")
-            if not stat_date:
-                errors.append(f"Row {index+1}: Invalid stat_date value")
-                continue
-            existing_stmt = select(IndicatorData).where(
-                IndicatorData.indicator_id == ind.indicator_id,
-                IndicatorData.district_id == dist.district_id,
-                IndicatorData.stat_date == stat_date
-            )
-            existing = (await session.execute(existing_stmt)).scalar_one_or_none()
-
-            value = _nan_to_none(row.get("value"))
-            benchmark = _nan_to_none(row.get("benchmark"))
-            challenge = _nan_to_none(row.get("challenge"))
-            exemption = _nan_to_none(row.get("exemption"))
-            zero_tolerance = _nan_to_none(row.get("zero_tolerance"))
-            score = _nan_to_none(row.get("score"))
-
-            if existing:
-                existing.value = value
-                existing.benchmark = benchmark
-                existing.challenge = challenge
-                if exemption is not None:
-                    existing.exemption = exemption
-                if zero_tolerance is not None:
-                    existing.zero_tolerance = zero_tolerance
-                if score is not None:
-                    existing.score = score
-                if existing.type_id is None:
-                    existing.type_id = final_type_id
-                if existing.major_id is None:
-                    existing.major_id = ind.major_id
-                # ...
-            else:
-                # Create IndicatorData object
-                data_obj = IndicatorData(
-                    indicator_id=ind.indicator_id,
-                    indicator_name=ind.indicator_name,
-                    type_id=final_type_id,
-                    major_id=ind.major_id,
-                    is_positive=ind.is_positive,
-                    circle_id=dist.circle_id or 0, # Default to 0 if None
-                    district_id=dist.district_id,
-                    district_name=dist.district_name,
-                    stat_date=stat_date,
-                    value=value,
-                    benchmark=benchmark,
-                    challenge=challenge,
-                    exemption=exemption,
-                    zero_tolerance=zero_tolerance,
-                    score=score,
-                    # ... other fields
-                )
-                session.add(data_obj)
-            
-        if errors:
-            await session.rollback()
-            raise HTTPException(status_code=400, detail={"message": "Data validation failed", "errors": errors[:10]}) # Return first 10 errors
-            
-        await session.commit()
+        row_count = await import_indicator_upload(session, contents)
         return {"message": "Data uploaded successfully", "count": row_count}
-        
+
+    except HTTPException:
+        await session.rollback()
+        raise
     except Exception as e:
         await session.rollback()
         if isinstance(e, ValueError):
             raise HTTPException(status_code=400, detail=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _create_upload_job(entity: str, file: UploadFile, skip_invalid: bool, principal: Principal) -> dict:
+    if not file.filename.endswith((".xls", ".xlsx")):
+        raise HTTPException(status_code=400, detail="Only Excel files are allowed")
+    contents = await file.read()
+    return create_import_job(entity, file.filename, contents, skip_invalid, principal.id)
+
+@router.post("/upload/jobs", status_code=202, summary="异步导入区县指标数据（返回任务ID，完整错误清单可下载）", dependencies=[Depends(require_permission("indicator_data:add"))])
+async def create_upload_job(
+    file: UploadFile = File(...),
+    skip_invalid: bool = Query(True, description="True：跳过校验失败的行，其余分块提交；False：有失败行则整体不导入"),
+    principal: Principal = Depends(get_principal),
+):
+    return await _create_upload_job("district", file, skip_invalid, principal)
+
+@router.post("/center/upload/jobs", status_code=202, summary="异步导入支撑中心指标数据（返回任务ID，完整错误清单可下载）", dependencies=[Depends(require_permission("indicator_data:add"))])
+async def create_center_upload_job(
+    file: UploadFile = File(...),
+    skip_invalid: bool = Query(True, description="True：跳过校验失败的行，其余分块提交；False：有失败行则整体不导入"),
+    principal: Principal = Depends(get_principal),
+):
+    return await _create_upload_job("center", file, skip_invalid, principal)
+
+@router.get("/upload/jobs/{job_id}", summary="查询导入任务状态（阶段、总行数、失败行数、已提交行数）", dependencies=[Depends(require_permission("indicator_data:add"))])
+async def upload_job_status(job_id: str, principal: Principal = Depends(get_principal)):
+    return public_job(get_import_job(job_id, principal))
+
+@router.get("/upload/jobs/{job_id}/errors", summary="下载导入错误清单（全部失败行及原因）", dependencies=[Depends(require_permission("indicator_data:add"))])
+async def upload_job_errors(job_id: str, principal: Principal = Depends(get_principal)):
+    path = import_job_errors_file(job_id, principal)
+    return FileResponse(
+        path,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename=f"import_errors_{job_id}.xlsx",
+    )
+
 @router.get("/center/upload/template", dependencies=[Depends(require_permission("indicator_data:add"))])
 async def download_center_upload_template(session: AsyncSession = Depends(get_session)):
     columns = [
@@ -560,7 +672,7 @@ async def download_center_upload_template(session: AsyncSession = Depends(get_se
         "挑战值": 150,
         "得分": 95.5,
     }
-    xlsx = await run_pandas(build_template_xlsx, columns, desc_row, sample_row, "模板")
+    xlsx = await run_pandas_job(build_template_xlsx, columns, desc_row, sample_row, "模板")
     buf = io.BytesIO(xlsx)
     return StreamingResponse(
         buf,
@@ -578,97 +690,11 @@ async def upload_center_indicator_data(
 
     try:
         contents = await file.read()
-        records, row_count = await run_pandas(parse_center_upload_records, contents)
-
-        indicators = (await session.execute(select(Indicator))).scalars().all()
-        ind_map = {i.indicator_name: i for i in indicators}
-        centers = (await session.execute(select(Center))).scalars().all()
-        center_map = {c.center_name: c for c in centers}
-        eval_types = (await session.execute(select(EvaluationType))).scalars().all()
-        type_name_map = {t.type_name: t.type_id for t in eval_types}
-
-        errors = []
-        for index, row in enumerate(records):
-            ind_name = row.get("indicator_name")
-            center_name = row.get("center_name")
-            if ind_name not in ind_map:
-                errors.append(f"Row {index+1}: Indicator '{ind_name}' not found")
-                continue
-            center = center_map.get(center_name)
-            if not center:
-                errors.append(f"Row {index+1}: Center '{center_name}' not found")
-                continue
-
-            ind = ind_map[ind_name]
-            provided_type_id = None
-            if "type_id" in row and row.get("type_id") is not None:
-                try:
-                    provided_type_id = int(row.get("type_id"))
-                except Exception:
-                    errors.append(f"Row {index+1}: Invalid type_id value")
-                    continue
-            elif "type_name" in row and row.get("type_name") is not None:
-                tname = str(row.get("type_name")).strip()
-                if tname in type_name_map:
-                    provided_type_id = type_name_map[tname]
-                else:
-                    errors.append(f"Row {index+1}: Evaluation type '{tname}' not found")
-                    continue
-
-            if provided_type_id is not None and ind.type_id is not None and provided_type_id != ind.type_id:
-                errors.append(f"Row {index+1}: type_id mismatch with indicator definition")
-                continue
-            final_type_id = provided_type_id or ind.type_id
-
-            stat_date = row.get("stat_date")
-            if not stat_date:
-                errors.append(f"Row {index+1}: Invalid stat_date value")
-                continue
-            existing_stmt = select(IndicatorCenterData).where(
-                IndicatorCenterData.indicator_id == ind.indicator_id,
-                IndicatorCenterData.center_id == center.center_id,
-                IndicatorCenterData.stat_date == stat_date,
-            )
-            existing = (await session.execute(existing_stmt)).scalar_one_or_none()
-
-            value = _nan_to_none(row.get("value"))
-            benchmark = _nan_to_none(row.get("benchmark"))
-            challenge = _nan_to_none(row.get("challenge"))
-            score = _nan_to_none(row.get("score"))
-
-            if existing:
-                existing.value = value
-                existing.benchmark = benchmark
-                existing.challenge = challenge
-                if score is not None:
-                    existing.score = score
-                if existing.type_id is None:
-                    existing.type_id = final_type_id
-                if existing.major_id is None:
-                    existing.major_id = ind.major_id
-            else:
-                data_obj = IndicatorCenterData(
-                    indicator_id=ind.indicator_id,
-                    indicator_name=ind.indicator_name,
-                    type_id=final_type_id,
-                    major_id=ind.major_id,
-                    is_positive=ind.is_positive,
-                    center_id=center.center_id,
-                    center_name=center.center_name,
-                    stat_date=stat_date,
-                    value=value,
-                    benchmark=benchmark,
-                    challenge=challenge,
-                    score=score,
-                )
-                session.add(data_obj)
-
-        if errors:
-            await session.rollback()
-            raise HTTPException(status_code=400, detail={"message": "Data validation failed", "errors": errors[:10]})
-
-        await session.commit()
+        row_count = await import_center_upload(session, contents)
         return {"message": "Data uploaded successfully", "count": row_count}
+    except HTTPException:
+        await session.rollback()
+        raise
     except Exception as e:
         await session.rollback()
         if isinstance(e, ValueError):
@@ -705,6 +731,14 @@ async def delete_center_metrics_data(
     )
     return {"deleted": deleted}
 
+def _export_response(producer, filename: str, fmt: str = "xlsx") -> StreamingResponse:
+    writer = make_export_writer(fmt)
+    return StreamingResponse(
+        stream_export(producer, writer),
+        media_type=writer.media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}.{writer.extension}"},
+    )
+
 @router.get("/export", summary="导出当前筛选指标数据为Excel", dependencies=[Depends(require_permission("indicator_data:view"))])
 async def export_metrics(
     indicator_id: Optional[int] = Query(None),
@@ -717,63 +751,20 @@ async def export_metrics(
     type_id: Optional[int] = Query(None),
     order_by: str = Query("stat_date"),
     desc: bool = Query(True),
-    session: AsyncSession = Depends(get_session),
+    fmt: str = Query("xlsx", alias="format", pattern="^(xlsx|csv|parquet)$", description="导出格式：xlsx | csv | parquet"),
 ):
-    all_items: list[dict] = []
-    page = 1
-    size = 1000
-    while True:
-        rows, total = await query_metrics(
-            session=session,
-            indicator_id=indicator_id,
-            district_id=district_id,
-            district_name=district_name,
-            circle_id=circle_id,
-            start_date=start_date,
-            end_date=end_date,
-            major_id=major_id,
-            type_id=type_id,
-            page=page,
-            size=size,
-            order_by=order_by,
-            desc_order=desc,
-        )
-        for r in rows:
-            all_items.append({
-                "indicator_name": getattr(r, "indicator_name", ""),
-                "district_name": getattr(r, "district_name", ""),
-                "stat_date": getattr(r, "stat_date", ""),
-                "value": getattr(r, "value", None),
-                "score": getattr(r, "score", None),
-                "benchmark": getattr(r, "benchmark", None),
-                "challenge": getattr(r, "challenge", None),
-                "exemption": getattr(r, "exemption", None),
-                "zero_tolerance": getattr(r, "zero_tolerance", None),
-            })
-        if page * size >= total or not rows:
-            break
-        page += 1
-    if not all_items:
-        all_items = [{"indicator_name": "", "district_name": "", "stat_date": "", "value": None}]
-    xlsx = await run_pandas(
-        build_export_xlsx,
-        all_items,
-        {
-            "indicator_name": "指标名称",
-            "district_name": "区县",
-            "stat_date": "统计日期",
-            "value": "完成值",
-            "score": "得分",
-            "benchmark": "基准值",
-            "challenge": "挑战值",
-            "exemption": "豁免值",
-            "zero_tolerance": "零容忍值",
-        },
-        "导出",
+    filters = dict(
+        indicator_id=indicator_id,
+        district_id=district_id,
+        district_name=district_name,
+        circle_id=circle_id,
+        start_date=start_date,
+        end_date=end_date,
+        major_id=major_id,
+        type_id=type_id,
     )
-    buf = io.BytesIO(xlsx)
-    fname = "metrics_export.xlsx"
-    return StreamingResponse(buf, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", headers={"Content-Disposition": f"attachment; filename={fname}"})
+    producer = functools.partial(write_metrics_export, filters=filters, order_by=order_by, desc_order=desc)
+    return _export_response(producer, "metrics_export", fmt)
 
 @router.get("/center/export", summary="导出当前筛选支撑中心指标数据为Excel", dependencies=[Depends(require_permission("indicator_data:view"))])
 async def export_center_metrics(
@@ -786,66 +777,19 @@ async def export_center_metrics(
     type_id: Optional[int] = Query(None),
     order_by: str = Query("stat_date"),
     desc: bool = Query(True),
-    session: AsyncSession = Depends(get_session),
+    fmt: str = Query("xlsx", alias="format", pattern="^(xlsx|csv|parquet)$", description="导出格式：xlsx | csv | parquet"),
 ):
-    all_items: list[dict] = []
-    page = 1
-    size = 2000
-    while True:
-        rows, total = await query_center_metrics(
-            session=session,
-            indicator_id=indicator_id,
-            center_id=center_id,
-            district_id=district_id,
-            start_date=start_date,
-            end_date=end_date,
-            major_id=major_id,
-            type_id=type_id,
-            page=page,
-            size=size,
-            order_by=order_by,
-            desc_order=desc,
-        )
-        for r in rows:
-            all_items.append(
-                {
-                    "indicator_name": getattr(r, "indicator_name", ""),
-                    "district_name": getattr(r, "district_name", ""),
-                    "center_name": getattr(r, "center_name", ""),
-                    "stat_date": getattr(r, "stat_date", ""),
-                    "value": getattr(r, "value", None),
-                    "benchmark": getattr(r, "benchmark", None),
-                    "challenge": getattr(r, "challenge", None),
-                    "score": getattr(r, "score", None),
-                }
-            )
-        if page * size >= total or not rows:
-            break
-        page += 1
-    if not all_items:
-        all_items = [{"indicator_name": "", "district_name": "", "center_name": "", "stat_date": "", "value": None}]
-    xlsx = await run_pandas(
-        build_export_xlsx,
-        all_items,
-        {
-            "indicator_name": "指标名称",
-            "district_name": "区县",
-            "center_name": "支撑中心",
-            "stat_date": "统计日期",
-            "value": "完成值",
-            "benchmark": "基准值",
-            "challenge": "挑战值",
-            "score": "得分",
-        },
-        "导出",
-    )
-    buf = io.BytesIO(xlsx)
-    fname = "center_metrics_export.xlsx"
-    return StreamingResponse(
-        buf,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={fname}"},
+    filters = dict(
+        indicator_id=indicator_id,
+        center_id=center_id,
+        district_id=district_id,
+        start_date=start_date,
+        end_date=end_date,
+        major_id=major_id,
+        type_id=type_id,
     )
+    producer = functools.partial(write_center_export, filters=filters, order_by=order_by, desc_order=desc)
+    return _export_response(producer, "center_metrics_export", fmt)
 
 @router.get("/center/export_v2", summary="汇总导出（支撑中心×指标，按统计时间分Sheet）", dependencies=[Depends(require_permission("indicator_data:view"))])
 async def export_center_metrics_v2(
@@ -858,59 +802,20 @@ async def export_center_metrics_v2(
     type_id: Optional[int] = Query(None),
     order_by: str = Query("stat_date"),
     desc: bool = Query(True),
-    session: AsyncSession = Depends(get_session),
+    fmt: str = Query("xlsx", alias="format", pattern="^(xlsx|csv|parquet)$", description="导出格式：xlsx | csv | parquet（多个统计日期合并为一张表，首列为统计日期）"),
 ):
-    page = 1
-    size = 3000
-    all_rows = []
-    while True:
-        rows, total = await query_center_metrics(
-            session=session,
-            indicator_id=indicator_id,
-            center_id=center_id,
-            district_id=district_id,
-            start_date=start_date,
-            end_date=end_date,
-            major_id=major_id,
-            type_id=type_id,
-            page=page,
-            size=size,
-            order_by=order_by,
-            desc_order=desc,
-        )
-        all_rows.extend(rows)
-        if page * size >= total or not rows:
-            break
-        page += 1
-    if not all_rows:
-        xlsx = await run_pandas(build_center_pivot_xlsx, [])
-        buf = io.BytesIO(xlsx)
-        return StreamingResponse(
-            buf,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": "attachment; filename=center_metrics_export.xlsx"},
-        )
-    pivot_rows = [
-        {
-            "indicator_id": getattr(r, "indicator_id", None),
-            "indicator_name": getattr(r, "indicator_name", None),
-            "is_positive": getattr(r, "is_positive", None),
-            "center_id": getattr(r, "center_id", None),
-            "center_name": getattr(r, "center_name", None),
-            "district_name": getattr(r, "district_name", None),
-            "stat_date": getattr(r, "stat_date", None),
-            "value": getattr(r, "value", None),
-            "score": getattr(r, "score", None),
-        }
-        for r in all_rows
-    ]
-    xlsx = await run_pandas(build_center_pivot_xlsx, pivot_rows)
-    buf = io.BytesIO(xlsx)
-    return StreamingResponse(
-        buf,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=center_metrics_export.xlsx"},
+    # 透视表按统计日期分 Sheet 依次写出，order_by/desc 决定指标列顺序
+    filters = dict(
+        indicator_id=indicator_id,
+        center_id=center_id,
+        district_id=district_id,
+        start_date=start_date,
+        end_date=end_date,
+        major_id=major_id,
+        type_id=type_id,
     )
+    producer = functools.partial(write_center_pivot, filters=filters, order_by=order_by, desc_order=desc)
+    return _export_response(producer, "center_metrics_export", fmt)
 
 @router.get("/export_v2", summary="导出为按统计时间分Sheet的透视表（区县×指标）", dependencies=[Depends(require_permission("indicator_data:view"))])
 async def export_metrics_v2(
@@ -925,68 +830,140 @@ async def export_metrics_v2(
     type_id: Optional[int] = Query(None),
     order_by: str = Query("stat_date"),
     desc: bool = Query(True),
+    fmt: str = Query("xlsx", alias="format", pattern="^(xlsx|csv|parquet)$", description="导出格式：xlsx | csv | parquet（多个统计日期合并为一张表，首列为统计日期）"),
+):
+    # 透视表按统计日期分 Sheet 依次写出，order_by/desc 决定指标列顺序
+    filters = dict(
+        indicator_id=indicator_id,
+        district_id=district_id,
+        district_ids=district_ids,
+        district_name=district_name,
+        circle_id=circle_id,
+        start_date=start_date,
+        end_date=end_date,
+        major_id=major_id,
+        type_id=type_id,
+    )
+    producer = functools.partial(write_district_pivot, filters=filters, order_by=order_by, desc_order=desc)
+    return _export_response(producer, "metrics_export", fmt)
+
+@router.get("/pivot", response_model=PivotResponse, summary="区县×指标透视（JSON，与 /export_v2 同源；不传日期时返回最新统计日期）", dependencies=[Depends(require_permission("indicator_data:view"))])
+@cached_response(PivotResponse)
+async def metrics_pivot(
+    indicator_id: Optional[int] = Query(None),
+    district_id: Optional[int] = Query(None),
+    district_ids: Optional[list[int]] = Query(None),
+    district_name: Optional[str] = Query(None),
+    circle_id: Optional[int] = Query(None),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    major_id: Optional[int] = Query(None),
+    type_id: Optional[int] = Query(None),
     session: AsyncSession = Depends(get_session),
 ):
-    page = 1
-    size = 2000
-    all_rows: list[IndicatorData] = []
-    while True:
-        rows, total = await query_metrics(
-            session=session,
-            indicator_id=indicator_id,
-            district_id=district_id,
-            district_ids=district_ids,
-            district_name=district_name,
-            circle_id=circle_id,
-            start_date=start_date,
-            end_date=end_date,
-            major_id=major_id,
-            type_id=type_id,
-            page=page,
-            size=size,
-            order_by=order_by,
-            desc_order=desc,
-        )
-        all_rows.extend(rows)
-        if page * size >= total or not rows:
-            break
-        page += 1
-    if not all_rows:
-        xlsx = await run_pandas(build_district_pivot_xlsx, [])
-        buf = io.BytesIO(xlsx)
-        return StreamingResponse(buf, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", headers={"Content-Disposition": "attachment; filename=metrics_export.xlsx"})
-    districts = (await session.execute(select(District))).scalars().all()
-    dist_map = {d.district_id: (d.circle_id or 0, d.district_name) for d in districts}
-    ind_ids = list({getattr(r, "indicator_id") for r in all_rows})
-    inds = (await session.execute(select(Indicator).where(Indicator.indicator_id.in_(ind_ids)))).scalars().all()
-    pos_map = {i.indicator_id: i.is_positive for i in inds}
-    name_map = {i.indicator_id: i.indicator_name for i in inds}
-    pivot_rows = []
-    for r in all_rows:
-        iid = getattr(r, "indicator_id")
-        did = getattr(r, "district_id")
-        circle_id, dname = dist_map.get(did, (0, getattr(r, "district_name")))
-        pivot_rows.append(
-            {
-                "district_id": did,
-                "district_name": dname,
-                "circle_id": circle_id,
-                "indicator_id": iid,
-                "indicator_name": name_map.get(iid, getattr(r, "indicator_name")),
-                "is_positive": pos_map.get(iid, 1),
-                "stat_date": getattr(r, "stat_date"),
-                "value": getattr(r, "value"),
-                "score": getattr(r, "score", None),
-            }
-        )
-    xlsx = await run_pandas(build_district_pivot_xlsx, pivot_rows)
-    buf = io.BytesIO(xlsx)
-    return StreamingResponse(buf, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", headers={"Content-Disposition": "attachment; filename=metrics_export.xlsx"})
+    filters = dict(
+        indicator_id=indicator_id,
+        district_id=district_id,
+        district_ids=district_ids,
+        district_name=district_name,
+        circle_id=circle_id,
+        start_date=start_date,
+        end_date=end_date,
+        major_id=major_id,
+        type_id=type_id,
+    )
+    # 透视矩阵由服务层按 PivotResponse 结构拼好，直接输出
+    return validated_response(await query_pivot(session, "district", filters))
+
+@router.get("/center/pivot", response_model=PivotResponse, summary="支撑中心×指标透视（JSON，与 /center/export_v2 同源；不传日期时返回最新统计日期）", dependencies=[Depends(require_permission("indicator_data:view"))])
+@cached_response(PivotResponse)
+async def center_metrics_pivot(
+    indicator_id: Optional[int] = Query(None),
+    center_id: Optional[int] = Query(None),
+    district_id: Optional[int] = Query(None),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    major_id: Optional[int] = Query(None),
+    type_id: Optional[int] = Query(None),
+    session: AsyncSession = Depends(get_session),
+):
+    filters = dict(
+        indicator_id=indicator_id,
+        center_id=center_id,
+        district_id=district_id,
+        start_date=start_date,
+        end_date=end_date,
+        major_id=major_id,
+        type_id=type_id,
+    )
+    return validated_response(await query_pivot(session, "center", filters))
+
+@router.post("/export_jobs", status_code=202, summary="创建异步导出任务（区县×指标透视，筛选条件同 /export_v2）", dependencies=[Depends(require_permission("indicator_data:view"))])
+async def create_metrics_export_job(
+    indicator_id: Optional[int] = Query(None),
+    district_id: Optional[int] = Query(None),
+    district_ids: Optional[list[int]] = Query(None),
+    district_name: Optional[str] = Query(None),
+    circle_id: Optional[int] = Query(None),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    major_id: Optional[int] = Query(None),
+    type_id: Optional[int] = Query(None),
+    fmt: str = Query("xlsx", alias="format", pattern="^(xlsx|csv|parquet)$", description="导出格式：xlsx | csv | parquet"),
+    principal: Principal = Depends(get_principal),
+):
+    filters = dict(
+        indicator_id=indicator_id,
+        district_id=district_id,
+        district_ids=district_ids,
+        district_name=district_name,
+        circle_id=circle_id,
+        start_date=start_date,
+        end_date=end_date,
+        major_id=major_id,
+        type_id=type_id,
+    )
+    producer = functools.partial(write_district_pivot, filters=filters)
+    return create_export_job(producer, "metrics_export", fmt, principal.id)
+
+@router.post("/center/export_jobs", status_code=202, summary="创建异步导出任务（支撑中心×指标透视，筛选条件同 /center/export_v2）", dependencies=[Depends(require_permission("indicator_data:view"))])
+async def create_center_export_job(
+    indicator_id: Optional[int] = Query(None),
+    center_id: Optional[int] = Query(None),
+    district_id: Optional[int] = Query(None),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    major_id: Optional[int] = Query(None),
+    type_id: Optional[int] = Query(None),
+    fmt: str = Query("xlsx", alias="format", pattern="^(xlsx|csv|parquet)$", description="导出格式：xlsx | csv | parquet"),
+    principal: Principal = Depends(get_principal),
+):
+    filters = dict(
+        indicator_id=indicator_id,
+        center_id=center_id,
+        district_id=district_id,
+        start_date=start_date,
+        end_date=end_date,
+        major_id=major_id,
+        type_id=type_id,
+    )
+    producer = functools.partial(write_center_pivot, filters=filters)
+    return create_export_job(producer, "center_metrics_export", fmt, principal.id)
+
+@router.get("/export_jobs/{job_id}", summary="查询导出任务状态（已处理行数、当前阶段）", dependencies=[Depends(require_permission("indicator_data:view"))])
+async def export_job_status(job_id: str, principal: Principal = Depends(get_principal)):
+    return public_job(get_export_job(job_id, principal))
+
+@router.get("/export_jobs/{job_id}/file", summary="下载已完成的导出文件", dependencies=[Depends(require_permission("indicator_data:view"))])
+async def export_job_download(job_id: str, principal: Principal = Depends(get_principal)):
+    job = export_job_file(job_id, principal)
+    return FileResponse(job["path"], media_type=job["media_type"], filename=job["filename"])
 
 @router.get(
     "/district",
     response_model=DistrictMetricsResponse
 )
+@cached_response(DistrictMetricsResponse)
 async def query_district_indicators(
     district_id: int | None = None,
     district_name: str | None = None,
@@ -1088,7 +1065,7 @@ async def indicators_upload_template(session: AsyncSession = Depends(get_session
         "版本": 1,
         "说明": "示例说明",
     }
-    xlsx = await run_pandas(build_template_xlsx, columns, desc_row, sample_row, "模板")
+    xlsx = await run_pandas_job(build_template_xlsx, columns, desc_row, sample_row, "模板")
     buf = io.BytesIO(xlsx)
     return StreamingResponse(buf, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", headers={"Content-Disposition": "attachment; filename=indicator_manage_template.xlsx"})
 
@@ -1101,99 +1078,14 @@ async def indicators_upload(
         raise HTTPException(status_code=400, detail="Only Excel files are allowed")
     contents = await file.read()
     try:
-        records, _row_count = await run_pandas(parse_indicator_manage_upload_records, contents)
+        records, _row_count = await run_pandas_job(parse_indicator_manage_upload_records, contents)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    majors = (await session.execute(select(Major))).scalars().all()
-    types = (await session.execute(select(EvaluationType))).scalars().all()
-    major_name_map = {m.major_name: m.major_id for m in majors}
-    type_name_map = {t.type_name: t.type_id for t in types}
-
-    from models.metrics import Indicator
-
-    errors = []
-    created = 0
-    updated = 0
-    for idx, row in enumerate(records):
-        name = str(row.get("indicator_name") or "").strip()
-        if not name:
-            errors.append(f"Row {idx+1}: indicator_name is required")
-            continue
-        unit = str(row.get("unit") or "").strip() or None
-        is_positive = row.get("is_positive")
-        status = row.get("status")
-        version = row.get("version") if row.get("version") is not None else 1
-        desc = str(row.get("description") or "").strip() or None
-
-        # resolve major_id/type_id from name or explicit id
-        maj_id = None
-        typ_id = None
-        if row.get("major_id") is not None:
-            try:
-                maj_id = int(row.get("major_id"))
-            except Exception:
-                errors.append(f"Row {idx+1}: invalid major_id")
-                continue
-        elif row.get("major_name") is not None:
-            maj_id = major_name_map.get(str(row.get("major_name")).strip())
-        if row.get("type_id") is not None:
-            try:
-                typ_id = int(row.get("type_id"))
-            except Exception:
-                errors.append(f"Row {idx+1}: invalid type_id")
-                continue
-        elif row.get("type_name") is not None:
-            typ_id = type_name_map.get(str(row.get("type_name")).strip())
-
-        if maj_id is None:
-            errors.append(f"Row {idx+1}: major not resolved")
-            continue
-        if typ_id is None:
-            errors.append(f"Row {idx+1}: type not resolved")
-            continue
-        if is_positive is None:
-            errors.append(f"Row {idx+1}: is_positive required")
-            continue
-        if status is None:
-            status = 1
-
-        # upsert by indicator_name + major_id + type_id
-        existing = (await session.execute(
-            select(Indicator).where(
-                Indicator.indicator_name == name,
-                Indicator.major_id == maj_id,
-                Indicator.type_id == typ_id
-            )
-        )).scalar_one_or_none()
-
-        if existing:
-            existing.unit = unit
-            existing.is_positive = int(is_positive)
-            existing.status = int(status)
-            existing.version = int(version)
-            existing.description = desc
-            updated += 1
-        else:
-            obj = Indicator(
-                indicator_name=name,
-                unit=unit,
-                major_id=maj_id,
-                type_id=typ_id,
-                is_positive=int(is_positive),
-                status=int(status),
-                version=int(version),
-                description=desc,
-            )
-            session.add(obj)
-            created += 1
-
-    if errors:
-        await session.rollback()
-        raise HTTPException(status_code=400, detail={"message": "Validation failed", "errors": errors[:10]})
-    await session.commit()
+    created, updated = await import_indicator_manage_records(session, records)
     return {"created": created, "updated": updated}
 
 @router.get("/by_majors", response_model=MajorMetricsResponse)
+@cached_response(MajorMetricsResponse)
 async def get_indicators_by_major(
     major_id: int | None = None,
     major_name: str | None = None,
@@ -1216,6 +1108,7 @@ async def get_indicators_by_major(
     return results
 
 @router.get("/by-type", response_model=TypeMetricsResponse)
+@cached_response(TypeMetricsResponse)
 async def get_metrics_by_type_api(
     type_id: int | None = None,
     type_name: str | None = None,
@@ -68,7 +68,7 @@ async def create_permission(
     session.add(obj)
     await session.commit()
     await session.refresh(obj)
-    bump_perm_version()
+    await bump_perm_version()
     return {"permission_id": obj.permission_id}
 
 @router.patch("/{permission_id}")
@@ -85,7 +85,7 @@ async def update_permission(
         if k in payload and payload[k] is not None:
             setattr(obj, k, payload[k] if k != "status" else int(payload[k]))
     await session.commit()
-    bump_perm_version()
+    await bump_perm_version()
     return {"ok": True}
 
 @router.delete("/{permission_id}")
@@ -95,7 +95,7 @@ async def delete_permission_endpoint(permission_id: int, session: AsyncSession =
         raise HTTPException(status_code=404, detail="Permission not found")
     await session.delete(obj)
     await session.commit()
-    bump_perm_version()
+    await bump_perm_version()
     return {"deleted": 1}
 
 @router.get("/roles")
@@ -117,7 +117,7 @@ async def create_role(payload: dict, session: AsyncSession = Depends(get_session
     session.add(obj)
     await session.commit()
     await session.refresh(obj)
-    bump_perm_version()
+    await bump_perm_version()
     return {"role_id": obj.role_id}
 
 @router.patch("/roles/{role_id}")
@@ -130,7 +130,7 @@ async def update_role(role_id: int, payload: dict, session: AsyncSession = Depen
     if "status" in payload and payload["status"] is not None:
         obj.status = int(payload["status"])
     await session.commit()
-    bump_perm_version()
+    await bump_perm_version()
     return {"ok": True}
 
 @router.delete("/roles/{role_id}")
@@ -140,7 +140,7 @@ async def delete_role(role_id: int, session: AsyncSession = Depends(get_session)
         raise HTTPException(status_code=404, detail="Role not found")
     await session.delete(obj)
     await session.commit()
-    bump_perm_version()
+    await bump_perm_version()
     return {"deleted": 1}
 
 @router.get("/role_permissions")
@@ -161,7 +161,7 @@ async def assign_role_permissions(payload: dict, session: AsyncSession = Depends
         if pid not in existing_ids:
             session.add(RolePermission(role_id=role_id, permission_id=pid))
     await session.commit()
-    bump_perm_version()
+    await bump_perm_version()
     return {"assigned": len(ids)}
 
 @router.post("/role_permissions/revoke")
@@ -172,5 +172,5 @@ async def revoke_role_permissions(payload: dict, session: AsyncSession = Depends
         raise HTTPException(status_code=400, detail="role_id and permission_ids required")
     await session.execute(delete(RolePermission).where(RolePermission.role_id == role_id, RolePermission.permission_id.in_(ids)))
     await session.commit()
-    bump_perm_version()
+    await bump_perm_version()
     return {"revoked": len(ids)}
@@ -5,7 +5,7 @@ from typing import Optional
 from models.database import get_session, User, Role
 from models.user_schemas import UserOut, UserUpdate, AdminUserCreate
 from models.common import PageResponse
-from core.security import require_permission, get_password_hash, bump_perm_version
+from core.security import require_permission, get_password_hash, invalidate_principal
 
 router = APIRouter(prefix="/api/v1/admin/users", tags=["user-manage"])
 
@@ -54,16 +54,23 @@ async def update_user_admin(user_id: int, payload: UserUpdate, session: AsyncSes
     u = await session.get(User, user_id)
     if not u:
         raise HTTPException(status_code=404, detail="User not found")
+    # 只有状态、角色、密码变化才需要让各 worker 的鉴权缓存失效
+    auth_changed = (
+        payload.password is not None
+        or (payload.role_id is not None and payload.role_id != u.role_id)
+        or (payload.status is not None and payload.status != u.status)
+    )
     if payload.password is not None:
         u.password = get_password_hash(payload.password)
     if payload.phone is not None:
         u.phone = payload.phone
     if payload.role_id is not None:
         u.role_id = payload.role_id
-        bump_perm_version()
     if payload.status is not None:
         u.status = payload.status
     await session.commit()
+    if auth_changed:
+        await invalidate_principal(user_id)
     await session.refresh(u)
     return UserOut.model_validate(u)
 
@@ -74,6 +81,7 @@ async def delete_user_admin(user_id: int, session: AsyncSession = Depends(get_se
         raise HTTPException(status_code=404, detail="User not found")
     await session.delete(u)
     await session.commit()
+    await invalidate_principal(user_id)
     return {"deleted": 1}
 
 @router.get("/roles")
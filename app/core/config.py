@@ -2,7 +2,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
 from typing import List
-import secrets, json
+import secrets, json, tempfile, os
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "data_proj_v1"
@@ -19,11 +19,78 @@ class Settings(BaseSettings):
 
     PANDAS_THREAD_WORKERS: int = 4
     PANDAS_JOB_CONCURRENCY: int = 4
+    # 无状态的 Excel 解析 / 生成任务执行方式：thread = 线程池；process = 进程池（多核，适合并发导入导出）
+    PANDAS_EXECUTOR: str = "thread"
+    PANDAS_PROCESS_WORKERS: int = 2
+    # 进程池每个子进程执行多少个任务后替换（0 = 不替换）
+    PANDAS_PROCESS_MAX_TASKS: int = 50
+
+    # 分页总数缓存（with_total=exact），数据写入后按共享数据版本号失效（各 worker 最迟 DATA_VERSION_CHECK_INTERVAL 秒后生效）
+    COUNT_CACHE_TTL: int = 300
+    COUNT_CACHE_MAX_ENTRIES: int = 2048
+
+    # Excel 上传批量写入：每条 INSERT ... ON DUPLICATE KEY UPDATE 的行数
+    UPLOAD_CHUNK_SIZE: int = 1000
+
+    # 流式导出：服务端游标每批读取的行数
+    EXPORT_BATCH_SIZE: int = 2000
+    # 维度表（区县/支撑中心/专业/考核类型/指标）进程内缓存有效期（秒）
+    DIM_CACHE_TTL: int = 300
+    # 各 worker 比对共享维度版本号（cache_versions.name = 'dims'）的最短间隔（秒）
+    DIM_VERSION_CHECK_INTERVAL: float = 1.0
+
+    # 接口响应缓存（/by_majors、/snapshot 等）：memory = 进程内 LRU；redis = 多 worker 共享
+    # 两种后端都按共享数据版本号失效（memory 后端读取 cache_versions，见 DATA_VERSION_CHECK_INTERVAL）
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_TTL: int = 600
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    # 各 worker 比对共享数据版本号（cache_versions.name = 'data'）的最短间隔（秒），即其他 worker 写入后缓存的最长滞后
+    DATA_VERSION_CHECK_INTERVAL: float = 1.0
+
+    # Parquet 导出：每个 row group 的行数
+    PARQUET_ROW_GROUP_SIZE: int = 50000
+
+    # JSON 透视接口（/pivot）单次最多返回的统计日期数，更长的区间请用 export_v2 导出
+    PIVOT_MAX_DATES: int = 92
+
+    # 趋势接口（/series）指定 max_points 降采样时，单次最多读取的源数据行数（此时不再按 size 截断，超出返回 400）
+    SERIES_MAX_SOURCE_ROWS: int = 100000
+    # 批量趋势接口（/series/batch）单次最多的指标数
+    SERIES_BATCH_MAX_INDICATORS: int = 50
+
+    # JSON 响应中 Decimal 的输出方式：float（数值，默认）| str（字符串，保留全部精度）
+    JSON_DECIMAL_MODE: str = "float"
+
+    # 版本化迁移脚本目录（python manage.py migrate），为空时使用仓库根目录的 sql/migrations
+    MIGRATIONS_DIR: str = ""
+    # 启动时检查事实表热点索引是否存在（缺失只记录告警，不阻止启动）
+    INDEX_CHECK_ON_STARTUP: bool = False
+    # 事实表月分区维护（python manage.py partitions）：提前创建的未来月份数
+    PARTITION_AHEAD_MONTHS: int = 3
+    # 事实表在线保留的月份数（含当月），更早的分区归档后删除；0 表示不归档
+    PARTITION_RETAIN_MONTHS: int = 0
+
+    # 后台任务（异步导出 / 导入）：文件暂存目录（多 worker 需指向同一目录）、保留时长（秒）
+    BACKGROUND_JOB_DIR: str = os.path.join(tempfile.gettempdir(), "metrics_jobs")
+    BACKGROUND_JOB_TTL: int = 3600
+    # 同时运行的导出 / 导入任务数；导入任务每提交一次的行数
+    EXPORT_JOB_CONCURRENCY: int = 2
+    IMPORT_JOB_CONCURRENCY: int = 1
+    IMPORT_COMMIT_CHUNK_SIZE: int = 5000
 
     JWT_SECRET_KEY: str = secrets.token_urlsafe(32)
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24
 
+    # 鉴权缓存：用户状态/角色（principal）与权限码的有效期（秒）。
+    # 权限变更递增 cache_versions 共享版本号，各 worker 每 PERM_VERSION_CHECK_INTERVAL 秒至多比对一次，
+    # 因此 TTL 只是兜底，可以设得较长
+    PRINCIPAL_CACHE_TTL: int = 600
+    PERM_CACHE_TTL: int = 3600
+    PERM_VERSION_CHECK_INTERVAL: float = 1.0
+
     # ✅ 以「字符串」读取，避免 DotEnv 对复杂类型做 JSON 解析
     # 允许三种写法：
     #   1) "*" 
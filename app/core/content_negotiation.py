@@ -0,0 +1,167 @@
+# =============================
+# app/core/content_negotiation.py
+# =============================
+# 批量数据接口（/query、/series、/snapshot 及支撑中心版本）的响应编码协商，按 Accept 选择：
+#   - application/json（默认）：逐行对象数组，与原来一致；
+#   - application/vnd.metrics.columnar+json：列式 JSON，字符串 / 日期列字典编码（去重值 + 下标）；
+#   - application/vnd.metrics.columnar+msgpack：同一列式结构的 MessagePack（需安装 msgpack）；
+#   - application/vnd.apache.arrow.stream：Arrow IPC 流，字符串 / 日期列为 dictionary 类型（需安装 pyarrow）。
+# 未安装对应依赖的类型不参与协商，回落到默认 JSON。
+#
+# 列式结构：
+#   {"total": 123, "next_cursor": null, "length": 2,
+#    "columns": {"id": [1, 2], "district_name": [0, 0], "value": [1.5, null], ...},
+#    "dictionaries": {"district_name": ["锦江区"], ...}}
+# dictionaries 中出现的列，columns 里存放的是字典下标（空值仍为 null）。
+#
+# fields= 列投影：服务层只查询请求的列并返回 dict 行（不构建 ORM 实体与 Pydantic 对象），
+# 此时各种编码（包括默认 JSON）都由这里直接序列化。
+import importlib.util
+import json
+from datetime import date
+from decimal import Decimal
+from operator import attrgetter, itemgetter
+from typing import List, Optional
+
+from fastapi import HTTPException, Request, Response
+
+from core.json_response import FastJSONResponse, json_dumps
+
+COLUMNAR_JSON = "application/vnd.metrics.columnar+json"
+COLUMNAR_MSGPACK = "application/vnd.metrics.columnar+msgpack"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+# 可协商的类型（按依赖是否安装决定）
+MEDIA_TYPES = [COLUMNAR_JSON]
+if importlib.util.find_spec("msgpack"):
+    MEDIA_TYPES.append(COLUMNAR_MSGPACK)
+if importlib.util.find_spec("pyarrow"):
+    MEDIA_TYPES.append(ARROW_STREAM)
+
+# 路由 responses= 参数：在 OpenAPI 中声明可选的编码
+NEGOTIATED_RESPONSES = {200: {"content": {mt: {} for mt in MEDIA_TYPES}}}
+
+
+def negotiate(request: Request) -> Optional[str]:
+    """
+    按 Accept（含 q 值）选出列式 / 二进制编码；JSON 或 */* 优先级更高、或没有可用类型时返回 None
+    """
+    accept = request.headers.get("accept")
+    if not accept:
+        return None
+    candidates = []
+    for i, part in enumerate(accept.split(",")):
+        media, _, params = part.strip().partition(";")
+        q = 1.0
+        for p in params.split(";"):
+            k, _, v = p.strip().partition("=")
+            if k == "q":
+                try:
+                    q = float(v)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            candidates.append((-q, i, media.strip().lower()))
+    for _, _, media in sorted(candidates):
+        if media in MEDIA_TYPES:
+            return media
+        if media in ("application/json", "*/*", "application/*"):
+            return None
+    return None
+
+
+def parse_fields(fields: Optional[str], item_model) -> Optional[List[str]]:
+    """
+    fields=indicator_id,stat_date,value -> 字段名列表（去重保序）；未指定返回 None，出现未知字段返回 400
+    """
+    if fields is None:
+        return None
+    names = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in names if f not in item_model.model_fields]
+    if not names or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown) or '(empty)'}; allowed: {', '.join(item_model.model_fields)}",
+        )
+    return names
+
+
+def _dict_encode(values: list) -> tuple[list, list]:
+    index: dict = {}
+    codes = [None if v is None else index.setdefault(v, len(index)) for v in values]
+    return list(index), codes
+
+
+def columnar_page(page: dict, item_model, fields: Optional[List[str]] = None) -> dict:
+    """
+    {"items": [...], "total": .., "next_cursor": ..} -> 列式结构；items 可为 Pydantic / ORM 对象或 dict 行（列投影），
+    列顺序同 fields（默认 item_model 的全部字段）。首个非空值为字符串 / 日期的列做字典编码。
+    """
+    items = page.get("items") or []
+    columns: dict = {}
+    dictionaries: dict = {}
+    getter = itemgetter if items and isinstance(items[0], dict) else attrgetter
+    for name in fields or item_model.model_fields:
+        values = list(map(getter(name), items))
+        sample = next((v for v in values if v is not None), None)
+        if isinstance(sample, (str, date)):
+            dictionaries[name], columns[name] = _dict_encode(values)
+        elif isinstance(sample, Decimal):
+            # ORM 对象直接编码时 DECIMAL 列为 Decimal
+            columns[name] = [None if v is None else float(v) for v in values]
+        else:
+            columns[name] = values
+    return {
+        "total": page.get("total"),
+        "next_cursor": page.get("next_cursor"),
+        "length": len(items),
+        "columns": columns,
+        "dictionaries": dictionaries,
+    }
+
+
+def _arrow_bytes(payload: dict) -> bytes:
+    import pyarrow as pa
+
+    arrays, names = [], []
+    for name, values in payload["columns"].items():
+        dictionary = payload["dictionaries"].get(name)
+        if dictionary is not None:
+            arrays.append(pa.DictionaryArray.from_arrays(pa.array(values, pa.int32()), pa.array(dictionary)))
+        else:
+            arrays.append(pa.array(values))
+        names.append(name)
+    meta = {"total": json.dumps(payload["total"]), "next_cursor": json.dumps(payload["next_cursor"])}
+    table = pa.Table.from_arrays(arrays, names=names).replace_schema_metadata(meta)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_page(media_type: str, page: dict, item_model, fields: Optional[List[str]] = None) -> bytes:
+    payload = columnar_page(page, item_model, fields)
+    if media_type == ARROW_STREAM:
+        return _arrow_bytes(payload)
+    if media_type == COLUMNAR_MSGPACK:
+        import msgpack
+
+        # 日期字典转为 ISO 字符串
+        for name, dictionary in payload["dictionaries"].items():
+            if dictionary and isinstance(dictionary[0], date):
+                payload["dictionaries"][name] = [d.isoformat() for d in dictionary]
+        return msgpack.packb(payload)
+    return json_dumps(payload)
+
+
+def negotiated_response(request: Request, page: dict, item_model, fields: Optional[List[str]] = None):
+    """
+    Accept 请求列式 / 二进制编码时直接返回编码后的 Response（跳过 response_model 的逐行校验与序列化）；
+    列投影（fields）的 dict 行直接输出 JSON；否则原样返回 page 由 FastAPI 按 response_model 输出 JSON
+    """
+    media_type = negotiate(request)
+    if media_type is None:
+        if fields is None:
+            return page
+        return FastJSONResponse(page, headers={"Vary": "Accept"})
+    return Response(content=encode_page(media_type, page, item_model, fields), media_type=media_type, headers={"Vary": "Accept"})
@@ -0,0 +1,48 @@
+# =============================
+# app/core/data_version.py
+# =============================
+# 指标数据版本号：写入指标数据（新增/修改/删除/上传）提交后调用 await bump_data_version()，
+# 依赖数据内容的缓存（如分页总数、接口响应）记录生成时的版本号，版本变化即视为失效。
+# 版本号通过 cache_versions（name = 'data'）在 worker 之间共享：读取缓存前 sync_data_version()，
+# 每 DATA_VERSION_CHECK_INTERVAL 秒至多查询一次，其他 worker 的写入最迟在该间隔后生效。
+import logging
+from typing import Awaitable, Callable
+
+from core.config import settings
+from core.shared_version import SharedVersion
+
+logger = logging.getLogger(__name__)
+
+_data_version = SharedVersion("data", lambda: settings.DATA_VERSION_CHECK_INTERVAL)
+_listeners: list[Callable[[], Awaitable[None]]] = []
+
+
+def get_data_version() -> int:
+    """
+    本进程当前的版本号（不查询共享版本号）
+    """
+    return _data_version.local
+
+
+async def sync_data_version() -> int:
+    """
+    比对共享版本号后返回本进程版本号
+    """
+    return await _data_version.sync()
+
+
+def on_data_version_bump(callback: Callable[[], Awaitable[None]]):
+    """
+    注册版本号变化回调（如共享缓存后端同步递增全局版本号）
+    """
+    _listeners.append(callback)
+
+
+async def bump_data_version():
+    await _data_version.bump()
+    for cb in _listeners:
+        try:
+            await cb()
+        except Exception as e:
+            # 写入已提交，回调失败不应使请求失败；共享缓存随 TTL 过期
+            logger.warning("data version listener failed: %s", e)
@@ -0,0 +1,79 @@
+# =============================
+# app/core/json_response.py
+# =============================
+# 全局默认 JSON 响应类（main.py 中通过 default_response_class 启用）：
+#   - 使用 orjson 序列化（未安装时回落到标准库 json）；
+#   - Decimal 按 JSON_DECIMAL_MODE 输出为 float 或 str，date / datetime 原生输出 ISO 字符串，numpy 标量 / 数组原生输出；
+#   - Pydantic 模型：顶层模型交给 pydantic-core 直接序列化，嵌套在 dict / list 中的模型按 model_dump 展开。
+#
+# 路由已有 response_model 时，FastAPI 会先按 response_model 校验返回值再序列化；
+# 返回值已经是校验过的模型、或由服务层拼好的纯数据（透视矩阵、列式趋势等）时，
+# 用 validated_response 直接输出，跳过这一遍重复校验（response_model 仍用于 OpenAPI 文档）。
+import importlib.util
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Optional
+
+import numpy as np
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from core.config import settings
+
+_HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+if _HAS_ORJSON:
+    import orjson
+
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _decimal(v: Decimal):
+    if settings.JSON_DECIMAL_MODE == "str":
+        return str(v)
+    return float(v)
+
+
+def _default(obj: Any):
+    # orjson / json 无法原生处理的类型
+    if isinstance(obj, Decimal):
+        return _decimal(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _default_stdlib(obj: Any):
+    # 标准库 json 额外需要处理日期与 numpy
+    if isinstance(obj, (date, datetime, time)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return _default(obj)
+
+
+def json_dumps(content: Any) -> bytes:
+    """
+    序列化为 UTF-8 JSON 字节串（规则见模块说明）
+    """
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if _HAS_ORJSON:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(content, default=_default_stdlib, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+def validated_response(content: Any, status_code: int = 200, headers: Optional[dict] = None) -> FastJSONResponse:
+    """
+    直接输出已校验的模型或服务层拼好的数据，跳过 response_model 的再次校验与序列化
+    """
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
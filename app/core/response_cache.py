@@ -0,0 +1,169 @@
+# =============================
+# app/core/response_cache.py
+# =============================
+# 读多写少接口的响应缓存：按「路由 + 规范化查询参数 + 数据版本号」缓存序列化后的 JSON。
+#   - 默认进程内 LRU + TTL；配置 RESPONSE_CACHE_BACKEND=redis 后多个 worker 共享（需安装 redis，
+#     或通过 set_cache_backend() 注入任何提供 async get / set(ex=) / incr 的兼容客户端）；
+#   - 数据写入调用 bump_data_version() 后版本号变化，旧缓存不再命中，随 LRU/TTL 自然淘汰；
+#     进程内后端按 cache_versions 中的共享版本号失效，其他 worker 的写入最迟 DATA_VERSION_CHECK_INTERVAL 秒后生效；
+#   - 按接口显式启用：在路由函数上加 @cached_response()。
+import functools
+import hashlib
+import inspect
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from core.config import settings
+from core.content_negotiation import negotiate, negotiated_response, encode_page
+from core.json_response import json_dumps
+from core.data_version import sync_data_version, on_data_version_bump
+
+
+class InProcessBackend:
+    """
+    进程内 LRU + TTL 缓存，版本号取共享数据版本（cache_versions，按检查间隔比对）
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self._max = max_entries
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def version(self) -> int:
+        return await sync_data_version()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.time():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._data[key] = (time.time() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class RedisBackend:
+    """
+    Redis（或兼容实现）后端：缓存与数据版本号都放在 Redis 中，各 worker 共享。
+    本进程 bump_data_version() 时 INCR 共享版本号（随写入请求等待完成）；淘汰交给 Redis 的 TTL / maxmemory 策略。
+    """
+
+    def __init__(self, client, prefix: str = "metrics:"):
+        self._client = client
+        self._prefix = prefix
+        self._version_key = f"{prefix}data_version"
+        on_data_version_bump(self._bump)
+
+    async def _bump(self) -> None:
+        await self._client.incr(self._version_key)
+
+    async def version(self) -> int:
+        v = await self._client.get(self._version_key)
+        return int(v or 0)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(self._prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self._client.set(self._prefix + key, value, ex=ttl)
+
+
+_backend = None
+
+
+def _create_backend():
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        import redis.asyncio as aioredis
+
+        return RedisBackend(aioredis.from_url(settings.RESPONSE_CACHE_REDIS_URL))
+    return InProcessBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def get_cache_backend():
+    global _backend
+    if _backend is None:
+        _backend = _create_backend()
+    return _backend
+
+
+def set_cache_backend(backend) -> None:
+    """
+    替换缓存后端（如接入本地 Redis 替身）
+    """
+    global _backend
+    _backend = backend
+
+
+def _cache_key(request: Request, version: int, media_type: Optional[str] = None) -> str:
+    params = sorted(request.query_params.multi_items())
+    digest = hashlib.sha1(json.dumps(params, ensure_ascii=False).encode("utf-8")).hexdigest()
+    suffix = f":{media_type}" if media_type else ""
+    return f"resp:{request.url.path}:{version}:{digest}{suffix}"
+
+
+def _serialize(result: Any, response_model) -> bytes:
+    if response_model is not None:
+        adapter = TypeAdapter(response_model)
+        return adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+    return json_dumps(result)
+
+
+def cached_response(response_model=None, ttl: Optional[int] = None, item_model=None):
+    """
+    路由响应缓存装饰器（放在 @router.get 之下）：
+    命中时直接返回缓存的 JSON；未命中时执行路由函数，按 response_model 序列化后写入缓存。
+    依赖（鉴权等）仍在每次请求时执行。
+    指定 item_model 时按 Accept 协商列式 / 二进制编码（见 core.content_negotiation），各编码分别缓存。
+    """
+
+    def decorator(func):
+        sig = inspect.signature(func)
+        has_request = "request" in sig.parameters
+        params = list(sig.parameters.values())
+        if not has_request:
+            params.append(inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request))
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs["request"] if has_request else kwargs.pop("request")
+            media_type = negotiate(request) if item_model is not None else None
+            if not settings.RESPONSE_CACHE_ENABLED:
+                result = await func(*args, **kwargs)
+                if item_model is None or isinstance(result, Response):
+                    return result
+                return negotiated_response(request, result, item_model)
+            backend = get_cache_backend()
+            key = _cache_key(request, await backend.version(), media_type)
+            body = await backend.get(key)
+            if body is None:
+                result = await func(*args, **kwargs)
+                if isinstance(result, Response):
+                    # 路由已自行编码（如 fields= 列投影），媒体类型与协商结果一致
+                    body = result.body
+                elif media_type:
+                    body = encode_page(media_type, result, item_model)
+                else:
+                    body = _serialize(result, response_model)
+                await backend.set(key, body, ttl or settings.RESPONSE_CACHE_TTL)
+            headers = {"Vary": "Accept"} if item_model is not None else None
+            return Response(content=body, media_type=media_type or "application/json", headers=headers)
+
+        wrapper.__signature__ = sig.replace(parameters=params)
+        return wrapper
+
+    return decorator
@@ -69,6 +69,7 @@ from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -76,6 +77,7 @@ from models.user_schemas import TokenData, UserOut
 from core.config import settings
 from models.database import get_session, User
 from models.database import Role, RolePermission, Permission
+from core.shared_version import SharedVersion
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/users/login")
@@ -111,97 +113,128 @@ def create_access_token(user_id: int, expires_delta: Optional[timedelta] = None)
 
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(get_session),
-) -> UserOut:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+_credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+_perm_cache: dict[int, tuple[set[str], int, int]] = {}
+
+# 用户状态缓存：user_id -> (status, role_id, role_code, 版本号, 过期时间戳)
+_principal_cache: dict[int, tuple[int, Optional[int], Optional[str], int, int]] = {}
+
+# 共享版本号（cache_versions.name = 'perm'）：多个 worker / 主机各自缓存，
+# 每 PERM_VERSION_CHECK_INTERVAL 秒至多查询一次，发现变化即使本进程的鉴权缓存失效
+_perm_version = SharedVersion("perm", lambda: settings.PERM_VERSION_CHECK_INTERVAL)
+
+
+async def bump_perm_version():
+    """
+    权限 / 角色 / 用户状态变更提交后调用：本进程立即失效，并递增共享版本号通知其他 worker
+    （版本表不可用时只记录告警，其他 worker 按 TTL 失效）
+    """
+    await _perm_version.bump()
+
+
+async def invalidate_principal(user_id: int):
+    """
+    用户状态 / 角色变更后调用，使该用户的缓存立即失效（其他 worker 通过共享版本号失效）
+    """
+    _principal_cache.pop(user_id, None)
+    _perm_cache.pop(user_id, None)
+    await bump_perm_version()
+
+
+class Principal:
+    """
+    当前请求的身份：每个请求只解析一次（FastAPI 依赖缓存），供 get_current_user / require_admin / require_permission 共用
+    """
+
+    __slots__ = ("id", "status", "role_id", "role_code")
+
+    def __init__(self, id: int, status: int, role_id: Optional[int], role_code: Optional[str]):
+        self.id = id
+        self.status = status
+        self.role_id = role_id
+        self.role_code = role_code
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role_id == 1 or self.role_code == "admin"
+
+
+def _decode_user_id(token: str) -> int:
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         user_id_str: str | None = payload.get("sub")
         if user_id_str is None:
-            raise credentials_exception
-        user_id = int(user_id_str)
-    except (JWTError, ValueError):
-        raise credentials_exception
+            raise _credentials_exception
+        return int(user_id_str)
+    except (JWTError, ValueError, TypeError):
+        raise _credentials_exception
 
-    stmt = select(User).where(User.id == user_id)
-    result = await session.execute(stmt)
-    user = result.scalar_one_or_none()
-    if not user or user.status != 1:
-        raise credentials_exception
 
-    return UserOut.model_validate(user)
-
-async def require_admin(
+async def get_principal(
     token: str = Depends(oauth2_scheme),
     session: AsyncSession = Depends(get_session),
-):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        user_id_str: str | None = payload.get("sub")
-        if user_id_str is None:
-            raise credentials_exception
-        user_id = int(user_id_str)
-    except (JWTError, ValueError):
-        raise credentials_exception
-    stmt = select(User).where(User.id == user_id)
-    result = await session.execute(stmt)
-    user = result.scalar_one_or_none()
-    if not user or user.status != 1:
-        raise credentials_exception
-    if user.role_id == 1:
-        return user
-    role = None
-    if user.role_id:
-        r = await session.execute(select(Role).where(Role.role_id == user.role_id))
-        role = r.scalar_one_or_none()
-    if role and role.role_code == "admin":
-        return user
-    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin required")
+) -> Principal:
+    user_id = _decode_user_id(token)
+    perm_version = await _perm_version.sync()
+    now_ts = int(datetime.now(timezone.utc).timestamp())
+    cached = _principal_cache.get(user_id)
+    if cached and cached[3] == perm_version and cached[4] > now_ts:
+        user_status, role_id, role_code = cached[0], cached[1], cached[2]
+    else:
+        stmt = (
+            select(User.status, User.role_id, Role.role_code)
+            .outerjoin(Role, Role.role_id == User.role_id)
+            .where(User.id == user_id)
+        )
+        row = (await session.execute(stmt)).first()
+        if not row:
+            raise _credentials_exception
+        user_status, role_id, role_code = row
+        _principal_cache[user_id] = (user_status, role_id, role_code, perm_version, now_ts + settings.PRINCIPAL_CACHE_TTL)
+    if user_status != 1:
+        raise _credentials_exception
+    return Principal(user_id, user_status, role_id, role_code)
 
-_perm_cache: dict[int, tuple[set[str], int, int]] = {}
-_PERM_VERSION: int = 1
 
-def bump_perm_version():
-    global _PERM_VERSION
-    _PERM_VERSION += 1
+async def get_current_user(
+    principal: Principal = Depends(get_principal),
+    session: AsyncSession = Depends(get_session),
+) -> UserOut:
+    # 资料字段（用户名、手机号）不缓存，状态校验已由 principal 完成
+    user = await session.get(User, principal.id)
+    if not user:
+        raise _credentials_exception
+    return UserOut.model_validate(user)
+
+async def require_admin(principal: Principal = Depends(get_principal)) -> Principal:
+    if principal.is_admin:
+        return principal
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin required")
+
+async def _permission_codes(session: AsyncSession, principal: Principal) -> set[str]:
+    now_ts = int(datetime.now(timezone.utc).timestamp())
+    cached = _perm_cache.get(principal.id)
+    if cached and cached[1] > now_ts and cached[2] == _perm_version.local:
+        return cached[0]
+    stmt = select(Permission.permission_code).join(RolePermission, Permission.permission_id == RolePermission.permission_id).where(RolePermission.role_id == principal.role_id, Permission.status == 1)
+    rows = (await session.execute(stmt)).all()
+    codes = {r[0] for r in rows}
+    _perm_cache[principal.id] = (codes, now_ts + settings.PERM_CACHE_TTL, _perm_version.local)
+    return codes
 
 def require_permission(permission_code: str):
     async def _dep(
-        token: str = Depends(oauth2_scheme),
+        principal: Principal = Depends(get_principal),
         session: AsyncSession = Depends(get_session),
     ):
-        try:
-            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-            user_id = int(payload.get("sub"))
-        except Exception:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials", headers={"WWW-Authenticate": "Bearer"})
-        result = await session.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
-        if not user or user.status != 1:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials", headers={"WWW-Authenticate": "Bearer"})
-        if user.role_id == 1:
+        if principal.role_id == 1:
             return
-        now_ts = int(datetime.now(timezone.utc).timestamp())
-        codes: set[str] | None = None
-        cached = _perm_cache.get(user.id)
-        if cached and cached[1] > now_ts and cached[2] == _PERM_VERSION:
-            codes = cached[0]
-        if codes is None:
-            stmt = select(Permission.permission_code).join(RolePermission, Permission.permission_id == RolePermission.permission_id).where(RolePermission.role_id == user.role_id, Permission.status == 1)
-            rows = (await session.execute(stmt)).all()
-            codes = {r[0] for r in rows}
-            _perm_cache[user.id] = (codes, now_ts + 300, _PERM_VERSION)
+        codes = await _permission_codes(session, principal)
         if permission_code not in codes:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied")
     return _dep
@@ -0,0 +1,69 @@
+# =============================
+# app/core/shared_version.py
+# =============================
+# 跨 worker / 主机共享的缓存版本号（cache_versions 表，sql/migrations/007）：
+#   - 变更提交后 bump() 递增本进程版本号，并递增共享版本号通知其他 worker；
+#   - 读取缓存前 sync() 比对共享版本号（每 interval 秒至多查询一次，使用独立连接，不影响请求的 session），
+#     发现变化即递增本进程版本号；
+#   - 版本表不可用（如未执行迁移）时只记录告警，各进程退化为仅按 TTL 失效，不影响业务请求。
+import logging
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.exc import DBAPIError
+
+from models.database import CacheVersion, engine
+
+logger = logging.getLogger(__name__)
+
+
+class SharedVersion:
+    def __init__(self, name: str, interval: Callable[[], float]):
+        self.name = name
+        # 检查间隔（秒）取自配置，运行时修改配置即生效
+        self._interval = interval
+        self.local: int = 1
+        self._remote: Optional[int] = None
+        self._checked_at: float = 0.0
+        self._warned = False
+
+    async def _read(self) -> int:
+        stmt = select(CacheVersion.version).where(CacheVersion.name == self.name)
+        async with engine.connect() as conn:
+            return (await conn.execute(stmt)).scalar_one_or_none() or 0
+
+    async def sync(self) -> int:
+        """
+        比对共享版本号并返回本进程版本号
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self._interval():
+            return self.local
+        self._checked_at = now
+        try:
+            remote = await self._read()
+        except DBAPIError as e:
+            if not self._warned:
+                # 每个进程只告警一次，避免每个检查间隔刷屏
+                self._warned = True
+                logger.warning("cache_versions unavailable, %s caches fall back to TTL: %s", self.name, e.orig)
+            return self.local
+        if self._remote is not None and remote != self._remote:
+            self.local += 1
+        self._remote = remote
+        return self.local
+
+    async def bump(self) -> None:
+        """
+        变更提交后调用：本进程立即失效，并递增共享版本号（失败只记录告警）
+        """
+        self.local += 1
+        stmt = mysql_insert(CacheVersion).values(name=self.name, version=1)
+        stmt = stmt.on_duplicate_key_update(version=CacheVersion.version + 1)
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(stmt)
+        except DBAPIError as e:
+            logger.warning("cache_versions unavailable, %s change not propagated to other workers: %s", self.name, e.orig)
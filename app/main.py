@@ -33,15 +33,39 @@
 # app.include_router(api_router)
 
 # app/main.py
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
 from api.routers import api_router
 from core.config import settings
 from sqlalchemy import text
 from sqlalchemy.engine import make_url
-from models.database import engine
+from models.database import engine, AsyncSessionLocal
+from core.json_response import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if settings.INDEX_CHECK_ON_STARTUP:
+        # 只告警不阻止启动；完整报告（含 EXPLAIN）用 python manage.py check-indexes --explain
+        from services.schema_service import missing_indexes, format_missing
+
+        try:
+            async with AsyncSessionLocal() as session:
+                for line in format_missing(await missing_indexes(session)):
+                    logger.warning("index check: %s", line)
+        except Exception as e:
+            logger.warning("index check skipped: %s", e)
+    yield
 
-app = FastAPI(title=settings.PROJECT_NAME, version=settings.VERSION)
+# 默认响应类用 Default 包装：声明了 response_model 的路由仍走 FastAPI 自带的 pydantic 直接序列化，
+# 其余返回 dict / list 的路由由 FastJSONResponse（orjson）输出
+app = FastAPI(title=settings.PROJECT_NAME, version=settings.VERSION, default_response_class=Default(FastJSONResponse), lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -0,0 +1,108 @@
+# =============================
+# app/manage.py —— 运维命令（在 app 目录下执行：python manage.py <command>）
+# =============================
+import argparse
+import asyncio
+
+from core.config import settings
+from models.database import AsyncSessionLocal, engine
+from models.metrics import IndicatorDataV2 as IndicatorData, IndicatorCenterData
+
+
+async def _rebuild_latest(args) -> None:
+    from services.latest_service import rebuild_latest
+
+    targets = {"district": IndicatorData, "center": IndicatorCenterData}
+    names = list(targets) if args.entity == "all" else [args.entity]
+    async with AsyncSessionLocal() as session:
+        for name in names:
+            n = await rebuild_latest(session, targets[name])
+            print(f"[rebuild-latest] {name}: {n} rows")
+
+
+async def _rebuild_rollup(args) -> None:
+    from services.rollup_service import rebuild_rollups
+
+    targets = {"district": IndicatorData, "center": IndicatorCenterData}
+    names = list(targets) if args.entity == "all" else [args.entity]
+    async with AsyncSessionLocal() as session:
+        for name in names:
+            n = await rebuild_rollups(session, targets[name])
+            print(f"[rebuild-rollup] {name}: {n} rows")
+
+
+async def _migrate(args) -> None:
+    from services.schema_service import migrate
+
+    async with engine.connect() as conn:
+        for line in await migrate(conn, dry_run=args.dry_run):
+            print(line)
+
+
+async def _check_indexes(args) -> None:
+    from services.schema_service import missing_indexes, format_missing, explain_hot_queries
+
+    async with AsyncSessionLocal() as session:
+        lines = format_missing(await missing_indexes(session))
+        for line in lines:
+            print(f"[check-indexes] {line}")
+        if not lines:
+            print("[check-indexes] all required indexes present")
+        if args.explain:
+            for line in await explain_hot_queries(session):
+                print(line)
+
+
+async def _partitions(args) -> None:
+    from services.partition_service import maintain_partitions
+
+    async with engine.connect() as conn:
+        lines = await maintain_partitions(
+            conn, args.ahead, args.retain_months, archive=not args.drop, dry_run=args.dry_run
+        )
+        for line in lines:
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="manage.py", description="指标平台运维命令")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("rebuild-latest", help="全量重建最新值表（indicator_latest / indicator_center_latest）")
+    p.add_argument("--entity", choices=["all", "district", "center"], default="all")
+    p.set_defaults(func=_rebuild_latest)
+
+    p = sub.add_parser("rebuild-rollup", help="全量重建周 / 月 / 季预聚合表（indicator_rollup / indicator_center_rollup）")
+    p.add_argument("--entity", choices=["all", "district", "center"], default="all")
+    p.set_defaults(func=_rebuild_rollup)
+
+    p = sub.add_parser("migrate", help="执行 sql/migrations 中尚未执行的版本化迁移")
+    p.add_argument("--dry-run", action="store_true", help="只列出待执行的迁移与语句")
+    p.set_defaults(func=_migrate)
+
+    p = sub.add_parser("check-indexes", help="检查事实表热点索引，可选输出主要查询的 EXPLAIN")
+    p.add_argument("--explain", action="store_true")
+    p.set_defaults(func=_check_indexes)
+
+    p = sub.add_parser("partitions", help="事实表月分区维护：预建未来月份，归档并删除过期月份")
+    p.add_argument("--ahead", type=int, default=settings.PARTITION_AHEAD_MONTHS, help="提前创建的未来月份数")
+    p.add_argument(
+        "--retain-months", type=int, default=settings.PARTITION_RETAIN_MONTHS, help="在线保留的月份数（含当月），0 表示不归档"
+    )
+    p.add_argument("--drop", action="store_true", help="过期分区直接删除，不交换到归档表")
+    p.add_argument("--dry-run", action="store_true", help="只列出待执行的语句")
+    p.set_defaults(func=_partitions)
+
+    args = parser.parse_args()
+
+    async def _run():
+        try:
+            await args.func(args)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -68,3 +68,12 @@ class RolePermission(Base):
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+class CacheVersion(Base):
+    """
+    跨 worker / 主机共享的缓存版本号：各进程定期比对，变化即清空本地缓存
+    """
+    __tablename__ = "cache_versions"
+    name: Mapped[str] = mapped_column(String(32), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+    update_time: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -47,6 +47,11 @@ class KPIType(Base):
 class DimDate(Base):
     __tablename__ = "dim_date"
     day: Mapped[date] = mapped_column(Date, primary_key=True)  # SQLAlchemy Date maps to python date
+    year: Mapped[int | None] = mapped_column(SmallInteger)
+    quarter: Mapped[int | None] = mapped_column(SmallInteger)
+    month: Mapped[int | None] = mapped_column(SmallInteger)
+    iso_year: Mapped[int | None] = mapped_column(SmallInteger)
+    iso_week: Mapped[int | None] = mapped_column(SmallInteger)
 
 
 class Indicator(Base):
@@ -129,3 +134,94 @@ class IndicatorCenterData(Base):
     score: Mapped[float | None] = mapped_column(DECIMAL(18,4))
     create_time: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     update_time: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class IndicatorLatest(Base):
+    """
+    每个 (indicator_id, district_id) 的最新一条数据，由写入路径同步维护
+    """
+    __tablename__ = "indicator_latest"
+    indicator_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    district_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    data_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    indicator_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    type_id: Mapped[int | None] = mapped_column(Integer)
+    major_id: Mapped[int | None] = mapped_column(Integer)
+    is_positive: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    circle_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    district_name: Mapped[str] = mapped_column(String(32), nullable=False)
+    stat_date: Mapped[date] = mapped_column(Date, nullable=False)
+    value: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    benchmark: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    challenge: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    exemption: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    zero_tolerance: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    score: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    update_time: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class IndicatorCenterLatest(Base):
+    """
+    每个 (indicator_id, center_id) 的最新一条数据，由写入路径同步维护
+    """
+    __tablename__ = "indicator_center_latest"
+    indicator_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    center_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    data_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    indicator_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    type_id: Mapped[int | None] = mapped_column(Integer)
+    major_id: Mapped[int | None] = mapped_column(Integer)
+    is_positive: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    center_name: Mapped[str] = mapped_column(String(32), nullable=False)
+    stat_date: Mapped[date] = mapped_column(Date, nullable=False)
+    value: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    benchmark: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    challenge: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    exemption: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    zero_tolerance: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    score: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    update_time: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class IndicatorRollup(Base):
+    """
+    每个 (indicator_id, district_id) 按周 / 月 / 季的预聚合，由写入路径按受影响的周期同步维护
+    """
+    __tablename__ = "indicator_rollup"
+    indicator_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    district_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    period: Mapped[str] = mapped_column(String(8), primary_key=True)  # week | month | quarter
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)  # 周一 / 月初 / 季初
+    last_date: Mapped[date] = mapped_column(Date, nullable=False)
+    days: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    value_avg: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    value_last: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    value_min: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    value_max: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    score_avg: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    score_last: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    score_min: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    score_max: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    update_time: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class IndicatorCenterRollup(Base):
+    """
+    每个 (indicator_id, center_id) 按周 / 月 / 季的预聚合，由写入路径按受影响的周期同步维护
+    """
+    __tablename__ = "indicator_center_rollup"
+    indicator_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    center_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    period: Mapped[str] = mapped_column(String(8), primary_key=True)  # week | month | quarter
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)  # 周一 / 月初 / 季初
+    last_date: Mapped[date] = mapped_column(Date, nullable=False)
+    days: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    value_avg: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    value_last: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    value_min: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    value_max: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    score_avg: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    score_last: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    score_min: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    score_max: Mapped[float | None] = mapped_column(DECIMAL(18,4))
+    update_time: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -3,7 +3,7 @@
 # =============================
 from pydantic import BaseModel, Field
 from datetime import date
-from typing import Optional, List
+from typing import Optional, List, Dict, Union
 
 class IndicatorBase(BaseModel):
     indicator_name: str
@@ -50,7 +50,8 @@ class IndicatorDataOut(IndicatorDataBase):
 
 class IndicatorDataResponse(BaseModel):
     items: List[IndicatorDataOut]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 class IndicatorDataDelete(BaseModel):
     ids: Optional[List[int]] = None
@@ -172,7 +173,8 @@ class IndicatorCenterDataOut(IndicatorCenterDataBase):
 
 class IndicatorCenterDataResponse(BaseModel):
     items: List[IndicatorCenterDataOut]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 class IndicatorCenterDataCreate(BaseModel):
     indicator_id: int
@@ -275,3 +277,94 @@ class IndicatorDashboardOut(BaseModel):
     exemption: float | None
     zero_tolerance: float | None
     score: float | None
+
+
+class PivotIndicatorOut(BaseModel):
+    indicator_id: int
+    indicator_name: str
+    is_positive: int
+
+class PivotSummaryRow(BaseModel):
+    values: List[Optional[float]]
+    scores: List[Optional[float]]
+
+class PivotDateOut(BaseModel):
+    stat_date: date
+    entity_ids: List[int]
+    # 区县：circle_id / district_name；支撑中心：district_name / center_name
+    labels: Dict[str, List[Union[int, str]]]
+    # 实体 × 指标（列顺序同 indicators），未上报为 null
+    values: List[List[Optional[float]]]
+    scores: List[List[Optional[float]]]
+    total: PivotSummaryRow
+    best: PivotSummaryRow
+
+class PivotResponse(BaseModel):
+    entity: str
+    indicators: List[PivotIndicatorOut]
+    dates: List[PivotDateOut]
+
+
+class SeriesBatchQuery(BaseModel):
+    entity: str = Field("district", pattern="^(district|center)$")
+    indicator_ids: List[int] = Field(..., min_length=1)
+    # entity=district 时使用 district_ids，entity=center 时使用 center_ids；为空表示全部
+    district_ids: Optional[List[int]] = None
+    center_ids: Optional[List[int]] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    bucket: str = Field("day", pattern="^(day|week|month|quarter)$")
+    agg: str = Field("avg", pattern="^(avg|last|min|max)$")
+    max_points: Optional[int] = Field(None, ge=3, le=5000)
+
+class SeriesColumns(BaseModel):
+    indicator_id: int
+    entity_id: int
+    stat_date: List[date]
+    value: List[Optional[float]]
+    score: List[Optional[float]]
+
+class SeriesBatchResponse(BaseModel):
+    entity: str
+    series: List[SeriesColumns]
+
+
+class RollupStatsBase(BaseModel):
+    # 周期：week / month / quarter；period_start 为周一 / 月初 / 季初
+    period: str
+    period_start: date
+    last_date: date
+    days: int
+    value_avg: Optional[float] = None
+    value_last: Optional[float] = None
+    value_min: Optional[float] = None
+    value_max: Optional[float] = None
+    score_avg: Optional[float] = None
+    score_last: Optional[float] = None
+    score_min: Optional[float] = None
+    score_max: Optional[float] = None
+
+class IndicatorRollupOut(RollupStatsBase):
+    indicator_id: int
+    indicator_name: str
+    is_positive: int
+    circle_id: Optional[int] = None
+    district_id: int
+    district_name: Optional[str] = None
+
+class IndicatorRollupResponse(BaseModel):
+    items: List[IndicatorRollupOut]
+    total: Optional[int] = None
+
+class IndicatorCenterRollupOut(RollupStatsBase):
+    indicator_id: int
+    indicator_name: str
+    is_positive: int
+    center_id: int
+    center_name: Optional[str] = None
+    district_id: Optional[int] = None
+    district_name: Optional[str] = None
+
+class IndicatorCenterRollupResponse(BaseModel):
+    items: List[IndicatorCenterRollupOut]
+    total: Optional[int] = None
@@ -0,0 +1,122 @@
+# =============================
+# app/services/dim_cache.py
+# =============================
+# 维度表进程内缓存：区县、支撑中心、专业、考核类型、指标。
+# 这些表很小且极少变动，每个 worker 常驻一份快照，按版本号 + TTL 失效：
+#   - 维度 CRUD 调用 await invalidate_dims()：本进程立即失效，并递增共享版本号（cache_versions.name = 'dims'，
+#     同时递增数据版本号）；其他 worker 每 DIM_VERSION_CHECK_INTERVAL 秒至多比对一次，发现变化即重新加载；
+#   - 直接改库的变更最迟 DIM_CACHE_TTL 秒后生效。
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.data_version import bump_data_version
+from core.shared_version import SharedVersion
+from models.metrics import District, Center, Major, EvaluationType, Indicator
+
+_dim_version = SharedVersion("dims", lambda: settings.DIM_VERSION_CHECK_INTERVAL)
+_dims: Optional["DimSnapshot"] = None
+_dims_lock = asyncio.Lock()
+
+
+async def invalidate_dims():
+    await _dim_version.bump()
+    # 维度变化会影响按专业/类型/区县聚合的接口响应，一并使响应缓存失效
+    await bump_data_version()
+
+
+def _detach(obj) -> SimpleNamespace:
+    # 只保留列值，避免跨请求共享 ORM 实例（会被某个会话 attach / expire）
+    return SimpleNamespace(**{c.key: getattr(obj, c.key) for c in obj.__mapper__.column_attrs})
+
+
+class DimSnapshot:
+    """
+    一次加载的维度快照：按 ID 与名称建立索引，列表均按主键升序
+    """
+
+    def __init__(self, districts, centers, majors, evaluation_types, indicators, version: int):
+        self.version = version
+        self.loaded_at = time.time()
+
+        self.districts: list = districts
+        self.district_by_id = {d.district_id: d for d in districts}
+        self.district_by_name = {d.district_name: d for d in districts}
+        self.district_by_simple_name = {d.simple_name: d for d in districts}
+        self.circles: list[int] = sorted({d.circle_id for d in districts if d.circle_id is not None})
+
+        self.centers: list = centers
+        self.center_by_id = {c.center_id: c for c in centers}
+        self.center_by_name = {c.center_name: c for c in centers}
+
+        self.majors: list = majors
+        self.major_by_id = {m.major_id: m for m in majors}
+        self.major_by_name = {m.major_name: m for m in majors}
+
+        self.evaluation_types: list = evaluation_types
+        self.type_by_id = {t.type_id: t for t in evaluation_types}
+        self.type_by_name = {t.type_name: t for t in evaluation_types}
+
+        self.indicators: list = indicators
+        self.indicator_by_id = {i.indicator_id: i for i in indicators}
+        self.indicator_by_name = {i.indicator_name: i for i in indicators}
+
+    def find_district(self, name: Optional[str]):
+        """
+        按全称或简称查找区县
+        """
+        if not name:
+            return None
+        return self.district_by_name.get(name) or self.district_by_simple_name.get(name)
+
+    def district_name(self, district_id: Optional[int]) -> Optional[str]:
+        d = self.district_by_id.get(district_id)
+        return d.district_name if d else None
+
+    def centers_of(self, district_id: Optional[int] = None) -> list:
+        if district_id is None:
+            return self.centers
+        return [c for c in self.centers if c.district_id == district_id]
+
+
+async def _load(session: AsyncSession, version: int) -> DimSnapshot:
+    async def _all(model, order_col):
+        rows = (await session.execute(select(model).order_by(order_col))).scalars().all()
+        return [_detach(r) for r in rows]
+
+    return DimSnapshot(
+        districts=await _all(District, District.district_id),
+        centers=await _all(Center, Center.center_id),
+        majors=await _all(Major, Major.major_id),
+        evaluation_types=await _all(EvaluationType, EvaluationType.type_id),
+        indicators=await _all(Indicator, Indicator.indicator_id),
+        version=version,
+    )
+
+
+def _fresh(snap: Optional[DimSnapshot], version: int) -> bool:
+    return (
+        snap is not None
+        and snap.version == version
+        and time.time() - snap.loaded_at < settings.DIM_CACHE_TTL
+    )
+
+
+async def get_dims(session: AsyncSession) -> DimSnapshot:
+    """
+    取当前维度快照，过期时用调用方的会话重新加载（同一进程内并发请求只加载一次）
+    """
+    global _dims
+    version = await _dim_version.sync()
+    snap = _dims
+    if _fresh(snap, version):
+        return snap
+    async with _dims_lock:
+        if not _fresh(_dims, version):
+            _dims = await _load(session, version)
+        return _dims
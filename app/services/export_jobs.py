@@ -0,0 +1,92 @@
+# =============================
+# app/services/export_jobs.py
+# =============================
+# 异步导出任务：请求只登记任务并立即返回 job_id，导出在后台协程中执行，
+# 文件写入任务目录（见 job_store），完成后通过 GET .../file 下载。
+#   - 同时运行的任务数受 EXPORT_JOB_CONCURRENCY 限制，超出的任务排队（phase=queued）；
+#   - DataFrame / writer 的计算仍走 run_pandas 线程池，与在线导出共用同一并发上限。
+import asyncio
+import os
+import time
+from typing import Optional
+
+from fastapi import HTTPException
+
+from core.config import settings
+from models.database import AsyncSessionLocal
+from services.export_service import make_export_writer
+from services.job_store import (
+    new_job, spawn, write_status, status_flusher, remove_quietly, public_job, get_job, finished_file, job_path,
+)
+from utils.threadpool import run_pandas
+
+_job_semaphore = asyncio.Semaphore(settings.EXPORT_JOB_CONCURRENCY)
+
+
+async def _run_job(job: dict, producer, writer) -> None:
+    part_path = job_path(job["job_id"], ".part")
+    flush = status_flusher(job)
+
+    def _progress(n: int) -> None:
+        job["rows"] += n
+        flush()
+
+    try:
+        async with _job_semaphore:
+            job.update(status="running", phase="querying", started_at=time.time())
+            write_status(job)
+            with open(part_path, "wb") as f:
+                async with AsyncSessionLocal() as session:
+                    async for _ in producer(session, writer, progress=_progress):
+                        chunk = writer.drain()
+                        if chunk:
+                            f.write(chunk)
+                job["phase"] = "finalizing"
+                write_status(job)
+                for chunk in await run_pandas(writer.close):
+                    f.write(chunk)
+            os.replace(part_path, job["path"])
+            job.update(
+                status="done",
+                phase="done",
+                size=os.path.getsize(job["path"]),
+                finished_at=time.time(),
+            )
+    except Exception as e:
+        job.update(status="failed", phase="failed", error=str(e), finished_at=time.time())
+        remove_quietly(part_path)
+    finally:
+        write_status(job)
+
+
+def create_export_job(producer, filename: str, fmt: str, owner_id: Optional[int]) -> dict:
+    """
+    登记导出任务并在后台执行；producer 与在线导出相同（write_district_pivot 等的 partial）
+    """
+    writer = make_export_writer(fmt)
+    job = new_job(
+        "export",
+        owner_id,
+        rows=0,
+        format=fmt,
+        filename=f"{filename}.{writer.extension}",
+        media_type=writer.media_type,
+    )
+    job["path"] = job_path(job["job_id"], f".{writer.extension}")
+    spawn(_run_job(job, producer, writer))
+    return public_job(job)
+
+
+def get_export_job(job_id: str, principal) -> dict:
+    return get_job(job_id, "export", principal)
+
+
+def export_job_file(job_id: str, principal) -> dict:
+    """
+    取已完成导出任务的文件信息，未完成返回 409
+    """
+    job = get_export_job(job_id, principal)
+    if job["status"] == "failed":
+        raise HTTPException(status_code=409, detail=f"Export job failed: {job.get('error')}")
+    finished_file(job)
+    return job
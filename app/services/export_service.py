@@ -0,0 +1,258 @@
+# =============================
+# app/services/export_service.py
+# =============================
+import functools
+from datetime import date
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import desc, asc
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Callable, Optional
+
+from core.config import settings
+from models.database import AsyncSessionLocal
+from models.metrics import IndicatorDataV2 as IndicatorData, District, Center, IndicatorCenterData
+from services.dim_cache import get_dims
+from services.indicator_service import metrics_stmt, center_metrics_stmt, CENTER_ORDER_COLUMNS
+from services.pivot_service import pivot_source, pivot_indicator_columns, fill_center_district
+from utils.excel_utils import district_pivot_frame, center_pivot_frame
+from utils.export_writers import EXPORT_WRITERS
+from utils.threadpool import run_pandas, run_pandas_job
+
+METRICS_EXPORT_COLUMNS = {
+    "indicator_name": "指标名称",
+    "district_name": "区县",
+    "stat_date": "统计日期",
+    "value": "完成值",
+    "score": "得分",
+    "benchmark": "基准值",
+    "challenge": "挑战值",
+    "exemption": "豁免值",
+    "zero_tolerance": "零容忍值",
+}
+
+CENTER_EXPORT_COLUMNS = {
+    "indicator_name": "指标名称",
+    "district_name": "区县",
+    "center_name": "支撑中心",
+    "stat_date": "统计日期",
+    "value": "完成值",
+    "benchmark": "基准值",
+    "challenge": "挑战值",
+    "score": "得分",
+}
+
+
+
+def _export_type(column) -> str:
+    # SQLAlchemy 列类型 -> 导出列类型提示（str / int / float / date）
+    py = column.type.python_type
+    if py in (float, Decimal):
+        return "float"
+    if py is int:
+        return "int"
+    if py is date:
+        return "date"
+    return "str"
+
+
+# 列类型提示（供 Parquet 预先建立 schema；xlsx / csv 忽略），取自 SQLAlchemy 列类型
+METRICS_EXPORT_TYPES = [_export_type(getattr(IndicatorData, k)) for k in METRICS_EXPORT_COLUMNS]
+CENTER_EXPORT_TYPES = [
+    _export_type(c)
+    for c in (
+        IndicatorCenterData.indicator_name,
+        District.district_name,
+        IndicatorCenterData.center_name,
+        IndicatorCenterData.stat_date,
+        IndicatorCenterData.value,
+        IndicatorCenterData.benchmark,
+        IndicatorCenterData.challenge,
+        IndicatorCenterData.score,
+    )
+]
+# 透视表的两列标签（与 excel_utils._PIVOT_ENTITIES 对应）
+_PIVOT_LABEL_COLUMNS = {
+    "district": (District.circle_id, District.district_name),
+    "center": (District.district_name, Center.center_name),
+}
+
+
+def _pivot_types(entity: str, data_model, n_indicators: int) -> list[str]:
+    # 透视 Sheet 的列类型：统计日期、两列标签、每个指标的完成值 / 得分
+    labels = [_export_type(c) for c in _PIVOT_LABEL_COLUMNS[entity]]
+    return ["str"] + labels + [_export_type(data_model.value), _export_type(data_model.score)] * n_indicators
+
+Progress = Optional[Callable[[int], None]]
+
+
+def make_export_writer(fmt: str = "xlsx"):
+    """
+    按导出格式创建 writer；parquet 依赖可选的 pyarrow，未安装时返回 400
+    """
+    cls = EXPORT_WRITERS.get(fmt)
+    if cls is None:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {fmt}")
+    try:
+        return cls()
+    except ImportError:
+        raise HTTPException(status_code=400, detail=f"Export format '{fmt}' requires pyarrow to be installed")
+
+
+async def _stream_partitions(session: AsyncSession, stmt):
+    """
+    服务端游标逐批读取（stream_results + yield_per），每批为 RowMapping 列表
+    """
+    result = await session.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+    async for part in result.mappings().partitions():
+        yield part
+
+
+def _write_flat_rows(writer, part, keys, row_hook=None):
+    if row_hook:
+        part = [row_hook(dict(r)) for r in part]
+    writer.write_rows([[r[k] for k in keys] for r in part])
+
+
+async def _write_pivot_sheet(writer, frame_builder, stat_date, date_rows, meta, types):
+    # 透视计算无状态，可交给进程池；写入 writer（有状态）固定在线程池
+    df = await run_pandas_job(frame_builder, date_rows, *meta)
+    await run_pandas(writer.write_frame, str(stat_date), df, sheet_column="统计日期", types=types)
+
+
+async def write_metrics_export(
+    session: AsyncSession,
+    writer,
+    filters: dict,
+    order_by: str = "stat_date",
+    desc_order: bool = True,
+    progress: Progress = None,
+):
+    """
+    区县指标明细导出：逐批写入 writer，每写完一批 yield 一次，便于调用方及时输出字节
+    """
+    keys = list(METRICS_EXPORT_COLUMNS)
+    order_col = getattr(IndicatorData, order_by, IndicatorData.stat_date)
+    direction = desc if desc_order else asc
+    stmt = (
+        metrics_stmt(**filters)
+        .with_only_columns(*[getattr(IndicatorData, k) for k in keys])
+        .order_by(direction(order_col), direction(IndicatorData.id))
+    )
+    writer.start_sheet("导出", list(METRICS_EXPORT_COLUMNS.values()), types=METRICS_EXPORT_TYPES)
+    async for part in _stream_partitions(session, stmt):
+        await run_pandas(_write_flat_rows, writer, part, keys)
+        if progress:
+            progress(len(part))
+        yield
+
+
+async def write_center_export(
+    session: AsyncSession,
+    writer,
+    filters: dict,
+    order_by: str = "stat_date",
+    desc_order: bool = True,
+    progress: Progress = None,
+):
+    """
+    支撑中心指标明细导出，规则同 write_metrics_export
+    """
+    keys = list(CENTER_EXPORT_COLUMNS)
+    dims = await get_dims(session)
+    order_col = CENTER_ORDER_COLUMNS.get(order_by, IndicatorCenterData.stat_date)
+    direction = desc if desc_order else asc
+    stmt = (
+        center_metrics_stmt(**filters)
+        .with_only_columns(
+            IndicatorCenterData.indicator_name,
+            Center.district_id,
+            IndicatorCenterData.center_name,
+            IndicatorCenterData.stat_date,
+            IndicatorCenterData.value,
+            IndicatorCenterData.benchmark,
+            IndicatorCenterData.challenge,
+            IndicatorCenterData.score,
+        )
+        .order_by(direction(order_col), direction(IndicatorCenterData.id))
+    )
+    writer.start_sheet("导出", list(CENTER_EXPORT_COLUMNS.values()), types=CENTER_EXPORT_TYPES)
+    async for part in _stream_partitions(session, stmt):
+        await run_pandas(_write_flat_rows, writer, part, keys, functools.partial(fill_center_district, dims))
+        if progress:
+            progress(len(part))
+        yield
+
+
+async def _write_pivot(session, writer, entity: str, filters: dict, frame_builder, order_by: str, desc_order: bool, progress):
+    dims = await get_dims(session)
+    base_stmt, data_model, columns, entity_col, row_hook = pivot_source(dims, entity, filters)
+    if entity == "district":
+        order_col = getattr(IndicatorData, order_by, IndicatorData.stat_date)
+    else:
+        order_col = CENTER_ORDER_COLUMNS.get(order_by, IndicatorCenterData.stat_date)
+    meta = await pivot_indicator_columns(session, base_stmt, data_model, order_col, desc_order)
+    types = _pivot_types(entity, data_model, len(meta[0]))
+    stmt = base_stmt.with_only_columns(*columns).order_by(
+        asc(data_model.stat_date), asc(entity_col), asc(data_model.indicator_id)
+    )
+    current_date = None
+    bucket: list[dict] = []
+    async for part in _stream_partitions(session, stmt):
+        for r in part:
+            if r["stat_date"] != current_date and bucket:
+                await _write_pivot_sheet(writer, frame_builder, current_date, bucket, meta, types)
+                bucket = []
+            current_date = r["stat_date"]
+            bucket.append(row_hook(dict(r)))
+        if progress:
+            progress(len(part))
+        yield
+    if bucket:
+        await _write_pivot_sheet(writer, frame_builder, current_date, bucket, meta, types)
+
+
+async def write_district_pivot(
+    session: AsyncSession,
+    writer,
+    filters: dict,
+    order_by: str = "stat_date",
+    desc_order: bool = True,
+    progress: Progress = None,
+):
+    """
+    区县×指标透视导出：按统计日期升序读取，每凑齐一天即写出一个 Sheet，内存只保留一天的数据。
+    order_by / desc_order 只决定指标列顺序（见 pivot_indicator_columns）
+    """
+    async for _ in _write_pivot(session, writer, "district", filters, district_pivot_frame, order_by, desc_order, progress):
+        yield
+
+
+async def write_center_pivot(
+    session: AsyncSession,
+    writer,
+    filters: dict,
+    order_by: str = "stat_date",
+    desc_order: bool = True,
+    progress: Progress = None,
+):
+    """
+    支撑中心×指标透视导出，规则同 write_district_pivot
+    """
+    async for _ in _write_pivot(session, writer, "center", filters, center_pivot_frame, order_by, desc_order, progress):
+        yield
+
+
+async def stream_export(producer, writer) -> AsyncIterator[bytes]:
+    """
+    StreamingResponse 的数据源：使用独立会话（请求依赖的会话在响应开始前已关闭），
+    边读边写，writer 可输出的字节立即发送，结束后输出剩余内容。
+    """
+    async with AsyncSessionLocal() as session:
+        async for _ in producer(session, writer):
+            chunk = writer.drain()
+            if chunk:
+                yield chunk
+    for chunk in await run_pandas(writer.close):
+        yield chunk
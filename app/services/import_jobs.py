@@ -0,0 +1,111 @@
+# =============================
+# app/services/import_jobs.py
+# =============================
+# 异步导入任务：上传后立即返回 job_id，解析 / 校验 / 写库在后台执行。
+#   - 校验失败的行全部写入错误清单（Excel，含行号与原因），可通过 GET .../errors 下载；
+#   - skip_invalid=True 时跳过失败行，其余行按 IMPORT_COMMIT_CHUNK_SIZE 分块写入并逐块提交；
+#     skip_invalid=False 时有任何失败行即整体不写入（与同步接口一致，但返回完整错误清单）；
+#   - 同时运行的导入任务数受 IMPORT_JOB_CONCURRENCY 限制。
+import asyncio
+import time
+from typing import Optional
+
+from fastapi import HTTPException
+
+from core.config import settings
+from models.database import AsyncSessionLocal
+from models.metrics import IndicatorDataV2 as IndicatorData, IndicatorCenterData
+from services.dim_cache import get_dims
+from services.job_store import (
+    new_job, spawn, write_status, status_flusher, public_job, get_job, finished_file, job_path,
+)
+from services.upload_service import dim_tables, commit_merged_in_chunks, format_row_errors
+from utils.excel_utils import build_upload_error_xlsx, INDICATOR_UPLOAD_COLUMNS, CENTER_UPLOAD_COLUMNS
+from utils.threadpool import run_pandas, run_pandas_job
+from utils.upload_validation import prepare_indicator_upload, prepare_center_upload
+
+_job_semaphore = asyncio.Semaphore(settings.IMPORT_JOB_CONCURRENCY)
+
+# 导入对象 -> (解析 + 整表校验函数, 数据表, 表头映射)
+_IMPORT_SPECS = {
+    "district": (prepare_indicator_upload, IndicatorData, INDICATOR_UPLOAD_COLUMNS),
+    "center": (prepare_center_upload, IndicatorCenterData, CENTER_UPLOAD_COLUMNS),
+}
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+async def _run_import(job: dict, contents: bytes, skip_invalid: bool) -> None:
+    prepare, data_model, upload_columns = _IMPORT_SPECS[job["entity"]]
+    flush = status_flusher(job)
+
+    def _progress(n: int) -> None:
+        job["rows_committed"] += n
+        flush()
+
+    try:
+        async with _job_semaphore:
+            job.update(status="running", phase="validating", started_at=time.time())
+            write_status(job)
+            async with AsyncSessionLocal() as session:
+                tables = dim_tables(await get_dims(session))
+                # 解析与整表校验在同一个 pandas 任务中完成，只回传合并后的有效行与失败行
+                merged, errors, error_rows, row_count = await run_pandas_job(prepare, contents, tables)
+                contents = None
+                job["rows_total"] = row_count
+                if errors:
+                    job["error_path"] = job_path(job["job_id"], ".errors.xlsx")
+                    xlsx = await run_pandas_job(build_upload_error_xlsx, error_rows, errors, upload_columns)
+                    await run_pandas(_write_bytes, job["error_path"], xlsx)
+                    job.update(rows_failed=len(errors), errors_preview=format_row_errors(errors)[:10])
+                if errors and not skip_invalid:
+                    job.update(status="failed", phase="failed", error="Data validation failed", finished_at=time.time())
+                    return
+
+                job.update(phase="importing", rows_valid=len(merged))
+                write_status(job)
+                await commit_merged_in_chunks(
+                    session, data_model, merged, settings.IMPORT_COMMIT_CHUNK_SIZE, progress=_progress
+                )
+            job.update(status="done", phase="done", finished_at=time.time())
+    except Exception as e:
+        # 已提交的块保留，rows_committed 即实际写入行数
+        job.update(status="failed", phase="failed", error=str(e), finished_at=time.time())
+    finally:
+        write_status(job)
+
+
+def create_import_job(entity: str, filename: str, contents: bytes, skip_invalid: bool, owner_id: Optional[int]) -> dict:
+    """
+    登记导入任务并在后台执行；entity 为 district | center
+    """
+    job = new_job(
+        "import",
+        owner_id,
+        entity=entity,
+        filename=filename,
+        skip_invalid=skip_invalid,
+        rows_total=None,
+        rows_valid=None,
+        rows_failed=0,
+        rows_committed=0,
+    )
+    spawn(_run_import(job, contents, skip_invalid))
+    return public_job(job)
+
+
+def get_import_job(job_id: str, principal) -> dict:
+    return get_job(job_id, "import", principal)
+
+
+def import_job_errors_file(job_id: str, principal) -> str:
+    """
+    取导入任务的错误清单文件路径；任务未结束返回 409，没有失败行返回 404
+    """
+    job = get_import_job(job_id, principal)
+    if job["status"] in ("done", "failed") and not job.get("error_path"):
+        raise HTTPException(status_code=404, detail="No failed rows in this import")
+    return finished_file(job, "error_path")
@@ -1,16 +1,27 @@
 # =============================
 # app/services/indicator_service.py
 # =============================
-from sqlalchemy import select, func, desc, asc, and_, update
+from sqlalchemy import select, func, desc, asc, and_, update, tuple_, type_coerce, Numeric
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Tuple
 from fastapi import HTTPException
 from datetime import date
+import base64
+import hashlib
+import json
 import math
 import numbers
-
-from models.metrics import IndicatorDataV2 as IndicatorData, Indicator, Major, KPIType, District, EvaluationType, Center, IndicatorCenterData
+import time
+
+from core.config import settings
+from core.data_version import sync_data_version, bump_data_version
+from services.dim_cache import get_dims, invalidate_dims
+from services.latest_service import refresh_latest
+from services.rollup_service import refresh_rollups, affected_rollup_keys, PERIOD_KEYS, period_start, period_end
+from utils.downsample import lttb_indices
+from models.metrics import IndicatorDataV2 as IndicatorData, Indicator, Center, IndicatorCenterData, IndicatorLatest, IndicatorCenterLatest, DimDate
+from models.metrics import IndicatorRollup, IndicatorCenterRollup
 from models.metrics_schemas import (
     IndicatorDataOut,
     MajorMetricsResponse,
@@ -21,6 +32,8 @@ from models.metrics_schemas import (
     IndicatorBase,
     IndicatorCenterDataOut,
     CenterMetricsResponse,
+    IndicatorRollupOut,
+    IndicatorCenterRollupOut,
 )
 
 def _nan_to_none(v):
@@ -34,8 +47,76 @@ def _nan_to_none(v):
     return v
 
 
-async def query_metrics(
-    session: AsyncSession,
+# with_total=exact 的计数缓存：filter 哈希 -> (total, 过期时间戳, 数据版本)
+_count_cache: dict[str, tuple[int, int, int]] = {}
+
+
+def _filter_hash(stmt) -> str:
+    compiled = stmt.compile()
+    raw = f"{compiled}|{sorted(compiled.params.items())}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+async def _estimate_rows(session: AsyncSession, stmt) -> int:
+    conn = await session.connection()
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    rows = (await conn.exec_driver_sql("EXPLAIN " + sql)).mappings().all()
+    estimate = 1.0
+    for r in rows:
+        if str(r.get("id")) != "1" or r.get("rows") is None:
+            continue
+        estimate *= float(r["rows"]) * float(r.get("filtered") or 100) / 100
+    return int(round(estimate)) if rows else 0
+
+
+async def _count_total(session: AsyncSession, stmt, with_total: str = "exact") -> Optional[int]:
+    """
+    with_total: false 不计数；exact 精确计数（按 filter 哈希缓存）；estimate 取 EXPLAIN 行数估计
+    """
+    if with_total == "false":
+        return None
+    stmt = stmt.order_by(None).limit(None).offset(None)
+    if with_total == "estimate":
+        return await _estimate_rows(session, stmt)
+
+    count_stmt = select(func.count()).select_from(stmt.subquery())
+    key = _filter_hash(count_stmt)
+    now_ts = int(time.time())
+    version = await sync_data_version()
+    cached = _count_cache.get(key)
+    if cached and cached[1] > now_ts and cached[2] == version:
+        return cached[0]
+    total = (await session.execute(count_stmt)).scalar_one()
+    if len(_count_cache) >= settings.COUNT_CACHE_MAX_ENTRIES:
+        _count_cache.clear()
+    _count_cache[key] = (total, now_ts + settings.COUNT_CACHE_TTL, version)
+    return total
+
+
+# ---------- 分区裁剪 ----------
+# 事实表按 stat_date 月分区（sql/migrations/004，python manage.py partitions 维护）。
+# 调用方给出起止日期时按 stat_date 过滤，优化器据此只访问对应分区；未给出时不补日期条件，结果与未分区时一致。
+# 最新日期查找先在最近的分区内进行，找不到再全表查找。
+
+
+def _add_months(d: date, n: int) -> date:
+    y, m = divmod(d.year * 12 + d.month - 1 + n, 12)
+    return date(y, m + 1, 1)
+
+
+async def latest_stat_date(session: AsyncSession, stmt, data_model) -> Optional[date]:
+    """
+    stmt（对 data_model 的筛选查询）范围内的最新统计日期。
+    先查上个月月初及之后的数据（只访问最近的分区），找不到再不限日期查找。
+    """
+    q = stmt.with_only_columns(func.max(data_model.stat_date)).order_by(None)
+    found = (await session.execute(q.where(data_model.stat_date >= _add_months(date.today(), -1)))).scalar()
+    if found is None:
+        found = (await session.execute(q)).scalar()
+    return found
+
+
+def metrics_stmt(
     indicator_id: Optional[int] = None,
     district_id: Optional[int] = None,
     district_ids: Optional[List[int]] = None,
@@ -43,13 +124,12 @@ async def query_metrics(
     circle_id: Optional[int] = None,
     start_date = None,
     end_date = None,
-    page: int = 1,
-    size: int = 50,
-    order_by: str = "stat_date",
-    desc_order: bool = True,
     major_id: Optional[int] = None,
     type_id: Optional[int] = None,
-) -> Tuple[List[IndicatorDataOut], int]:
+):
+    """
+    区县数据筛选查询（列表、导出、透视、索引检查共用），未排序、未分页
+    """
     stmt = select(IndicatorData).join(Indicator, Indicator.indicator_id == IndicatorData.indicator_id)
 
     filters = [Indicator.status == 1]
@@ -73,21 +153,259 @@ async def query_metrics(
     if type_id is not None:
         filters.append(Indicator.type_id == type_id)
 
-    if filters:
-        stmt = stmt.where(and_(*filters))
+    return stmt.where(and_(*filters))
+
+
+# 游标分页只允许有索引支撑的排序列（均以 id 作为并列时的次序）
+_KEYSET_ORDER_COLUMNS = {
+    "stat_date": IndicatorData.stat_date,
+}
+
+_CENTER_KEYSET_ORDER_COLUMNS = {
+    "stat_date": IndicatorCenterData.stat_date,
+}
+
 
-    count_subq = stmt.order_by(None).limit(None).offset(None).subquery()
-    total = (await session.execute(select(func.count()).select_from(count_subq))).scalar_one()
+def _encode_cursor(order_by: str, desc_order: bool, last_value, last_id: int) -> str:
+    if isinstance(last_value, date):
+        last_value = last_value.isoformat()
+    raw = json.dumps({"o": order_by, "d": int(desc_order), "v": last_value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, order_by: str, desc_order: bool):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_value, last_id = payload["v"], int(payload["id"])
+        if payload["o"] != order_by or bool(payload["d"]) != desc_order:
+            raise ValueError("cursor does not match order")
+    except Exception:
+        raise HTTPException(400, "Invalid cursor")
+    if order_by == "stat_date":
+        try:
+            last_value = date.fromisoformat(last_value)
+        except Exception:
+            raise HTTPException(400, "Invalid cursor")
+    return last_value, last_id
+
+
+def _keyset_order(order_map: dict, order_by: str):
+    order_col = order_map.get(order_by)
+    if order_col is None:
+        raise HTTPException(400, f"cursor paging supports order_by in {sorted(order_map)}")
+    return order_col
+
+
+# fields= 列投影：响应字段 -> 列。只查询请求的列并直接返回 dict 行，不构建 ORM 实体与 Pydantic 对象
+_DATA_FIELD_COLUMNS = {name: getattr(IndicatorData, name) for name in IndicatorDataOut.model_fields}
+_LATEST_FIELD_COLUMNS = {
+    **{name: getattr(IndicatorLatest, name) for name in IndicatorDataOut.model_fields if name != "id"},
+    "id": IndicatorLatest.data_id,
+}
+# 支撑中心的 district_name 由 Center.district_id 经维度缓存换算
+_CENTER_FIELD_COLUMNS = {
+    **{name: getattr(IndicatorCenterData, name) for name in IndicatorCenterDataOut.model_fields if name not in ("district_id", "district_name")},
+    "district_id": Center.district_id,
+    "district_name": Center.district_id,
+}
+
+
+def _project(stmt, field_columns: dict, names: List[str], *hidden):
+    """
+    只查询 names 对应的列（DECIMAL 列按 float 取回）；hidden 为需要读取但不返回的列（如游标键），排在最后
+    """
+    cols = []
+    for name in names:
+        col = field_columns[name]
+        if isinstance(col.type, Numeric):
+            col = type_coerce(col, Numeric(asdecimal=False))
+        cols.append(col.label(name))
+    return stmt.with_only_columns(*cols, *hidden)
+
+
+def _projected_rows(rows, names: List[str], dims=None) -> List[dict]:
+    items = [dict(zip(names, r)) for r in rows]
+    if dims is not None and "district_name" in names:
+        for it in items:
+            it["district_name"] = dims.district_name(it["district_name"])
+    return items
+
+
+async def query_metrics(
+    session: AsyncSession,
+    indicator_id: Optional[int] = None,
+    district_id: Optional[int] = None,
+    district_ids: Optional[List[int]] = None,
+    district_name: Optional[str] = None,
+    circle_id: Optional[int] = None,
+    start_date = None,
+    end_date = None,
+    page: int = 1,
+    size: int = 50,
+    order_by: str = "stat_date",
+    desc_order: bool = True,
+    major_id: Optional[int] = None,
+    type_id: Optional[int] = None,
+    with_total: str = "exact",
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[IndicatorDataOut], Optional[int]]:
+    """
+    fields 指定时只查询这些列，items 为 dict 行（见 _project）
+    """
+    stmt = metrics_stmt(
+        indicator_id=indicator_id,
+        district_id=district_id,
+        district_ids=district_ids,
+        district_name=district_name,
+        circle_id=circle_id,
+        start_date=start_date,
+        end_date=end_date,
+        major_id=major_id,
+        type_id=type_id,
+    )
+
+    total = await _count_total(session, stmt, with_total)
 
     order_col = getattr(IndicatorData, order_by, IndicatorData.stat_date)
-    stmt = stmt.order_by(desc(order_col) if desc_order else asc(order_col))
+    direction = desc if desc_order else asc
+    stmt = stmt.order_by(direction(order_col), direction(IndicatorData.id))
 
     stmt = stmt.offset((page - 1) * size).limit(size)
 
+    if fields:
+        return (_projected_rows((await session.execute(_project(stmt, _DATA_FIELD_COLUMNS, fields))).all(), fields), total)
     result = await session.execute(stmt)
     rows = result.scalars().all()
     return ([IndicatorDataOut.model_validate(r) for r in rows], total)
 
+async def query_metrics_keyset(
+    session: AsyncSession,
+    cursor: Optional[str] = None,
+    size: int = 50,
+    order_by: str = "stat_date",
+    desc_order: bool = True,
+    with_total: str = "exact",
+    fields: Optional[List[str]] = None,
+    **filters,
+) -> Tuple[List[IndicatorDataOut], Optional[int], Optional[str]]:
+    """
+    游标（seek）分页：按 (排序列, id) 定位下一页，不再使用 OFFSET。
+    仅首页（cursor 为空）返回 total，后续页 total 为 None。fields 规则同 query_metrics。
+    """
+    order_col = _keyset_order(_KEYSET_ORDER_COLUMNS, order_by)
+    stmt = metrics_stmt(**filters)
+
+    total = None
+    if cursor is None:
+        total = await _count_total(session, stmt, with_total)
+    else:
+        last_value, last_id = _decode_cursor(cursor, order_by, desc_order)
+        key = tuple_(order_col, IndicatorData.id)
+        stmt = stmt.where(key < (last_value, last_id) if desc_order else key > (last_value, last_id))
+
+    direction = desc if desc_order else asc
+    stmt = stmt.order_by(direction(order_col), direction(IndicatorData.id)).limit(size + 1)
+    if fields:
+        stmt = _project(stmt, _DATA_FIELD_COLUMNS, fields, order_col.label("_cursor_value"), IndicatorData.id.label("_cursor_id"))
+        rows = (await session.execute(stmt)).all()
+    else:
+        rows = (await session.execute(stmt)).scalars().all()
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        last_value, last_id = (last[-2], last[-1]) if fields else (getattr(last, order_by), last.id)
+        next_cursor = _encode_cursor(order_by, desc_order, last_value, last_id)
+    if fields:
+        return (_projected_rows(rows, fields), total, next_cursor)
+    return ([IndicatorDataOut.model_validate(r) for r in rows], total, next_cursor)
+
+# 趋势聚合：week / month / quarter 按 dim_date 分组（分组列见 rollup_service.PERIOD_KEYS，day 为原始日粒度，不聚合）
+_BUCKET_AGGS = {"avg": func.avg, "min": func.min, "max": func.max}
+
+
+def _bucket_series_stmt(stmt, data_model, entity_col, bucket: str, agg: str):
+    """
+    按 dim_date 聚合到周 / 月 / 季：每个 (指标, 实体, 桶) 以桶内最后一行为代表行；
+    agg=avg|min|max 时额外返回桶内 value / score 的聚合值（last 即代表行本身的值）
+    """
+    cols = [
+        data_model.indicator_id.label("indicator_id"),
+        entity_col.label("entity_id"),
+        func.max(data_model.stat_date).label("last_date"),
+    ]
+    if agg != "last":
+        fn = _BUCKET_AGGS[agg]
+        cols += [fn(data_model.value).label("agg_value"), fn(data_model.score).label("agg_score")]
+    buckets = (
+        stmt.with_only_columns(*cols)
+        .join(DimDate, DimDate.day == data_model.stat_date)
+        .group_by(data_model.indicator_id, entity_col, *PERIOD_KEYS[bucket])
+        .subquery()
+    )
+    stmt = stmt.join(buckets, and_(
+        data_model.indicator_id == buckets.c.indicator_id,
+        entity_col == buckets.c.entity_id,
+        data_model.stat_date == buckets.c.last_date,
+    ))
+    if agg != "last":
+        stmt = stmt.add_columns(buckets.c.agg_value, buckets.c.agg_score)
+    return stmt
+
+
+def _bucket_point(item, bucket: str, aggs):
+    # 代表行 -> 桶：stat_date 改为桶起始日（周一 / 月初 / 季初），聚合值覆盖 value / score；
+    # 列投影的 dict 行只更新其中已有的字段
+    if bucket == "day":
+        return item
+    is_row = isinstance(item, dict)
+    update = {}
+    if not is_row or "stat_date" in item:
+        update["stat_date"] = period_start(item["stat_date"] if is_row else item.stat_date, bucket)
+    if aggs:
+        update["value"], update["score"] = (None if v is None else float(v) for v in aggs)
+    if is_row:
+        item.update((k, v) for k, v in update.items() if k in item)
+        return item
+    return item.model_copy(update=update)
+
+
+def _series_extra_fields(fields: List[str], entity_attr: str, max_points: Optional[int]) -> List[str]:
+    # 列投影 + 降采样时需额外读取实体、日期与完成值，返回前再去掉
+    if not max_points:
+        return []
+    return [f for f in (entity_attr, "stat_date", "value") if f not in fields]
+
+
+def _check_series_rows(rows: list) -> None:
+    """
+    趋势查询按 SERIES_MAX_SOURCE_ROWS + 1 读取，多出的一行说明源数据超限：返回 400 而不是静默丢弃最新的点
+    """
+    if len(rows) > settings.SERIES_MAX_SOURCE_ROWS:
+        raise HTTPException(400, "Too many data points; narrow the date range or use a coarser bucket")
+
+
+def _downsample_series(items: list, entity_attr: str, max_points: int) -> list:
+    """
+    按实体分别做 LTTB 降采样（每个实体至多 max_points 个点）；需要降采样的实体忽略 value 为空的点
+    """
+    get = (lambda it, k: it[k]) if items and isinstance(items[0], dict) else getattr
+    groups: dict = {}
+    for item in items:
+        groups.setdefault(get(item, entity_attr), []).append(item)
+    out = []
+    for group in groups.values():
+        if len(group) > max_points:
+            group = [it for it in group if get(it, "value") is not None]
+            idx = lttb_indices([get(it, "stat_date").toordinal() for it in group], [get(it, "value") for it in group], max_points)
+            group = [group[i] for i in idx]
+        out.extend(group)
+    out.sort(key=lambda it: get(it, "stat_date"))
+    return out
+
+
 async def query_series(
     session: AsyncSession,
     indicator_id: int,
@@ -95,7 +413,17 @@ async def query_series(
     start_date = None,
     end_date = None,
     size: int = 180,
-) -> Tuple[List[IndicatorDataOut], int]:
+    with_total: str = "exact",
+    bucket: str = "day",
+    agg: str = "avg",
+    max_points: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[IndicatorDataOut], Optional[int]]:
+    """
+    区县指标趋势：bucket=week|month|quarter 时按 dim_date 聚合（agg=avg|last|min|max），
+    max_points 指定时按区县做 LTTB 降采样（此时不按 size 截断，源数据超过 SERIES_MAX_SOURCE_ROWS 行返回 400）。
+    total 为聚合后、降采样前的点数。fields 规则同 query_metrics。
+    """
     if not indicator_id:
         raise HTTPException(400, "indicator_id is required")
     stmt = select(IndicatorData).join(Indicator, Indicator.indicator_id == IndicatorData.indicator_id)
@@ -107,39 +435,149 @@ async def query_series(
     if end_date is not None:
         filters.append(IndicatorData.stat_date <= end_date)
     stmt = stmt.where(and_(*filters))
-    count_subq = stmt.order_by(None).limit(None).offset(None).subquery()
-    total = (await session.execute(select(func.count()).select_from(count_subq))).scalar_one()
-    stmt = stmt.order_by(asc(IndicatorData.stat_date)).limit(size)
-    result = await session.execute(stmt)
-    rows = result.scalars().all()
-    return ([IndicatorDataOut.model_validate(r) for r in rows], total)
+    if fields:
+        extra = _series_extra_fields(fields, "district_id", max_points)
+        names = fields + extra
+        stmt = _project(stmt, _DATA_FIELD_COLUMNS, names)
+    if bucket != "day":
+        stmt = _bucket_series_stmt(stmt, IndicatorData, IndicatorData.district_id, bucket, agg)
+    total = await _count_total(session, stmt, with_total)
+    stmt = stmt.order_by(asc(IndicatorData.stat_date)).limit(settings.SERIES_MAX_SOURCE_ROWS + 1 if max_points else size)
+    rows = (await session.execute(stmt)).all()
+    if max_points:
+        _check_series_rows(rows)
+    if fields:
+        items = [_bucket_point(dict(zip(names, r)), bucket, r[len(names):]) for r in rows]
+    else:
+        items = [_bucket_point(IndicatorDataOut.model_validate(r[0]), bucket, r[1:]) for r in rows]
+    if max_points:
+        items = _downsample_series(items, "district_id", max_points)
+    if fields and extra:
+        items = [{k: it[k] for k in fields} for it in items]
+    return (items, total)
 
-async def get_all_centers(session: AsyncSession, district_id: Optional[int] = None):
-    stmt = select(Center)
-    if district_id is not None:
-        stmt = stmt.where(Center.district_id == district_id)
-    stmt = stmt.order_by(asc(Center.center_id))
-    result = await session.execute(stmt)
-    return result.scalars().all()
+# 数据表 -> 周 / 月 / 季预聚合表（rollup_service 与数据写入同事务维护）
+_ROLLUP_TABLES = {IndicatorData: IndicatorRollup, IndicatorCenterData: IndicatorCenterRollup}
 
-async def query_center_metrics(
+
+def _rollup_aligned(period: str, start_date, end_date) -> bool:
+    # 起始日为周期首日、结束日为周期末日（或未指定）时可直接使用整周期预聚合
+    if start_date is not None and period_start(start_date, period) != start_date:
+        return False
+    return end_date is None or period_end(period_start(end_date, period), period) == end_date
+
+
+# 批量趋势：实体 -> (数据表, 实体列)
+_SERIES_SOURCES = {
+    "district": (IndicatorData, IndicatorData.district_id),
+    "center": (IndicatorCenterData, IndicatorCenterData.center_id),
+}
+
+
+async def query_series_batch(
     session: AsyncSession,
+    entity: str,
+    indicator_ids: List[int],
+    entity_ids: Optional[List[int]] = None,
+    start_date = None,
+    end_date = None,
+    bucket: str = "day",
+    agg: str = "avg",
+    max_points: Optional[int] = None,
+) -> dict:
+    """
+    多指标 × 多实体趋势：一次查询（indicator_id IN + 实体 IN + 日期区间，按 指标, 实体, 日期 排序），
+    按 (indicator_id, entity_id) 分组返回列式数组；bucket / agg / max_points 规则同 query_series。
+    entity_ids 为空表示全部区县 / 支撑中心；源数据超过 SERIES_MAX_SOURCE_ROWS 行返回 400。
+    bucket≠day 且起止日期与周期边界对齐（或未指定）时读取周 / 月 / 季预聚合表，否则按日数据经 dim_date 聚合。
+    """
+    if len(indicator_ids) > settings.SERIES_BATCH_MAX_INDICATORS:
+        raise HTTPException(400, f"At most {settings.SERIES_BATCH_MAX_INDICATORS} indicator_ids per request")
+    data_model, entity_col = _SERIES_SOURCES[entity]
+    use_rollup = bucket != "day" and _rollup_aligned(bucket, start_date, end_date)
+    if use_rollup:
+        # 起止日期与周期边界对齐时，整周期的预聚合与按日聚合结果一致，直接读取预聚合表
+        rollup_model = _ROLLUP_TABLES[data_model]
+        rollup_entity = getattr(rollup_model, entity_col.key)
+        stmt = (
+            select(
+                rollup_model.indicator_id, rollup_entity, rollup_model.period_start,
+                getattr(rollup_model, f"value_{agg}"), getattr(rollup_model, f"score_{agg}"),
+            )
+            .join(Indicator, Indicator.indicator_id == rollup_model.indicator_id)
+        )
+        filters = [Indicator.status == 1, rollup_model.period == bucket, rollup_model.indicator_id.in_(indicator_ids)]
+        if entity_ids:
+            filters.append(rollup_entity.in_(entity_ids))
+        if start_date is not None:
+            filters.append(rollup_model.period_start >= start_date)
+        if end_date is not None:
+            filters.append(rollup_model.period_start <= end_date)
+        order = (rollup_model.indicator_id, rollup_entity, rollup_model.period_start)
+    else:
+        stmt = (
+            select(data_model.indicator_id, entity_col, data_model.stat_date, data_model.value, data_model.score)
+            .join(Indicator, Indicator.indicator_id == data_model.indicator_id)
+        )
+        filters = [Indicator.status == 1, data_model.indicator_id.in_(indicator_ids)]
+        if entity_ids:
+            filters.append(entity_col.in_(entity_ids))
+        if start_date is not None:
+            filters.append(data_model.stat_date >= start_date)
+        if end_date is not None:
+            filters.append(data_model.stat_date <= end_date)
+        order = (data_model.indicator_id, entity_col, data_model.stat_date)
+    stmt = stmt.where(and_(*filters))
+    if bucket != "day" and not use_rollup:
+        stmt = _bucket_series_stmt(stmt, data_model, entity_col, bucket, agg)
+    stmt = stmt.order_by(*map(asc, order)).limit(settings.SERIES_MAX_SOURCE_ROWS + 1)
+    rows = (await session.execute(stmt)).all()
+    _check_series_rows(rows)
+
+    groups: dict = {}
+    for iid, eid, stat_date, value, score, *aggs in rows:
+        if bucket != "day":
+            stat_date = period_start(stat_date, bucket)
+            if aggs:
+                value, score = aggs
+        col = groups.get((iid, eid))
+        if col is None:
+            col = groups[(iid, eid)] = {"indicator_id": iid, "entity_id": eid, "stat_date": [], "value": [], "score": []}
+        col["stat_date"].append(stat_date)
+        col["value"].append(None if value is None else float(value))
+        col["score"].append(None if score is None else float(score))
+
+    series = list(groups.values())
+    if max_points:
+        for col in series:
+            if len(col["stat_date"]) <= max_points:
+                continue
+            keep = [i for i, v in enumerate(col["value"]) if v is not None]
+            idx = lttb_indices([col["stat_date"][i].toordinal() for i in keep], [col["value"][i] for i in keep], max_points)
+            for k in ("stat_date", "value", "score"):
+                col[k] = [col[k][keep[i]] for i in idx]
+    return {"entity": entity, "series": series}
+
+async def get_all_centers(session: AsyncSession, district_id: Optional[int] = None):
+    dims = await get_dims(session)
+    return dims.centers_of(district_id)
+
+def center_metrics_stmt(
     indicator_id: Optional[int] = None,
     center_id: Optional[int] = None,
     district_id: Optional[int] = None,
     start_date=None,
     end_date=None,
-    page: int = 1,
-    size: int = 50,
-    order_by: str = "stat_date",
-    desc_order: bool = True,
     major_id: Optional[int] = None,
     type_id: Optional[int] = None,
-) -> Tuple[List[IndicatorCenterDataOut], int]:
+):
+    """
+    支撑中心数据筛选查询，规则同 metrics_stmt；结果行为 (IndicatorCenterData, district_id)
+    """
+    # 区县名称由维度缓存补齐，SQL 中不再关联 districts
     stmt = (
-        select(IndicatorCenterData, Center, District)
+        select(IndicatorCenterData, Center.district_id)
         .join(Center, Center.center_id == IndicatorCenterData.center_id)
-        .outerjoin(District, District.district_id == Center.district_id)
         .join(Indicator, Indicator.indicator_id == IndicatorCenterData.indicator_id)
     )
 
@@ -159,87 +597,162 @@ async def query_center_metrics(
     if type_id is not None:
         filters.append(Indicator.type_id == type_id)
 
-    if filters:
-        stmt = stmt.where(and_(*filters))
-
-    count_subq = stmt.order_by(None).limit(None).offset(None).subquery()
-    total = (await session.execute(select(func.count()).select_from(count_subq))).scalar_one()
-
-    order_map = {
-        "stat_date": IndicatorCenterData.stat_date,
-        "value": IndicatorCenterData.value,
-        "benchmark": IndicatorCenterData.benchmark,
-        "challenge": IndicatorCenterData.challenge,
-        "score": IndicatorCenterData.score,
-        "center_id": IndicatorCenterData.center_id,
-        "indicator_id": IndicatorCenterData.indicator_id,
-        "district_id": Center.district_id,
-    }
-    order_col = order_map.get(order_by, IndicatorCenterData.stat_date)
-    stmt = stmt.order_by(desc(order_col) if desc_order else asc(order_col))
+    return stmt.where(and_(*filters))
+
+
+# 支撑中心列表 / 导出可用的排序列
+CENTER_ORDER_COLUMNS = {
+    "stat_date": IndicatorCenterData.stat_date,
+    "value": IndicatorCenterData.value,
+    "benchmark": IndicatorCenterData.benchmark,
+    "challenge": IndicatorCenterData.challenge,
+    "score": IndicatorCenterData.score,
+    "center_id": IndicatorCenterData.center_id,
+    "indicator_id": IndicatorCenterData.indicator_id,
+    "district_id": Center.district_id,
+}
+
+
+def _center_row_out(data_obj, district_id, dims) -> IndicatorCenterDataOut:
+    return IndicatorCenterDataOut.model_validate(
+        {
+            "id": data_obj.id,
+            "indicator_id": data_obj.indicator_id,
+            "indicator_name": data_obj.indicator_name,
+            "type_id": data_obj.type_id,
+            "major_id": data_obj.major_id,
+            "is_positive": data_obj.is_positive,
+            "center_id": data_obj.center_id,
+            "center_name": data_obj.center_name,
+            "district_id": district_id,
+            "district_name": dims.district_name(district_id),
+            "stat_date": data_obj.stat_date,
+            "value": data_obj.value,
+            "benchmark": data_obj.benchmark,
+            "challenge": data_obj.challenge,
+            "exemption": data_obj.exemption,
+            "zero_tolerance": data_obj.zero_tolerance,
+            "score": data_obj.score,
+        }
+    )
+
+
+async def query_center_metrics(
+    session: AsyncSession,
+    indicator_id: Optional[int] = None,
+    center_id: Optional[int] = None,
+    district_id: Optional[int] = None,
+    start_date=None,
+    end_date=None,
+    page: int = 1,
+    size: int = 50,
+    order_by: str = "stat_date",
+    desc_order: bool = True,
+    major_id: Optional[int] = None,
+    type_id: Optional[int] = None,
+    with_total: str = "exact",
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[IndicatorCenterDataOut], Optional[int]]:
+    """
+    fields 规则同 query_metrics
+    """
+    stmt = center_metrics_stmt(
+        indicator_id=indicator_id,
+        center_id=center_id,
+        district_id=district_id,
+        start_date=start_date,
+        end_date=end_date,
+        major_id=major_id,
+        type_id=type_id,
+    )
+
+    total = await _count_total(session, stmt, with_total)
+
+    order_col = CENTER_ORDER_COLUMNS.get(order_by, IndicatorCenterData.stat_date)
+    direction = desc if desc_order else asc
+    stmt = stmt.order_by(direction(order_col), direction(IndicatorCenterData.id))
     stmt = stmt.offset((page - 1) * size).limit(size)
 
+    if fields:
+        stmt = _project(stmt, _CENTER_FIELD_COLUMNS, fields)
     result = await session.execute(stmt)
     rows = result.all()
-    out: List[IndicatorCenterDataOut] = []
-    for data_obj, center_obj, district_obj in rows:
-        out.append(
-            IndicatorCenterDataOut.model_validate(
-                {
-                    "id": data_obj.id,
-                    "indicator_id": data_obj.indicator_id,
-                    "indicator_name": data_obj.indicator_name,
-                    "type_id": data_obj.type_id,
-                    "major_id": data_obj.major_id,
-                    "is_positive": data_obj.is_positive,
-                    "center_id": data_obj.center_id,
-                    "center_name": data_obj.center_name,
-                    "district_id": getattr(center_obj, "district_id", None),
-                    "district_name": getattr(district_obj, "district_name", None) if district_obj else None,
-                    "stat_date": data_obj.stat_date,
-                    "value": data_obj.value,
-                    "benchmark": data_obj.benchmark,
-                    "challenge": data_obj.challenge,
-                    "exemption": data_obj.exemption,
-                    "zero_tolerance": data_obj.zero_tolerance,
-                    "score": data_obj.score,
-                }
-            )
-        )
+    dims = await get_dims(session)
+    if fields:
+        return (_projected_rows(rows, fields, dims), total)
+    out: List[IndicatorCenterDataOut] = [_center_row_out(d, did, dims) for d, did in rows]
     return (out, total)
 
+async def query_center_metrics_keyset(
+    session: AsyncSession,
+    cursor: Optional[str] = None,
+    size: int = 50,
+    order_by: str = "stat_date",
+    desc_order: bool = True,
+    with_total: str = "exact",
+    fields: Optional[List[str]] = None,
+    **filters,
+) -> Tuple[List[IndicatorCenterDataOut], Optional[int], Optional[str]]:
+    """
+    支撑中心数据的游标分页，规则同 query_metrics_keyset
+    """
+    order_col = _keyset_order(_CENTER_KEYSET_ORDER_COLUMNS, order_by)
+    stmt = center_metrics_stmt(**filters)
+
+    total = None
+    if cursor is None:
+        total = await _count_total(session, stmt, with_total)
+    else:
+        last_value, last_id = _decode_cursor(cursor, order_by, desc_order)
+        key = tuple_(order_col, IndicatorCenterData.id)
+        stmt = stmt.where(key < (last_value, last_id) if desc_order else key > (last_value, last_id))
+
+    direction = desc if desc_order else asc
+    stmt = stmt.order_by(direction(order_col), direction(IndicatorCenterData.id)).limit(size + 1)
+    if fields:
+        stmt = _project(stmt, _CENTER_FIELD_COLUMNS, fields, order_col.label("_cursor_value"), IndicatorCenterData.id.label("_cursor_id"))
+    rows = (await session.execute(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        if fields:
+            last_value, last_id = rows[-1][-2], rows[-1][-1]
+        else:
+            last = rows[-1][0]
+            last_value, last_id = getattr(last, order_by), last.id
+        next_cursor = _encode_cursor(order_by, desc_order, last_value, last_id)
+    dims = await get_dims(session)
+    if fields:
+        return (_projected_rows(rows, fields, dims), total, next_cursor)
+    return ([_center_row_out(d, did, dims) for d, did in rows], total, next_cursor)
+
 async def get_indicators_by_center(
     session: AsyncSession,
     center_id: int | None,
     center_name: str | None,
     stat_date: str | None,
 ) -> CenterMetricsResponse:
-    center_query = select(Center)
+    dims = await get_dims(session)
     if center_id:
-        center_query = center_query.where(Center.center_id == center_id)
+        center = dims.center_by_id.get(center_id)
     elif center_name:
-        center_query = center_query.where(Center.center_name == center_name)
+        center = dims.center_by_name.get(center_name)
     else:
         raise HTTPException(400, "center_id or center_name must be provided")
-    center = (await session.execute(center_query)).scalar_one_or_none()
     if not center:
         raise HTTPException(404, "Center not found")
 
     if stat_date:
         final_date = stat_date
     else:
-        latest_q = await session.execute(
-            select(func.max(IndicatorCenterData.stat_date)).where(IndicatorCenterData.center_id == center.center_id)
+        final_date = await latest_stat_date(
+            session, select(IndicatorCenterData).where(IndicatorCenterData.center_id == center.center_id), IndicatorCenterData
         )
-        final_date = latest_q.scalar()
     if not final_date:
         raise HTTPException(404, "No data available for this center")
 
-    dist_name = None
-    if center.district_id is not None:
-        dist_name = (
-            await session.execute(select(District.district_name).where(District.district_id == center.district_id))
-        ).scalar_one_or_none()
+    dist_name = dims.district_name(center.district_id)
 
     data_q = await session.execute(
         select(IndicatorCenterData)
@@ -282,38 +795,38 @@ async def get_latest_center_indicator_data(
     if not indicator_id:
         return []
 
-    base_latest = select(func.max(IndicatorCenterData.stat_date)).where(IndicatorCenterData.indicator_id == indicator_id)
-    if district_id is not None:
-        base_latest = base_latest.select_from(IndicatorCenterData).join(Center, Center.center_id == IndicatorCenterData.center_id).where(
-            Center.district_id == district_id
-        )
-    q_latest = await session.execute(base_latest)
-    latest_date = q_latest.scalar()
     if stat_date:
         latest_date = stat_date
+    else:
+        base_latest = select(IndicatorCenterData).where(IndicatorCenterData.indicator_id == indicator_id)
+        if district_id is not None:
+            base_latest = base_latest.join(Center, Center.center_id == IndicatorCenterData.center_id).where(
+                Center.district_id == district_id
+            )
+        latest_date = await latest_stat_date(session, base_latest, IndicatorCenterData)
     if not latest_date:
         return []
 
     stmt = (
-        select(IndicatorCenterData, Center, District)
+        select(IndicatorCenterData, Center.center_name, Center.district_id)
         .join(Center, Center.center_id == IndicatorCenterData.center_id)
-        .outerjoin(District, District.district_id == Center.district_id)
         .where(IndicatorCenterData.indicator_id == indicator_id, IndicatorCenterData.stat_date == latest_date)
     )
     if district_id is not None:
         stmt = stmt.where(Center.district_id == district_id)
     stmt = stmt.order_by(asc(Center.center_id))
     rows = (await session.execute(stmt)).all()
+    dims = await get_dims(session)
     out = []
-    for d, c, dist in rows:
+    for d, center_name, center_district_id in rows:
         out.append(
             {
                 "indicator_id": d.indicator_id,
                 "indicator_name": d.indicator_name,
-                "center_id": c.center_id,
-                "center_name": c.center_name,
-                "district_id": getattr(c, "district_id", None),
-                "district_name": getattr(dist, "district_name", None) if dist else None,
+                "center_id": d.center_id,
+                "center_name": center_name,
+                "district_id": center_district_id,
+                "district_name": dims.district_name(center_district_id),
                 "stat_date": d.stat_date,
                 "value": d.value,
                 "score": d.score,
@@ -328,13 +841,20 @@ async def query_center_series(
     start_date=None,
     end_date=None,
     size: int = 180,
-) -> Tuple[List[IndicatorCenterDataOut], int]:
+    with_total: str = "exact",
+    bucket: str = "day",
+    agg: str = "avg",
+    max_points: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[IndicatorCenterDataOut], Optional[int]]:
+    """
+    支撑中心指标趋势，bucket / agg / max_points / fields 规则同 query_series（按支撑中心分别降采样）
+    """
     if not indicator_id:
         raise HTTPException(400, "indicator_id is required")
     stmt = (
-        select(IndicatorCenterData, Center, District)
+        select(IndicatorCenterData, Center.district_id)
         .join(Center, Center.center_id == IndicatorCenterData.center_id)
-        .outerjoin(District, District.district_id == Center.district_id)
         .join(Indicator, Indicator.indicator_id == IndicatorCenterData.indicator_id)
     )
     filters = [Indicator.status == 1, IndicatorCenterData.indicator_id == indicator_id]
@@ -345,43 +865,33 @@ async def query_center_series(
     if end_date is not None:
         filters.append(IndicatorCenterData.stat_date <= end_date)
     stmt = stmt.where(and_(*filters))
-    count_subq = stmt.order_by(None).limit(None).offset(None).subquery()
-    total = (await session.execute(select(func.count()).select_from(count_subq))).scalar_one()
-    stmt = stmt.order_by(asc(IndicatorCenterData.stat_date)).limit(size)
-    result = await session.execute(stmt)
-    rows = result.all()
-    out: List[IndicatorCenterDataOut] = []
-    for data_obj, center_obj, district_obj in rows:
-        out.append(
-            IndicatorCenterDataOut.model_validate(
-                {
-                    "id": data_obj.id,
-                    "indicator_id": data_obj.indicator_id,
-                    "indicator_name": data_obj.indicator_name,
-                    "type_id": data_obj.type_id,
-                    "major_id": data_obj.major_id,
-                    "is_positive": data_obj.is_positive,
-                    "center_id": data_obj.center_id,
-                    "center_name": data_obj.center_name,
-                    "district_id": getattr(center_obj, "district_id", None),
-                    "district_name": getattr(district_obj, "district_name", None) if district_obj else None,
-                    "stat_date": data_obj.stat_date,
-                    "value": data_obj.value,
-                    "benchmark": data_obj.benchmark,
-                    "challenge": data_obj.challenge,
-                    "exemption": data_obj.exemption,
-                    "zero_tolerance": data_obj.zero_tolerance,
-                    "score": data_obj.score,
-                }
-            )
-        )
+    if fields:
+        extra = _series_extra_fields(fields, "center_id", max_points)
+        names = fields + extra
+        stmt = _project(stmt, _CENTER_FIELD_COLUMNS, names)
+    if bucket != "day":
+        stmt = _bucket_series_stmt(stmt, IndicatorCenterData, IndicatorCenterData.center_id, bucket, agg)
+    total = await _count_total(session, stmt, with_total)
+    stmt = stmt.order_by(asc(IndicatorCenterData.stat_date)).limit(settings.SERIES_MAX_SOURCE_ROWS + 1 if max_points else size)
+    rows = (await session.execute(stmt)).all()
+    if max_points:
+        _check_series_rows(rows)
+    dims = await get_dims(session)
+    if fields:
+        n = len(names)
+        out = [_bucket_point(it, bucket, r[n:]) for it, r in zip(_projected_rows(rows, names, dims), rows)]
+    else:
+        out: List[IndicatorCenterDataOut] = [_bucket_point(_center_row_out(r[0], r[1], dims), bucket, r[2:]) for r in rows]
+    if max_points:
+        out = _downsample_series(out, "center_id", max_points)
+    if fields and extra:
+        out = [{k: it[k] for k in fields} for it in out]
     return (out, total)
 
 
 async def get_all_circles(session: AsyncSession) -> List[int]:
-    stmt = select(District.circle_id).where(District.circle_id.is_not(None)).group_by(District.circle_id).order_by(District.circle_id)
-    res = await session.execute(stmt)
-    return [r[0] for r in res.all()]
+    dims = await get_dims(session)
+    return dims.circles
 
 async def update_indicator_data(session: AsyncSession, data) -> IndicatorDataOut:
     stmt = select(IndicatorData).where(
@@ -399,7 +909,11 @@ async def update_indicator_data(session: AsyncSession, data) -> IndicatorDataOut
     existing.zero_tolerance = _nan_to_none(data.zero_tolerance)
     if hasattr(data, "score"):
         existing.score = _nan_to_none(data.score)
+    await session.flush()
+    await refresh_latest(session, IndicatorData, [(existing.indicator_id, existing.district_id)])
+    await refresh_rollups(session, IndicatorData, [(existing.indicator_id, existing.district_id, existing.stat_date)])
     await session.commit()
+    await bump_data_version()
     await session.refresh(existing)
     return IndicatorDataOut.model_validate(existing)
 
@@ -425,16 +939,21 @@ async def delete_metrics(
         filters.append(IndicatorData.stat_date <= end_date)
     if not filters:
         raise HTTPException(400, "delete requires ids or filters")
+    keys = await affected_rollup_keys(session, IndicatorData, filters)
     stmt = stmt.where(and_(*filters))
     result = await session.execute(stmt)
+    await refresh_latest(session, IndicatorData, {k[:2] for k in keys})
+    await refresh_rollups(session, IndicatorData, keys)
     await session.commit()
+    await bump_data_version()
     return result.rowcount or 0
 
 async def create_center_data(session: AsyncSession, data):
-    ind = await session.get(Indicator, data.indicator_id)
+    dims = await get_dims(session)
+    ind = dims.indicator_by_id.get(data.indicator_id)
     if not ind:
         raise HTTPException(404, "Indicator not found")
-    center = await session.get(Center, data.center_id)
+    center = dims.center_by_id.get(data.center_id)
     if not center:
         raise HTTPException(404, "Center not found")
 
@@ -479,7 +998,11 @@ async def create_center_data(session: AsyncSession, data):
             score=score,
         )
         session.add(data_obj)
+    await session.flush()
+    await refresh_latest(session, IndicatorCenterData, [(ind.indicator_id, center.center_id)])
+    await refresh_rollups(session, IndicatorCenterData, [(ind.indicator_id, center.center_id, data_obj.stat_date)])
     await session.commit()
+    await bump_data_version()
     await session.refresh(data_obj)
     return data_obj
 
@@ -497,7 +1020,11 @@ async def update_center_data(session: AsyncSession, data) -> IndicatorCenterData
     existing.challenge = _nan_to_none(data.challenge)
     if hasattr(data, "score"):
         existing.score = _nan_to_none(data.score)
+    await session.flush()
+    await refresh_latest(session, IndicatorCenterData, [(existing.indicator_id, existing.center_id)])
+    await refresh_rollups(session, IndicatorCenterData, [(existing.indicator_id, existing.center_id, existing.stat_date)])
     await session.commit()
+    await bump_data_version()
     await session.refresh(existing)
     return IndicatorCenterDataOut.model_validate(existing)
 
@@ -523,9 +1050,13 @@ async def delete_center_metrics(
         filters.append(IndicatorCenterData.stat_date <= end_date)
     if not filters:
         raise HTTPException(400, "delete requires ids or filters")
+    keys = await affected_rollup_keys(session, IndicatorCenterData, filters)
     stmt = stmt.where(and_(*filters))
     result = await session.execute(stmt)
+    await refresh_latest(session, IndicatorCenterData, {k[:2] for k in keys})
+    await refresh_rollups(session, IndicatorCenterData, keys)
     await session.commit()
+    await bump_data_version()
     return result.rowcount or 0
 
 async def search_indicators(
@@ -555,19 +1086,15 @@ async def get_indicators_by_district(
     # -----------------------------
     # 1. 查询区县
     # -----------------------------
-    district_query = select(District)
+    dims = await get_dims(session)
 
     if district_id:
-        district_query = district_query.where(District.district_id == district_id)
+        district = dims.district_by_id.get(district_id)
     elif district_name:
-        district_query = district_query.where(
-            (District.district_name == district_name) |
-            (District.simple_name == district_name)
-        )
+        district = dims.find_district(district_name)
     else:
         raise HTTPException(400, "district_id or district_name must be provided")
 
-    district = (await session.execute(district_query)).scalar_one_or_none()
     if not district:
         raise HTTPException(404, "District not found")
 
@@ -577,12 +1104,9 @@ async def get_indicators_by_district(
     if stat_date:
         final_date = stat_date
     else:
-        latest_q = await session.execute(
-            select(func.max(IndicatorData.stat_date)).where(
-                IndicatorData.district_id == district.district_id
-            )
+        final_date = await latest_stat_date(
+            session, select(IndicatorData).where(IndicatorData.district_id == district.district_id), IndicatorData
         )
-        final_date = latest_q.scalar()
 
     if not final_date:
         raise HTTPException(404, "No data available for this district")
@@ -645,14 +1169,13 @@ async def get_latest_indicator_data(
     if not indicator_id:
         return []
 
-    # ② 查询该指标最新一天（按 stat_date）
-    q_latest = await session.execute(
-        select(func.max(IndicatorData.stat_date)).where(IndicatorData.indicator_id == indicator_id)
-    )
-    latest_date = q_latest.scalar()
-
+    # ② 查询该指标最新一天（按 stat_date，先查最近两个月的分区）
     if stat_date:
         latest_date = stat_date
+    else:
+        latest_date = await latest_stat_date(
+            session, select(IndicatorData).where(IndicatorData.indicator_id == indicator_id), IndicatorData
+        )
 
     if not latest_date:
         return []
@@ -682,46 +1205,42 @@ async def latest_metrics(
     size: int = 50,
     order_by: str = "stat_date",
     desc_order: bool = True,
-) -> Tuple[List[IndicatorDataOut], int]:
-    base = select(IndicatorData).join(Indicator, Indicator.indicator_id == IndicatorData.indicator_id)
+    with_total: str = "exact",
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[IndicatorDataOut], Optional[int]]:
+    # 每个 (指标, 区县) 的最新一行由 indicator_latest 维护，无需对全部历史开窗
+    stmt = select(IndicatorLatest).join(Indicator, Indicator.indicator_id == IndicatorLatest.indicator_id)
 
     filters = [Indicator.status == 1]
     if indicator_id is not None:
-        filters.append(IndicatorData.indicator_id == indicator_id)
+        filters.append(IndicatorLatest.indicator_id == indicator_id)
     if district_id is not None:
-        filters.append(IndicatorData.district_id == district_id)
+        filters.append(IndicatorLatest.district_id == district_id)
     if district_name is not None:
-        filters.append(IndicatorData.district_name == district_name)
+        filters.append(IndicatorLatest.district_name == district_name)
     if circle_id is not None:
-        filters.append(IndicatorData.circle_id == circle_id)
+        filters.append(IndicatorLatest.circle_id == circle_id)
     if major_id is not None:
         filters.append(Indicator.major_id == major_id)
     if type_id is not None:
         filters.append(Indicator.type_id == type_id)
+    stmt = stmt.where(and_(*filters))
 
-    if filters:
-        base = base.where(and_(*filters))
-
-    latest_subq = select(
-        IndicatorData,
-        func.row_number().over(
-            partition_by=[IndicatorData.indicator_id, IndicatorData.district_id],
-            order_by=desc(IndicatorData.stat_date)
-        ).label("rn")
-    ).select_from(base.order_by(None).limit(None).offset(None).subquery()).subquery()
-
-    stmt = select(latest_subq).where(latest_subq.c.rn == 1)
-
-    count_subq = stmt.subquery()
-    total = (await session.execute(select(func.count()).select_from(count_subq))).scalar_one()
+    total = await _count_total(session, stmt, with_total)
 
-    order_col = latest_subq.c.stat_date if "stat_date" in latest_subq.c else latest_subq.c.indicator_id
-    stmt = stmt.order_by(desc(order_col) if desc_order else asc(order_col))
+    direction = desc if desc_order else asc
+    stmt = stmt.order_by(
+        direction(IndicatorLatest.stat_date),
+        direction(IndicatorLatest.indicator_id),
+        direction(IndicatorLatest.district_id),
+    )
 
     stmt = stmt.offset((page - 1) * size).limit(size)
 
+    if fields:
+        return (_projected_rows((await session.execute(_project(stmt, _LATEST_FIELD_COLUMNS, fields))).all(), fields), total)
     result = await session.execute(stmt)
-    rows = result.all()
+    rows = result.scalars().all()
     items: List[IndicatorDataOut] = []
     for r in rows:
         items.append(IndicatorDataOut.model_validate({
@@ -738,11 +1257,97 @@ async def latest_metrics(
             "exemption": r.exemption,
             "zero_tolerance": r.zero_tolerance,
             "score": r.score,
-            "id": r.id,
+            "id": r.data_id,
         }))
     return (items, total)
 
 
+
+def _center_ids_in(dims, district_id: Optional[int], circle_id: Optional[int]) -> List[int]:
+    # 所属区县 / 圈层下的支撑中心（维度缓存）
+    out = []
+    for c in dims.centers_of(district_id):
+        d = dims.district_by_id.get(c.district_id)
+        if circle_id is None or (d is not None and d.circle_id == circle_id):
+            out.append(c.center_id)
+    return out
+
+
+async def query_rollup(
+    session: AsyncSession,
+    entity: str = "district",
+    period: str = "month",
+    indicator_id: Optional[int] = None,
+    entity_id: Optional[int] = None,
+    district_id: Optional[int] = None,
+    circle_id: Optional[int] = None,
+    major_id: Optional[int] = None,
+    type_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    page: int = 1,
+    size: int = 50,
+    desc_order: bool = True,
+    with_total: str = "exact",
+) -> Tuple[list, Optional[int]]:
+    """
+    周 / 月 / 季预聚合查询（indicator_rollup / indicator_center_rollup），entity 为 district | center。
+    start_date / end_date 按周期起始日筛选（start_date 所在的周期也包含在内）；
+    entity_id 为区县ID / 支撑中心ID，district_id（仅支撑中心）与 circle_id 按所属区县 / 圈层筛选。
+    """
+    data_model, entity_col = _SERIES_SOURCES[entity]
+    rollup_model = _ROLLUP_TABLES[data_model]
+    rollup_entity = getattr(rollup_model, entity_col.key)
+    stmt = (
+        select(rollup_model, Indicator.indicator_name, Indicator.is_positive)
+        .join(Indicator, Indicator.indicator_id == rollup_model.indicator_id)
+    )
+    dims = await get_dims(session)
+
+    filters = [Indicator.status == 1, rollup_model.period == period]
+    if indicator_id is not None:
+        filters.append(rollup_model.indicator_id == indicator_id)
+    if entity_id is not None:
+        filters.append(rollup_entity == entity_id)
+    if entity == "district" and circle_id is not None:
+        filters.append(rollup_entity.in_([d.district_id for d in dims.districts if d.circle_id == circle_id]))
+    if entity == "center" and (district_id is not None or circle_id is not None):
+        filters.append(rollup_entity.in_(_center_ids_in(dims, district_id, circle_id)))
+    if major_id is not None:
+        filters.append(Indicator.major_id == major_id)
+    if type_id is not None:
+        filters.append(Indicator.type_id == type_id)
+    if start_date is not None:
+        filters.append(rollup_model.period_start >= period_start(start_date, period))
+    if end_date is not None:
+        filters.append(rollup_model.period_start <= end_date)
+    stmt = stmt.where(and_(*filters))
+
+    total = await _count_total(session, stmt, with_total)
+
+    direction = desc if desc_order else asc
+    stmt = stmt.order_by(
+        direction(rollup_model.period_start),
+        direction(rollup_model.indicator_id),
+        direction(rollup_entity),
+    ).offset((page - 1) * size).limit(size)
+
+    items = []
+    for r, indicator_name, is_positive in (await session.execute(stmt)).all():
+        row = {c.key: getattr(r, c.key) for c in rollup_model.__table__.columns if c.key != "update_time"}
+        row.update(indicator_name=indicator_name, is_positive=is_positive)
+        if entity == "district":
+            d = dims.district_by_id.get(r.district_id)
+            row.update(circle_id=d.circle_id if d else None, district_name=d.district_name if d else None)
+            items.append(IndicatorRollupOut.model_validate(row))
+        else:
+            c = dims.center_by_id.get(r.center_id)
+            district = c.district_id if c else None
+            row.update(center_name=c.center_name if c else None, district_id=district, district_name=dims.district_name(district))
+            items.append(IndicatorCenterRollupOut.model_validate(row))
+    return (items, total)
+
+
 async def get_metrics_by_major(
     session: AsyncSession,
     major_id: int | None,
@@ -757,42 +1362,25 @@ async def get_metrics_by_major(
     # -----------------------------
     # 1. 查询专业
     # -----------------------------
-    query = select(Major)
+    dims = await get_dims(session)
 
     if major_id:
-        query = query.where(Major.major_id == major_id)
+        major = dims.major_by_id.get(major_id)
     elif major_name:
-        query = query.where(Major.major_name.like(f"%{major_name}%"))
+        major = next((m for m in dims.majors if major_name in m.major_name), None)
     else:
         raise HTTPException(400, "major_id or major_name must be provided")
 
-    major = (await session.execute(query)).scalar_one_or_none()
     if not major:
         raise HTTPException(404, "Major not found")
 
     # -----------------------------
     # 2. 查询该专业下的所有指标
     # -----------------------------
-    # 去重：按 indicator_id 选择最新有效版本
-    dedup_major_subq = (
-        select(
-            Indicator.indicator_id,
-            Indicator.major_id,
-            func.row_number().over(
-                partition_by=[Indicator.indicator_id],
-                order_by=[desc(Indicator.version), desc(Indicator.update_time)]
-            ).label("rn"),
-        )
-        .where(Indicator.status == 1)
-        .subquery()
-    )
-
-    result = await session.execute(
-        select(Indicator)
-        .join(dedup_major_subq, dedup_major_subq.c.indicator_id == Indicator.indicator_id)
-        .where(dedup_major_subq.c.rn == 1, dedup_major_subq.c.major_id == major.major_id)
-    )
-    indicators = result.scalars().all()
+    indicators = [
+        i for i in dims.indicators
+        if i.status == 1 and i.major_id == major.major_id
+    ]
 
     if not indicators:
         return MajorMetricsResponse(
@@ -810,10 +1398,10 @@ async def get_metrics_by_major(
     if stat_date:
         final_date = stat_date
     else:
-        # 查询 IndicatorData 中该专业最新的日期
+        # 该专业最新的日期（最新值表中的最大日期即全部历史的最大日期）
         latest_q = await session.execute(
-            select(func.max(IndicatorData.stat_date)).where(
-                IndicatorData.indicator_id.in_(indicator_ids)
+            select(func.max(IndicatorLatest.stat_date)).where(
+                IndicatorLatest.indicator_id.in_(indicator_ids)
             )
         )
         final_date = latest_q.scalar()
@@ -824,22 +1412,17 @@ async def get_metrics_by_major(
     # -----------------------------
     # 4. 确定区县
     # -----------------------------
-    district_query = select(District)
+    districts = dims.districts
 
     # 如果按 district_id 查询
     if district_id:
-        district_query = district_query.where(District.district_id == district_id)
+        districts = [d for d in districts if d.district_id == district_id]
 
     # 如果按名称查询
     if districts_name:
-        district_query = district_query.where(
-            (District.district_name == districts_name) |
-            (District.simple_name == districts_name)
-        )
+        districts = [d for d in districts if districts_name in (d.district_name, d.simple_name)]
 
     # 如果两个都没传，则查全部
-    districts_q = await session.execute(district_query)
-    districts = districts_q.scalars().all()
 
     if not districts:
         raise HTTPException(404, "No matching districts found")
@@ -856,18 +1439,11 @@ async def get_metrics_by_major(
         )
         data_list = data_q.scalars().all()
     else:
-        latest_subq = (
-            select(
-                IndicatorData,
-                func.row_number().over(
-                    partition_by=[IndicatorData.indicator_id, IndicatorData.district_id],
-                    order_by=desc(IndicatorData.stat_date)
-                ).label("rn")
+        data_q = await session.execute(
+            select(IndicatorLatest.indicator_id, IndicatorLatest.district_id, IndicatorLatest.value).where(
+                IndicatorLatest.indicator_id.in_(indicator_ids)
             )
-            .where(IndicatorData.indicator_id.in_(indicator_ids))
-            .subquery()
         )
-        data_q = await session.execute(select(latest_subq).where(latest_subq.c.rn == 1))
         data_list = data_q.all()
 
     # 整理为 dict，便于快速查找
@@ -924,43 +1500,25 @@ async def get_metrics_by_type(
     # -----------------------------
     # 1. 查询指标类型
     # -----------------------------
-    query = select(EvaluationType)
+    dims = await get_dims(session)
 
     if type_id:
-        query = query.where(EvaluationType.type_id == type_id)
+        type_obj = dims.type_by_id.get(type_id)
     elif type_name:
-        query = query.where(EvaluationType.type_name.like(f"%{type_name}%"))
+        type_obj = next((t for t in dims.evaluation_types if type_name in t.type_name), None)
     else:
         raise HTTPException(400, "type_id or type_name must be provided")
 
-    type_obj = (await session.execute(query)).scalar_one_or_none()
-
     if not type_obj:
         raise HTTPException(404, "Evaluation type not found")
 
     # -----------------------------
     # 2. 查询该类型下所有指标
     # -----------------------------
-    # 去重：按 indicator_id 选择最新有效版本
-    dedup_type_subq = (
-        select(
-            Indicator.indicator_id,
-            Indicator.type_id,
-            func.row_number().over(
-                partition_by=[Indicator.indicator_id],
-                order_by=[desc(Indicator.version), desc(Indicator.update_time)]
-            ).label("rn"),
-        )
-        .where(Indicator.status == 1)
-        .subquery()
-    )
-
-    result = await session.execute(
-        select(Indicator)
-        .join(dedup_type_subq, dedup_type_subq.c.indicator_id == Indicator.indicator_id)
-        .where(dedup_type_subq.c.rn == 1, dedup_type_subq.c.type_id == type_obj.type_id)
-    )
-    indicators = result.scalars().all()
+    indicators = [
+        i for i in dims.indicators
+        if i.status == 1 and i.type_id == type_obj.type_id
+    ]
 
     if not indicators:
         return TypeMetricsResponse(
@@ -979,8 +1537,8 @@ async def get_metrics_by_type(
         final_date = stat_date
     else:
         latest_q = await session.execute(
-            select(func.max(IndicatorData.stat_date)).where(
-                IndicatorData.indicator_id.in_(indicator_ids)
+            select(func.max(IndicatorLatest.stat_date)).where(
+                IndicatorLatest.indicator_id.in_(indicator_ids)
             )
         )
         final_date = latest_q.scalar()
@@ -991,19 +1549,13 @@ async def get_metrics_by_type(
     # -----------------------------
     # 4. 处理区县（支持 id 或 名称）
     # -----------------------------
-    district_query = select(District)
+    districts = dims.districts
 
     if district_id:
-        district_query = district_query.where(District.district_id == district_id)
+        districts = [d for d in districts if d.district_id == district_id]
 
     if districts_name:
-        district_query = district_query.where(
-            (District.district_name == districts_name) |
-            (District.simple_name == districts_name)
-        )
-
-    districts_q = await session.execute(district_query)
-    districts = districts_q.scalars().all()
+        districts = [d for d in districts if districts_name in (d.district_name, d.simple_name)]
 
     if not districts:
         raise HTTPException(404, "No matching districts found")
@@ -1020,18 +1572,11 @@ async def get_metrics_by_type(
         )
         data_list = data_q.scalars().all()
     else:
-        latest_subq = (
-            select(
-                IndicatorData,
-                func.row_number().over(
-                    partition_by=[IndicatorData.indicator_id, IndicatorData.district_id],
-                    order_by=desc(IndicatorData.stat_date)
-                ).label("rn")
+        data_q = await session.execute(
+            select(IndicatorLatest.indicator_id, IndicatorLatest.district_id, IndicatorLatest.value).where(
+                IndicatorLatest.indicator_id.in_(indicator_ids)
             )
-            .where(IndicatorData.indicator_id.in_(indicator_ids))
-            .subquery()
         )
-        data_q = await session.execute(select(latest_subq).where(latest_subq.c.rn == 1))
         data_list = data_q.all()
 
     # 构造字典加速查找
@@ -1077,41 +1622,39 @@ async def get_all_districts(session: AsyncSession):
     """
     获取所有区县列表
     """
-    stmt = select(District).order_by(District.district_id)
-    result = await session.execute(stmt)
-    return result.scalars().all()
+    dims = await get_dims(session)
+    return dims.districts
 
 
 async def get_all_majors(session: AsyncSession):
     """
     获取所有专业列表
     """
-    stmt = select(Major).order_by(Major.major_id)
-    result = await session.execute(stmt)
-    return result.scalars().all()
+    dims = await get_dims(session)
+    return dims.majors
 
 
 async def get_all_evaluation_types(session: AsyncSession):
     """
     获取所有考核类型列表
     """
-    stmt = select(EvaluationType).order_by(EvaluationType.type_id)
-    result = await session.execute(stmt)
-    return result.scalars().all()
+    dims = await get_dims(session)
+    return dims.evaluation_types
 
 
 async def get_all_indicators_simple(session: AsyncSession):
     """
     获取所有指标简单信息（ID和名称）
     """
-    stmt = select(Indicator).order_by(Indicator.indicator_id)
-    result = await session.execute(stmt)
-    return result.scalars().all()
+    dims = await get_dims(session)
+    return dims.indicators
 
 async def get_indicators_simple_by_type(session: AsyncSession, type_id: int):
-    stmt = select(Indicator).where(Indicator.type_id == type_id, Indicator.status == 1).order_by(Indicator.indicator_name)
-    result = await session.execute(stmt)
-    return result.scalars().all()
+    dims = await get_dims(session)
+    return sorted(
+        (i for i in dims.indicators if i.type_id == type_id and i.status == 1),
+        key=lambda i: i.indicator_name,
+    )
 
 
 async def create_indicator_data(session: AsyncSession, data):
@@ -1119,13 +1662,14 @@ async def create_indicator_data(session: AsyncSession, data):
     创建指标数据
     如果数据已存在（同一指标、区县、日期），则更新数据
     """
+    dims = await get_dims(session)
     # 1. 验证指标是否存在
-    ind = await session.get(Indicator, data.indicator_id)
+    ind = dims.indicator_by_id.get(data.indicator_id)
     if not ind:
         raise HTTPException(404, "Indicator not found")
         
     # 2. 验证区县是否存在
-    dist = await session.get(District, data.district_id)
+    dist = dims.district_by_id.get(data.district_id)
     if not dist:
         raise HTTPException(404, "District not found")
         
@@ -1184,7 +1728,11 @@ async def create_indicator_data(session: AsyncSession, data):
         )
         session.add(data_obj)
     
+    await session.flush()
+    await refresh_latest(session, IndicatorData, [(ind.indicator_id, dist.district_id)])
+    await refresh_rollups(session, IndicatorData, [(ind.indicator_id, dist.district_id, data_obj.stat_date)])
     await session.commit()
+    await bump_data_version()
     await session.refresh(data_obj)
     return data_obj
 
@@ -1224,6 +1772,7 @@ async def create_indicator(session: AsyncSession, payload: IndicatorBase):
     )
     session.add(obj)
     await session.commit()
+    await invalidate_dims()
     await session.refresh(obj)
     return IndicatorOut.model_validate(obj)
 
@@ -1260,7 +1809,15 @@ async def update_indicator(session: AsyncSession, indicator_id: int, payload: In
             .where(IndicatorCenterData.indicator_id == indicator_id)
             .values(**sync_fields)
         )
+        for latest_model in (IndicatorLatest, IndicatorCenterLatest):
+            await session.execute(
+                update(latest_model)
+                .where(latest_model.indicator_id == indicator_id)
+                .values(**sync_fields)
+            )
     await session.commit()
+    await bump_data_version()
+    await invalidate_dims()
     await session.refresh(obj)
     return IndicatorOut.model_validate(obj)
 
@@ -1270,4 +1827,6 @@ async def delete_indicator(session: AsyncSession, indicator_id: int):
         raise HTTPException(404, "Indicator not found")
     await session.delete(obj)
     await session.commit()
+    await bump_data_version()
+    await invalidate_dims()
     return {"deleted": 1}
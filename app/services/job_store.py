@@ -0,0 +1,158 @@
+# =============================
+# app/services/job_store.py
+# =============================
+# 后台任务（异步导出 / 异步导入）的公共部分：
+#   - 任务状态以 <job_id>.json 存于 BACKGROUND_JOB_DIR（原子替换），同一主机上的其他 worker 也能查询；
+#   - 任务产生的文件放在同一目录，超过 BACKGROUND_JOB_TTL 秒后在创建 / 查询任务时顺带清理
+#     （排队中 / 执行中的任务不清理，避免长时间排队的任务状态丢失）；
+#   - 任务协程由 spawn() 启动并持有引用，避免被垃圾回收。
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Optional
+
+from fastapi import HTTPException
+
+from core.config import settings
+
+_tasks: set = set()
+_last_cleanup: float = 0.0
+_STATUS_FLUSH_INTERVAL = 0.5
+_ACTIVE_STATUSES = ("queued", "running")
+
+
+def job_dir() -> str:
+    os.makedirs(settings.BACKGROUND_JOB_DIR, exist_ok=True)
+    return settings.BACKGROUND_JOB_DIR
+
+
+def job_path(job_id: str, suffix: str) -> str:
+    return os.path.join(job_dir(), f"{job_id}{suffix}")
+
+
+def write_status(job: dict) -> None:
+    path = job_path(job["job_id"], ".json")
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(job, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _read_status(job_id: str) -> Optional[dict]:
+    try:
+        with open(job_path(job_id, ".json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def cleanup_expired_jobs(force: bool = False) -> int:
+    """
+    删除超过 BACKGROUND_JOB_TTL 的任务文件（状态文件与产出文件），返回删除的文件数；默认每分钟至多扫描一次。
+    状态为排队中 / 执行中的任务跳过（文件名均以 <job_id>. 开头）
+    """
+    global _last_cleanup
+    now = time.time()
+    if not force and now - _last_cleanup < 60:
+        return 0
+    _last_cleanup = now
+    removed = 0
+    active: dict[str, bool] = {}
+    with os.scandir(job_dir()) as it:
+        for entry in it:
+            try:
+                if not entry.is_file() or now - entry.stat().st_mtime <= settings.BACKGROUND_JOB_TTL:
+                    continue
+                job_id = entry.name.split(".", 1)[0]
+                if job_id not in active:
+                    job = _read_status(job_id)
+                    active[job_id] = job is not None and job.get("status") in _ACTIVE_STATUSES
+                if active[job_id]:
+                    continue
+                os.remove(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                continue
+    return removed
+
+
+def new_job(kind: str, owner_id: Optional[int], **fields) -> dict:
+    """
+    登记一个排队中的任务并写出初始状态
+    """
+    cleanup_expired_jobs()
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "kind": kind,
+        "status": "queued",
+        "phase": "queued",
+        "created_at": time.time(),
+        "owner_id": owner_id,
+        **fields,
+    }
+    write_status(job)
+    return job
+
+
+def spawn(coro) -> None:
+    task = asyncio.get_running_loop().create_task(coro)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+def status_flusher(job: dict):
+    """
+    返回一个节流的状态写出函数：进度频繁变化时每 0.5 秒至多落盘一次
+    """
+    last_flush = 0.0
+
+    def _flush() -> None:
+        nonlocal last_flush
+        now = time.monotonic()
+        if now - last_flush >= _STATUS_FLUSH_INTERVAL:
+            last_flush = now
+            write_status(job)
+
+    return _flush
+
+
+def remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def public_job(job: dict) -> dict:
+    """
+    对外返回的任务状态（去掉属主与服务器路径）
+    """
+    return {k: v for k, v in job.items() if k not in ("owner_id", "path", "error_path")}
+
+
+def get_job(job_id: str, kind: str, principal) -> dict:
+    """
+    读取任务状态；仅创建者或管理员可见，不存在、类型不符或已过期返回 404
+    """
+    cleanup_expired_jobs()
+    job = _read_status(job_id) if job_id.isalnum() else None
+    if (
+        job is None
+        or job.get("kind") != kind
+        or (job.get("owner_id") != principal.id and not principal.is_admin)
+    ):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+def finished_file(job: dict, key: str = "path") -> str:
+    """
+    取已完成任务的产出文件路径，未完成返回 409，文件已清理返回 404
+    """
+    if job["status"] not in ("done", "failed") or not job.get(key):
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    if not os.path.exists(job[key]):
+        raise HTTPException(status_code=404, detail="Job file expired")
+    return job[key]
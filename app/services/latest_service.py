@@ -0,0 +1,98 @@
+# =============================
+# app/services/latest_service.py
+# =============================
+# 最新值表维护：indicator_latest / indicator_center_latest 保存每个 (指标, 实体) 最新统计日期的一行。
+# 写入路径在提交前调用 refresh_latest(...)，只重算受影响的键，与数据写入处于同一事务。
+from typing import Iterable
+
+from sqlalchemy import select, delete, func, and_, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.metrics import (
+    IndicatorDataV2 as IndicatorData,
+    IndicatorCenterData,
+    IndicatorLatest,
+    IndicatorCenterLatest,
+)
+
+_KEY_CHUNK = 500
+
+# 数据表 -> (最新值表, 实体列名)
+_LATEST_SPECS = {
+    IndicatorData: (IndicatorLatest, "district_id"),
+    IndicatorCenterData: (IndicatorCenterLatest, "center_id"),
+}
+
+
+def _copy_columns(latest_model) -> list[str]:
+    return [c.key for c in latest_model.__table__.columns if c.key not in ("data_id", "update_time")]
+
+
+def _latest_select(data_model, entity_col: str, columns: list[str], key_filter=None):
+    """
+    SELECT 每个 (indicator_id, 实体) 最新统计日期的数据行：先按键取 MAX(stat_date)，再回表取整行
+    """
+    entity = getattr(data_model, entity_col)
+    max_q = select(
+        data_model.indicator_id.label("iid"),
+        entity.label("eid"),
+        func.max(data_model.stat_date).label("max_date"),
+    )
+    if key_filter is not None:
+        max_q = max_q.where(key_filter)
+    m = max_q.group_by(data_model.indicator_id, entity).subquery()
+    return (
+        select(*[getattr(data_model, c) for c in columns], data_model.id)
+        .join(m, and_(
+            data_model.indicator_id == m.c.iid,
+            entity == m.c.eid,
+            data_model.stat_date == m.c.max_date,
+        ))
+    )
+
+
+def _insert_latest(latest_model, columns: list[str], select_stmt):
+    # 同一键同一日期理论上唯一，IGNORE 兜底避免脏数据导致整批失败
+    return (
+        mysql_insert(latest_model)
+        .from_select(columns + ["data_id"], select_stmt)
+        .prefix_with("IGNORE")
+    )
+
+
+async def refresh_latest(session: AsyncSession, data_model, keys: Iterable[tuple]) -> None:
+    """
+    重算给定 (indicator_id, 实体ID) 的最新值行；需在数据变更 flush 之后、commit 之前调用
+    """
+    latest_model, entity_col = _LATEST_SPECS[data_model]
+    keys = sorted(set(keys))
+    if not keys:
+        return
+    columns = _copy_columns(latest_model)
+    entity = getattr(data_model, entity_col)
+    latest_entity = getattr(latest_model, entity_col)
+    for i in range(0, len(keys), _KEY_CHUNK):
+        chunk = keys[i:i + _KEY_CHUNK]
+        await session.execute(
+            delete(latest_model).where(tuple_(latest_model.indicator_id, latest_entity).in_(chunk))
+        )
+        key_filter = tuple_(data_model.indicator_id, entity).in_(chunk)
+        await session.execute(_insert_latest(latest_model, columns, _latest_select(data_model, entity_col, columns, key_filter)))
+
+
+async def rebuild_latest(session: AsyncSession, data_model) -> int:
+    """
+    全量重建最新值表（历史回填、直接改库之后使用），按指标分批写入，返回写入行数
+    """
+    latest_model, entity_col = _LATEST_SPECS[data_model]
+    columns = _copy_columns(latest_model)
+    ind_ids = (await session.execute(select(data_model.indicator_id).distinct())).scalars().all()
+    await session.execute(delete(latest_model))
+    total = 0
+    for iid in sorted(ind_ids):
+        stmt = _latest_select(data_model, entity_col, columns, data_model.indicator_id == iid)
+        result = await session.execute(_insert_latest(latest_model, columns, stmt))
+        total += result.rowcount or 0
+    await session.commit()
+    return total
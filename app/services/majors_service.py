@@ -8,6 +8,7 @@ from typing import Optional, Tuple, List
 
 from models.metrics import Major
 from models.metrics_schemas import MajorOut, MajorBase
+from services.dim_cache import invalidate_dims
 
 
 async def list_majors(
@@ -29,6 +30,7 @@ async def create_major(session: AsyncSession, payload: MajorBase) -> MajorOut:
     obj = Major(major_name=payload.major_name, major_code=payload.major_code)
     session.add(obj)
     await session.commit()
+    await invalidate_dims()
     await session.refresh(obj)
     return MajorOut.model_validate(obj)
 
@@ -40,6 +42,7 @@ async def update_major(session: AsyncSession, major_id: int, payload: MajorBase)
     obj.major_name = payload.major_name
     obj.major_code = payload.major_code
     await session.commit()
+    await invalidate_dims()
     await session.refresh(obj)
     return MajorOut.model_validate(obj)
 
@@ -50,5 +53,6 @@ async def delete_major(session: AsyncSession, major_id: int) -> dict:
         raise HTTPException(404, "Major not found")
     await session.delete(obj)
     await session.commit()
+    await invalidate_dims()
     return {"deleted": 1}
 
@@ -0,0 +1,125 @@
+# =============================
+# app/services/partition_service.py
+# =============================
+# 事实表月分区维护（python manage.py partitions，建议每月由定时任务执行一次）：
+#   - 预建：从兜底分区 p_max 中拆出未来 PARTITION_AHEAD_MONTHS 个月的 pYYYYMM 分区
+#     （p_max 为空时 REORGANIZE 只改元数据，不搬数据）；
+#   - 归档：上界早于保留窗口（PARTITION_RETAIN_MONTHS）的分区交换到结构相同的归档表 {表}_arch_{分区} 后删除；
+#     MySQL 没有 DETACH PARTITION，EXCHANGE + DROP 是等价做法，交换本身只改元数据。
+# 分区布局见 sql/migrations/004；未分区的表跳过。
+import re
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from models.metrics import IndicatorDataV2 as IndicatorData, IndicatorCenterData
+
+PARTITIONED_TABLES = [IndicatorData.__tablename__, IndicatorCenterData.__tablename__]
+MAX_PARTITION = "p_max"
+_MONTH_PARTITION = re.compile(r"^p(\d{4})(\d{2})$")
+
+
+def _add_months(d: date, n: int) -> date:
+    y, m = divmod(d.year * 12 + d.month - 1 + n, 12)
+    return date(y, m + 1, 1)
+
+
+def _partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def _partition_bound(description: Optional[str]) -> Optional[date]:
+    # partition_description 形如 '2025-02-01'（带引号）或 MAXVALUE
+    value = (description or "").strip("'\" ")
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+async def table_partitions(conn: AsyncConnection, table: str) -> List[dict]:
+    """
+    [{name, bound, rows}]，按分区顺序；bound 为 VALUES LESS THAN 的日期（p_max 为 None）。未分区的表返回 []
+    """
+    result = await conn.execute(
+        text(
+            "SELECT partition_name, partition_description, table_rows FROM information_schema.partitions"
+            " WHERE table_schema = DATABASE() AND table_name = :t AND partition_name IS NOT NULL"
+            " ORDER BY partition_ordinal_position"
+        ),
+        {"t": table},
+    )
+    return [{"name": name, "bound": _partition_bound(desc), "rows": rows} for name, desc, rows in result.all()]
+
+
+def plan_partitions(
+    table: str, partitions: List[dict], ahead: int, retain_months: int, archive: bool = True, today: Optional[date] = None
+) -> List[str]:
+    """
+    根据现有分区生成维护语句：预建到 today 所在月之后 ahead 个月；retain_months > 0 时归档 / 删除过期的月分区
+    """
+    if not partitions:
+        return []
+    this_month = _add_months(today or date.today(), 0)
+    names = {p["name"] for p in partitions}
+    stmts: List[str] = []
+
+    # 预建：拆分 p_max，新分区上界接在现有最大上界之后
+    bounds = [p["bound"] for p in partitions if p["bound"] is not None]
+    if MAX_PARTITION in names:
+        month = max(bounds) if bounds else this_month
+        new = []
+        while month <= _add_months(this_month, ahead):
+            new.append(f"PARTITION {_partition_name(month)} VALUES LESS THAN ('{_add_months(month, 1)}')")
+            month = _add_months(month, 1)
+        if new:
+            new.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN (MAXVALUE)")
+            stmts.append(f"ALTER TABLE {table} REORGANIZE PARTITION {MAX_PARTITION} INTO ({', '.join(new)})")
+
+    # 归档：只处理 pYYYYMM 月分区（p_hist、p_max 保持不动）
+    if retain_months > 0:
+        cutoff = _add_months(this_month, 1 - retain_months)
+        expired = [p for p in partitions if _MONTH_PARTITION.match(p["name"]) and p["bound"] and p["bound"] <= cutoff]
+        for p in expired:
+            if archive:
+                arch = f"{table}_arch_{p['name']}"
+                stmts += [
+                    f"CREATE TABLE IF NOT EXISTS {arch} LIKE {table}",
+                    f"ALTER TABLE {arch} REMOVE PARTITIONING",
+                    f"ALTER TABLE {table} EXCHANGE PARTITION {p['name']} WITH TABLE {arch}",
+                ]
+            stmts.append(f"ALTER TABLE {table} DROP PARTITION {p['name']}")
+    return stmts
+
+
+async def maintain_partitions(
+    conn: AsyncConnection,
+    ahead: int,
+    retain_months: int,
+    archive: bool = True,
+    dry_run: bool = False,
+    today: Optional[date] = None,
+) -> List[str]:
+    """
+    对各事实表执行分区维护，返回过程信息（逐行）。dry_run 只列出语句
+    """
+    log: List[str] = []
+    for table in PARTITIONED_TABLES:
+        partitions = await table_partitions(conn, table)
+        if not partitions:
+            log.append(f"[skip] {table}: not partitioned (run: python manage.py migrate)")
+            continue
+        stmts = plan_partitions(table, partitions, ahead, retain_months, archive=archive, today=today)
+        if not stmts:
+            log.append(f"[ok] {table}: {len(partitions)} partitions, nothing to do")
+            continue
+        log.append(f"[{'plan' if dry_run else 'apply'}] {table}")
+        for stmt in stmts:
+            log.append(f"  {stmt}")
+            if not dry_run:
+                await conn.exec_driver_sql(stmt)
+    if not dry_run:
+        await conn.commit()
+    return log
@@ -0,0 +1,132 @@
+# =============================
+# app/services/pivot_service.py
+# =============================
+# 实体×指标透视的数据源（export_v2 / 异步导出任务 与 GET /pivot 共用）：
+#   - pivot_source：筛选后的查询、读取列、实体列与行补全函数（圈层 / 区县名取自维度缓存）；
+#   - query_pivot：按统计日期分组后交给 utils.excel_utils.pivot_matrix 计算，返回紧凑矩阵。
+import functools
+
+from sqlalchemy import asc, desc, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+
+from core.config import settings
+from models.metrics import IndicatorDataV2 as IndicatorData, Indicator, Center, IndicatorCenterData
+from services.dim_cache import get_dims
+from services.indicator_service import metrics_stmt, center_metrics_stmt, latest_stat_date
+from utils.excel_utils import pivot_payload
+from utils.threadpool import run_pandas_job
+
+
+def fill_center_district(dims, r: dict) -> dict:
+    # 支撑中心所属区县名称取自维度缓存（SQL 不再关联 districts）
+    r["district_name"] = dims.district_name(r.pop("district_id"))
+    return r
+
+
+def pivot_source(dims, entity: str, filters: dict):
+    """
+    透视数据源：返回 (筛选后的查询, 数据表, 读取列, 实体列, 行补全函数)；entity 为 district | center
+    """
+    if entity == "district":
+        def _fill_district(r: dict) -> dict:
+            d = dims.district_by_id.get(r["district_id"])
+            if d:
+                r["circle_id"], r["district_name"] = d.circle_id or 0, d.district_name
+            else:
+                r["circle_id"] = 0
+            return r
+
+        columns = (
+            IndicatorData.district_id,
+            IndicatorData.district_name,
+            IndicatorData.indicator_id,
+            Indicator.indicator_name,
+            Indicator.is_positive,
+            IndicatorData.stat_date,
+            IndicatorData.value,
+            IndicatorData.score,
+        )
+        return metrics_stmt(**filters), IndicatorData, columns, IndicatorData.district_id, _fill_district
+
+    columns = (
+        IndicatorCenterData.center_id,
+        IndicatorCenterData.center_name,
+        Center.district_id,
+        IndicatorCenterData.indicator_id,
+        Indicator.indicator_name,
+        Indicator.is_positive,
+        IndicatorCenterData.stat_date,
+        IndicatorCenterData.value,
+        IndicatorCenterData.score,
+    )
+    return (
+        center_metrics_stmt(**filters), IndicatorCenterData, columns, IndicatorCenterData.center_id,
+        functools.partial(fill_center_district, dims),
+    )
+
+
+async def pivot_indicator_columns(session: AsyncSession, base_stmt, data_model, order_col=None, desc_order: bool = True):
+    """
+    透视表的指标列：筛选范围内出现过的全部指标，返回 (有序指标ID, {ID: 名称}, {ID: is_positive})。
+    列顺序为各指标在按 order_col（默认 stat_date）排序的明细中首次出现的顺序，与原 export_v2 一致：
+    降序时按 MAX(order_col) 降序；升序时含 NULL 的指标在前（MySQL 升序 NULL 最小），再按 MIN(order_col) 升序；
+    相同时按指标ID。
+    """
+    order_col = data_model.stat_date if order_col is None else order_col
+    if desc_order:
+        first_seen = (desc(func.max(order_col)),)
+    else:
+        first_seen = (desc(func.max(case((order_col.is_(None), 1), else_=0))), asc(func.min(order_col)))
+    stmt = (
+        base_stmt.with_only_columns(data_model.indicator_id, Indicator.indicator_name, Indicator.is_positive)
+        .group_by(data_model.indicator_id, Indicator.indicator_name, Indicator.is_positive)
+        .order_by(*first_seen, asc(data_model.indicator_id))
+    )
+    rows = (await session.execute(stmt)).all()
+    ordered_ind_ids = [r[0] for r in rows]
+    name_map = {r[0]: str(r[1] or f"指标{r[0]}") for r in rows}
+    pos_map = {r[0]: int(r[2] if r[2] is not None else 1) for r in rows}
+    return ordered_ind_ids, name_map, pos_map
+
+
+async def query_pivot(session: AsyncSession, entity: str, filters: dict) -> dict:
+    """
+    实体×指标透视（JSON）：每个统计日期一份矩阵，与 export_v2 的 Sheet 逐格一致。
+    未指定 start_date / end_date 时只返回筛选范围内最新的统计日期；日期数超过 PIVOT_MAX_DATES 返回 400。
+    """
+    dims = await get_dims(session)
+    base_stmt, data_model, columns, entity_col, row_hook = pivot_source(dims, entity, filters)
+
+    if filters.get("start_date") is None and filters.get("end_date") is None:
+        latest = await latest_stat_date(session, base_stmt, data_model)
+        if latest is None:
+            return {"entity": entity, "indicators": [], "dates": []}
+        base_stmt = base_stmt.where(data_model.stat_date == latest)
+    else:
+        n_dates = (
+            await session.execute(base_stmt.with_only_columns(func.count(func.distinct(data_model.stat_date))))
+        ).scalar() or 0
+        if n_dates > settings.PIVOT_MAX_DATES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Date range covers {n_dates} stat dates, at most {settings.PIVOT_MAX_DATES} allowed; use /export_v2 instead",
+            )
+
+    ordered_ind_ids, name_map, pos_map = await pivot_indicator_columns(session, base_stmt, data_model)
+    stmt = base_stmt.with_only_columns(*columns).order_by(
+        asc(data_model.stat_date), asc(entity_col), asc(data_model.indicator_id)
+    )
+    groups: dict = {}
+    for r in (await session.execute(stmt)).mappings():
+        groups.setdefault(r["stat_date"], []).append(row_hook(dict(r)))
+
+    dates = await run_pandas_job(pivot_payload, list(groups.items()), entity, ordered_ind_ids, pos_map)
+    return {
+        "entity": entity,
+        "indicators": [
+            {"indicator_id": iid, "indicator_name": name_map[iid], "is_positive": pos_map[iid]}
+            for iid in ordered_ind_ids
+        ],
+        "dates": dates,
+    }
@@ -0,0 +1,185 @@
+# =============================
+# app/services/rollup_service.py
+# =============================
+# 周 / 月 / 季预聚合表维护：indicator_rollup / indicator_center_rollup 保存每个 (指标, 实体, 周期) 的
+# value / score 的 avg、last、min、max（sql/migrations/006）。周期起始日直接由 stat_date 推算，
+# 与 dim_date 划分一致（ISO 周从周一开始），但不依赖 dim_date 是否覆盖全部日期。
+# 写入路径在提交前调用 refresh_rollups(...)，只重算受影响日期所在的周期，与数据写入处于同一事务。
+from datetime import date, timedelta
+from typing import Iterable
+
+from sqlalchemy import select, delete, func, and_, tuple_, literal
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.metrics import (
+    IndicatorDataV2 as IndicatorData,
+    IndicatorCenterData,
+    IndicatorRollup,
+    IndicatorCenterRollup,
+    DimDate,
+)
+
+_KEY_CHUNK = 500
+
+ROLLUP_PERIODS = ("week", "month", "quarter")
+
+# 周期 -> dim_date 分组列
+PERIOD_KEYS = {
+    "week": (DimDate.iso_year, DimDate.iso_week),
+    "month": (DimDate.year, DimDate.month),
+    "quarter": (DimDate.year, DimDate.quarter),
+}
+
+# 数据表 -> (预聚合表, 实体列名)
+_ROLLUP_SPECS = {
+    IndicatorData: (IndicatorRollup, "district_id"),
+    IndicatorCenterData: (IndicatorCenterRollup, "center_id"),
+}
+
+
+def _add_months(d: date, n: int) -> date:
+    y, m = divmod(d.year * 12 + d.month - 1 + n, 12)
+    return date(y, m + 1, 1)
+
+
+def period_start(d: date, period: str) -> date:
+    """
+    d 所在周期的起始日：周一（ISO 周）/ 月初 / 季初
+    """
+    if period == "week":
+        return d - timedelta(days=d.weekday())
+    if period == "month":
+        return d.replace(day=1)
+    return d.replace(month=(d.month - 1) // 3 * 3 + 1, day=1)
+
+
+def period_end(start: date, period: str) -> date:
+    if period == "week":
+        return start + timedelta(days=6)
+    return _add_months(start, 1 if period == "month" else 3) - timedelta(days=1)
+
+
+def _period_start_sql(d, period: str):
+    # period_start 的 SQL 版本（MySQL）：周一 / 月初 / 季初
+    if period == "week":
+        return func.subdate(d, func.weekday(d))
+    if period == "month":
+        return func.subdate(d, func.dayofmonth(d) - 1)
+    return func.str_to_date(func.concat(func.year(d), "-", func.quarter(d) * 3 - 2, "-01"), "%Y-%m-%d")
+
+
+def _rollup_select(data_model, entity_col: str, period: str, key_filter):
+    """
+    SELECT 每个 (indicator_id, 实体, 周期) 的聚合值：先按周期起始日分组，再回表取周期内最后一行的 value / score。
+    列顺序与 _rollup_columns 一致
+    """
+    entity = getattr(data_model, entity_col)
+    start = _period_start_sql(data_model.stat_date, period)
+    b = (
+        select(
+            data_model.indicator_id.label("iid"),
+            entity.label("eid"),
+            start.label("period_start"),
+            func.max(data_model.stat_date).label("last_date"),
+            func.count().label("days"),
+            func.avg(data_model.value).label("value_avg"),
+            func.min(data_model.value).label("value_min"),
+            func.max(data_model.value).label("value_max"),
+            func.avg(data_model.score).label("score_avg"),
+            func.min(data_model.score).label("score_min"),
+            func.max(data_model.score).label("score_max"),
+        )
+        .where(key_filter)
+        .group_by(data_model.indicator_id, entity, start)
+        .subquery()
+    )
+    return (
+        select(
+            b.c.iid, b.c.eid, literal(period), b.c.period_start, b.c.last_date, b.c.days,
+            b.c.value_avg, data_model.value, b.c.value_min, b.c.value_max,
+            b.c.score_avg, data_model.score, b.c.score_min, b.c.score_max,
+        )
+        .join(data_model, and_(
+            data_model.indicator_id == b.c.iid,
+            entity == b.c.eid,
+            data_model.stat_date == b.c.last_date,
+        ))
+    )
+
+
+def _rollup_columns(entity_col: str) -> list[str]:
+    return [
+        "indicator_id", entity_col, "period", "period_start", "last_date", "days",
+        "value_avg", "value_last", "value_min", "value_max",
+        "score_avg", "score_last", "score_min", "score_max",
+    ]
+
+
+async def _insert_rollups(session: AsyncSession, data_model, period: str, key_filter) -> int:
+    # INSERT IGNORE ... SELECT 在库内完成；同一键同一日期有重复行时 IGNORE 兜底，避免整批失败
+    rollup_model, entity_col = _ROLLUP_SPECS[data_model]
+    stmt = (
+        mysql_insert(rollup_model)
+        .from_select(_rollup_columns(entity_col), _rollup_select(data_model, entity_col, period, key_filter))
+        .prefix_with("IGNORE")
+    )
+    result = await session.execute(stmt)
+    return result.rowcount or 0
+
+
+async def refresh_rollups(session: AsyncSession, data_model, keys: Iterable[tuple]) -> None:
+    """
+    重算给定 (indicator_id, 实体ID, stat_date) 所在的周 / 月 / 季；需在数据变更 flush 之后、commit 之前调用
+    """
+    rollup_model, entity_col = _ROLLUP_SPECS[data_model]
+    targets: dict[tuple, set] = {}
+    for iid, eid, stat_date in set(keys):
+        for period in ROLLUP_PERIODS:
+            targets.setdefault((period, period_start(stat_date, period)), set()).add((iid, eid))
+    entity = getattr(data_model, entity_col)
+    rollup_entity = getattr(rollup_model, entity_col)
+    for (period, start), pairs in sorted(targets.items()):
+        pairs = sorted(pairs)
+        for i in range(0, len(pairs), _KEY_CHUNK):
+            chunk = pairs[i:i + _KEY_CHUNK]
+            await session.execute(
+                delete(rollup_model).where(
+                    rollup_model.period == period,
+                    rollup_model.period_start == start,
+                    tuple_(rollup_model.indicator_id, rollup_entity).in_(chunk),
+                )
+            )
+            key_filter = and_(
+                tuple_(data_model.indicator_id, entity).in_(chunk),
+                data_model.stat_date.between(start, period_end(start, period)),
+            )
+            await _insert_rollups(session, data_model, period, key_filter)
+
+
+async def affected_rollup_keys(session: AsyncSession, data_model, filters: list) -> set[tuple]:
+    """
+    删除前取回将受影响的 (indicator_id, 实体ID, stat_date)，删除后据此重算最新值与预聚合
+    """
+    _, entity_col = _ROLLUP_SPECS[data_model]
+    stmt = (
+        select(data_model.indicator_id, getattr(data_model, entity_col), data_model.stat_date)
+        .where(and_(*filters))
+        .distinct()
+    )
+    return {tuple(r) for r in (await session.execute(stmt)).all()}
+
+
+async def rebuild_rollups(session: AsyncSession, data_model) -> int:
+    """
+    全量重建预聚合表（历史回填、直接改库之后使用），按指标分批写入，返回写入行数
+    """
+    rollup_model, _ = _ROLLUP_SPECS[data_model]
+    ind_ids = (await session.execute(select(data_model.indicator_id).distinct())).scalars().all()
+    await session.execute(delete(rollup_model))
+    total = 0
+    for iid in sorted(ind_ids):
+        for period in ROLLUP_PERIODS:
+            total += await _insert_rollups(session, data_model, period, data_model.indicator_id == iid)
+    await session.commit()
+    return total
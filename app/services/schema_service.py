@@ -0,0 +1,234 @@
+# =============================
+# app/services/schema_service.py
+# =============================
+# 库表结构运维（python manage.py migrate / check-indexes，以及可选的启动检查）：
+#   - 版本化迁移：按文件名序号执行 sql/migrations/NNN_name.sql，已执行的版本记录在 schema_migrations；
+#     表 / 列 / 索引名已存在的错误视为该条已生效并跳过，便于在已手工建过部分索引的库上执行；
+#   - 索引检查：读取 information_schema.statistics，核对事实表热点过滤所需的索引；
+#   - 执行计划：对主要服务查询执行 EXPLAIN，报告命中的索引、访问类型与预估行数。
+import hashlib
+import re
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import bindparam, desc, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from core.config import settings
+from models.metrics import IndicatorDataV2 as IndicatorData, IndicatorCenterData
+from services.indicator_service import metrics_stmt, center_metrics_stmt
+
+_MIGRATION_FILE = re.compile(r"^(\d+)_[\w-]+\.sql$")
+# 重复执行时可忽略的 MySQL 错误：1050 表已存在、1060 列已存在、1061 索引名已存在、1091 要删除的列 / 索引不存在
+_IGNORABLE_ERRORS = {1050, 1060, 1061, 1091}
+
+# 事实表热点过滤所需的索引：(表, 建议索引名, 列, 是否唯一)，对应 sql/migrations 002 / 003。
+# 已有索引只要以这些列为最左前缀即视为满足；唯一键另需存在列完全相同的唯一索引。
+REQUIRED_INDEXES = [
+    ("indicator_data_v2", "uk_iid_did_date", ("indicator_id", "district_id", "stat_date"), True),
+    ("indicator_data_v2", "ix_did_date", ("district_id", "stat_date"), False),
+    ("indicator_data_v2", "ix_date", ("stat_date",), False),
+    ("indicator_center_data", "uk_iid_cid_date", ("indicator_id", "center_id", "stat_date"), True),
+    ("indicator_center_data", "ix_cid_date", ("center_id", "stat_date"), False),
+    ("indicator_center_data", "ix_date", ("stat_date",), False),
+]
+
+
+# ---------- 版本化迁移 ----------
+
+def migrations_dir() -> Path:
+    # 未配置时使用仓库根目录（镜像中为 /）下的 sql/migrations
+    if settings.MIGRATIONS_DIR:
+        return Path(settings.MIGRATIONS_DIR)
+    return Path(__file__).resolve().parents[2] / "sql" / "migrations"
+
+
+def migration_files() -> List[tuple[str, Path]]:
+    """
+    [(版本号, 文件)]，按版本号升序
+    """
+    out = []
+    for path in migrations_dir().glob("*.sql"):
+        m = _MIGRATION_FILE.match(path.name)
+        if m:
+            out.append((m.group(1), path))
+    return sorted(out, key=lambda x: int(x[0]))
+
+
+def _statements(sql: str) -> List[str]:
+    # 去掉整行注释后按分号切分（迁移脚本不含存储过程 / 触发器）
+    body = "\n".join(line for line in sql.splitlines() if not line.lstrip().startswith("--"))
+    return [s.strip() for s in body.split(";") if s.strip()]
+
+
+def _error_code(e: DBAPIError) -> Optional[int]:
+    args = getattr(e.orig, "args", ())
+    return args[0] if args and isinstance(args[0], int) else None
+
+
+async def _ensure_migration_table(conn: AsyncConnection) -> None:
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version VARCHAR(32) PRIMARY KEY COMMENT '迁移版本号',"
+        " name VARCHAR(128) NOT NULL COMMENT '迁移文件名',"
+        " checksum CHAR(40) NOT NULL COMMENT '文件 SHA-1',"
+        " applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '执行时间'"
+        ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+    ))
+
+
+async def migrate(conn: AsyncConnection, dry_run: bool = False) -> List[str]:
+    """
+    执行尚未执行的迁移，返回过程信息（逐行）。dry_run 只列出待执行的文件与语句。
+    已执行文件的内容被改动时只提示，不会重新执行。
+    """
+    log: List[str] = []
+    await _ensure_migration_table(conn)
+    applied = dict((await conn.execute(text("SELECT version, checksum FROM schema_migrations"))).all())
+    await conn.commit()
+
+    for version, path in migration_files():
+        sql = path.read_text(encoding="utf-8")
+        checksum = hashlib.sha1(sql.encode("utf-8")).hexdigest()
+        if version in applied:
+            if applied[version] != checksum:
+                log.append(f"[warn] {path.name}: changed after it was applied; not re-run")
+            continue
+        log.append(f"[apply] {path.name}")
+        for stmt in _statements(sql):
+            if dry_run:
+                log.append(f"  {stmt}")
+                continue
+            try:
+                await conn.exec_driver_sql(stmt)
+            except DBAPIError as e:
+                if _error_code(e) not in _IGNORABLE_ERRORS:
+                    raise
+                log.append(f"  [skip] {e.orig.args[1] if len(e.orig.args) > 1 else e.orig}")
+        if not dry_run:
+            await conn.execute(
+                text("INSERT INTO schema_migrations (version, name, checksum) VALUES (:v, :n, :c)"),
+                {"v": version, "n": path.name, "c": checksum},
+            )
+            await conn.commit()
+    if not any(line.startswith("[apply]") for line in log):
+        log.append("[migrate] up to date")
+    return log
+
+
+# ---------- 索引检查 ----------
+
+async def table_indexes(session: AsyncSession, tables) -> dict:
+    """
+    {表: {索引名: (是否唯一, (列, ...))}}，来自 information_schema.statistics
+    """
+    stmt = text(
+        "SELECT table_name, index_name, non_unique, column_name FROM information_schema.statistics"
+        " WHERE table_schema = DATABASE() AND table_name IN :tables"
+        " ORDER BY table_name, index_name, seq_in_index"
+    ).bindparams(bindparam("tables", expanding=True))
+    out: dict = {t: {} for t in tables}
+    for table, index, non_unique, column in (await session.execute(stmt, {"tables": list(tables)})).all():
+        unique, cols = out[table].get(index, (int(non_unique) == 0, ()))
+        out[table][index] = (unique, cols + (column,))
+    return out
+
+
+def _index_satisfied(indexes: dict, cols: tuple, unique: bool) -> bool:
+    prefix_ok = any(ix_cols[:len(cols)] == cols for _, ix_cols in indexes.values())
+    if not unique:
+        return prefix_ok
+    return prefix_ok and any(u and set(ix_cols) == set(cols) for u, ix_cols in indexes.values())
+
+
+async def missing_indexes(session: AsyncSession) -> List[dict]:
+    """
+    缺失的热点索引：[{table, index, columns, unique, table_missing}]
+    """
+    tables = list(dict.fromkeys(t for t, *_ in REQUIRED_INDEXES))
+    existing = await table_indexes(session, tables)
+    missing = []
+    for table, name, cols, unique in REQUIRED_INDEXES:
+        indexes = existing[table]
+        if not indexes or not _index_satisfied(indexes, cols, unique):
+            missing.append({"table": table, "index": name, "columns": cols, "unique": unique, "table_missing": not indexes})
+    return missing
+
+
+def format_missing(missing: List[dict]) -> List[str]:
+    lines = []
+    for m in missing:
+        if m["table_missing"]:
+            lines.append(f"table {m['table']} not found (run: python manage.py migrate)")
+            continue
+        kind = "UNIQUE KEY" if m["unique"] else "KEY"
+        lines.append(f"{m['table']}: missing {kind} {m['index']} ({', '.join(m['columns'])})")
+    return list(dict.fromkeys(lines))
+
+
+# ---------- 执行计划 ----------
+
+async def _sample_keys(session: AsyncSession, data_model, entity_col):
+    # 用最新一行的 (指标, 实体, 日期) 作为 EXPLAIN 的参数；空表时用占位值
+    row = (
+        await session.execute(
+            select(data_model.indicator_id, entity_col, data_model.stat_date).order_by(desc(data_model.stat_date)).limit(1)
+        )
+    ).first()
+    if row is None:
+        return 1, 1, date.today()
+    return tuple(row)
+
+
+async def hot_queries(session: AsyncSession) -> List[tuple[str, object]]:
+    """
+    主要服务查询（与 indicator_service / upload_service 的过滤条件一致）：[(名称, 语句)]
+    """
+    iid, did, day = await _sample_keys(session, IndicatorData, IndicatorData.district_id)
+    c_iid, cid, c_day = await _sample_keys(session, IndicatorCenterData, IndicatorCenterData.center_id)
+    start, c_start = day - timedelta(days=30), c_day - timedelta(days=30)
+    order = desc(IndicatorData.stat_date)
+    c_order = desc(IndicatorCenterData.stat_date)
+    return [
+        ("query indicator+district+range", metrics_stmt(indicator_id=iid, district_id=did, start_date=start, end_date=day).order_by(order).limit(50)),
+        ("query district+range", metrics_stmt(district_id=did, start_date=start, end_date=day).order_by(order).limit(50)),
+        ("query range", metrics_stmt(start_date=start, end_date=day).order_by(order).limit(50)),
+        ("series indicator+range", metrics_stmt(indicator_id=iid, start_date=start, end_date=day).order_by(IndicatorData.stat_date).limit(180)),
+        (
+            "upsert lookup",
+            select(IndicatorData.id).where(
+                IndicatorData.indicator_id.in_([iid]), IndicatorData.district_id.in_([did]), IndicatorData.stat_date.between(start, day)
+            ),
+        ),
+        ("center query center+range", center_metrics_stmt(center_id=cid, start_date=c_start, end_date=c_day).order_by(c_order).limit(50)),
+        ("center query indicator+range", center_metrics_stmt(indicator_id=c_iid, start_date=c_start, end_date=c_day).order_by(c_order).limit(50)),
+    ]
+
+
+async def explain(session: AsyncSession, stmt) -> List[dict]:
+    """
+    对语句执行 EXPLAIN，返回每个表的计划行（table / type / key / rows / Extra 等）
+    """
+    conn = await session.connection()
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    params = tuple(compiled.params[k] for k in compiled.positiontup or ())
+    result = await conn.exec_driver_sql("EXPLAIN " + str(compiled), params)
+    return [dict(r) for r in result.mappings().all()]
+
+
+async def explain_hot_queries(session: AsyncSession) -> List[str]:
+    """
+    主要服务查询的执行计划摘要（逐行）；事实表全表扫描（type=ALL）标记为 [warn]
+    """
+    fact_tables = {IndicatorData.__tablename__, IndicatorCenterData.__tablename__}
+    lines = []
+    for name, stmt in await hot_queries(session):
+        lines.append(f"[explain] {name}")
+        for r in await explain(session, stmt):
+            flag = "[warn] " if r.get("table") in fact_tables and r.get("type") == "ALL" else ""
+            lines.append(
+                f"  {flag}{r.get('table')}: type={r.get('type')} key={r.get('key')} rows={r.get('rows')} extra={r.get('Extra') or ''}"
+            )
+    return lines
@@ -0,0 +1,252 @@
+# =============================
+# app/services/upload_service.py
+# =============================
+from sqlalchemy import select, func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from typing import Callable, Iterable, List, Optional
+
+from core.config import settings
+from core.data_version import bump_data_version
+from models.metrics import IndicatorDataV2 as IndicatorData, Indicator, IndicatorCenterData
+from services.dim_cache import get_dims, invalidate_dims
+from services.latest_service import refresh_latest
+from services.rollup_service import refresh_rollups
+from utils.threadpool import run_pandas_job
+from utils.upload_validation import prepare_indicator_upload, prepare_center_upload
+
+
+def _chunks(rows: list, size: int) -> Iterable[list]:
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+async def _fetch_existing_ids(session: AsyncSession, model, entity_col: str, keys: Iterable[tuple]) -> dict[tuple, int]:
+    """
+    一次查询取回文件涉及的全部已存在记录：(indicator_id, 实体ID, stat_date) -> id
+    """
+    keys = set(keys)
+    if not keys:
+        return {}
+    entity = getattr(model, entity_col)
+    ind_ids = {k[0] for k in keys}
+    entity_ids = {k[1] for k in keys}
+    dates = [k[2] for k in keys]
+    stmt = select(model.id, model.indicator_id, entity, model.stat_date).where(
+        model.indicator_id.in_(ind_ids),
+        entity.in_(entity_ids),
+        model.stat_date.between(min(dates), max(dates)),
+    )
+    existing: dict[tuple, int] = {}
+    for rid, iid, eid, sd in (await session.execute(stmt)).all():
+        if (iid, eid, sd) in keys:
+            existing.setdefault((iid, eid, sd), rid)
+    return existing
+
+
+async def _bulk_upsert(
+    session: AsyncSession,
+    model,
+    rows: List[dict],
+    overwrite: Iterable[str] = (),
+    overwrite_if_not_null: Iterable[str] = (),
+    fill_if_null: Iterable[str] = (),
+):
+    """
+    分块执行多行 INSERT ... ON DUPLICATE KEY UPDATE。
+    已存在的行带主键 id 写入，命中主键冲突后按以下规则更新：
+      overwrite：直接覆盖
+      overwrite_if_not_null：新值非空才覆盖
+      fill_if_null：原值为空才补齐
+    """
+    table = model.__table__
+    for chunk in _chunks(rows, settings.UPLOAD_CHUNK_SIZE):
+        stmt = mysql_insert(table).values(chunk)
+        updates = {c: stmt.inserted[c] for c in overwrite}
+        updates.update({c: func.coalesce(stmt.inserted[c], table.c[c]) for c in overwrite_if_not_null})
+        updates.update({c: func.coalesce(table.c[c], stmt.inserted[c]) for c in fill_if_null})
+        await session.execute(stmt.on_duplicate_key_update(**updates))
+
+
+# 校验错误：(records 下标, 原因)；同步接口格式化为 "Row N: 原因"，异步任务据此生成错误清单
+RowErrors = List[tuple[int, str]]
+
+
+def format_row_errors(errors: RowErrors) -> list[str]:
+    return [f"Row {index+1}: {reason}" for index, reason in errors]
+
+
+def dim_tables(dims) -> dict:
+    """
+    整表校验所需的维度表（纯元组，可 pickle 传给进程池）
+    """
+    return {
+        "indicators": [(i.indicator_id, i.indicator_name, i.type_id, i.major_id, i.is_positive) for i in dims.indicators],
+        "districts": [(d.district_id, d.district_name, d.simple_name, d.circle_id) for d in dims.districts],
+        "centers": [(c.center_id, c.center_name) for c in dims.centers],
+        "types": [(t.type_id, t.type_name) for t in dims.evaluation_types],
+    }
+
+
+# 数据表 -> (实体列, 新值非空才覆盖的列)
+_UPSERT_SPECS = {
+    IndicatorData: ("district_id", ("exemption", "zero_tolerance", "score")),
+    IndicatorCenterData: ("center_id", ("score",)),
+}
+
+
+async def _write_merged(session: AsyncSession, data_model, merged: dict[tuple, dict]) -> None:
+    entity_col, overwrite_if_not_null = _UPSERT_SPECS[data_model]
+    existing = await _fetch_existing_ids(session, data_model, entity_col, merged.keys())
+    rows = [{"id": existing.get(key), **row} for key, row in merged.items()]
+    await _bulk_upsert(
+        session,
+        data_model,
+        rows,
+        overwrite=("value", "benchmark", "challenge"),
+        overwrite_if_not_null=overwrite_if_not_null,
+        fill_if_null=("type_id", "major_id"),
+    )
+    await refresh_latest(session, data_model, {key[:2] for key in merged})
+    await refresh_rollups(session, data_model, merged.keys())
+
+
+async def commit_merged_in_chunks(
+    session: AsyncSession,
+    data_model,
+    merged: dict[tuple, dict],
+    chunk_size: int,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    分块 upsert 并逐块提交（异步导入任务使用）：已提交的块不会因后续失败回滚，返回已提交行数
+    """
+    committed = 0
+    for chunk in _chunks(list(merged.items()), chunk_size):
+        await _write_merged(session, data_model, dict(chunk))
+        await session.commit()
+        await bump_data_version()
+        committed += len(chunk)
+        if progress:
+            progress(len(chunk))
+    return committed
+
+
+async def _import_upload(session: AsyncSession, data_model, prepare, contents: bytes) -> int:
+    dims = await get_dims(session)
+    merged, errors, _error_rows, row_count = await run_pandas_job(prepare, contents, dim_tables(dims))
+    if errors:
+        raise HTTPException(status_code=400, detail={"message": "Data validation failed", "errors": format_row_errors(errors)[:10]})
+    await _write_merged(session, data_model, merged)
+    await session.commit()
+    await bump_data_version()
+    return row_count
+
+
+async def import_indicator_upload(session: AsyncSession, contents: bytes) -> int:
+    """
+    区县指标数据批量导入：解析与整表校验在 pandas 执行器中完成，全部通过后分块 upsert 并提交，返回文件行数
+    """
+    return await _import_upload(session, IndicatorData, prepare_indicator_upload, contents)
+
+
+async def import_center_upload(session: AsyncSession, contents: bytes) -> int:
+    """
+    支撑中心指标数据批量导入，规则同 import_indicator_upload
+    """
+    return await _import_upload(session, IndicatorCenterData, prepare_center_upload, contents)
+
+
+async def import_indicator_manage_records(session: AsyncSession, records: List[dict]) -> tuple[int, int]:
+    """
+    指标定义批量导入：按 indicator_name + major_id + type_id upsert，返回 (created, updated)
+    """
+    dims = await get_dims(session)
+    major_name_map = {name: m.major_id for name, m in dims.major_by_name.items()}
+    type_name_map = {name: t.type_id for name, t in dims.type_by_name.items()}
+
+    errors = []
+    merged: dict[tuple, dict] = {}
+    for idx, row in enumerate(records):
+        name = str(row.get("indicator_name") or "").strip()
+        if not name:
+            errors.append(f"Row {idx+1}: indicator_name is required")
+            continue
+        unit = str(row.get("unit") or "").strip() or None
+        is_positive = row.get("is_positive")
+        status = row.get("status")
+        version = row.get("version") if row.get("version") is not None else 1
+        desc = str(row.get("description") or "").strip() or None
+
+        # resolve major_id/type_id from name or explicit id
+        maj_id = None
+        typ_id = None
+        if row.get("major_id") is not None:
+            try:
+                maj_id = int(row.get("major_id"))
+            except Exception:
+                errors.append(f"Row {idx+1}: invalid major_id")
+                continue
+        elif row.get("major_name") is not None:
+            maj_id = major_name_map.get(str(row.get("major_name")).strip())
+        if row.get("type_id") is not None:
+            try:
+                typ_id = int(row.get("type_id"))
+            except Exception:
+                errors.append(f"Row {idx+1}: invalid type_id")
+                continue
+        elif row.get("type_name") is not None:
+            typ_id = type_name_map.get(str(row.get("type_name")).strip())
+
+        if maj_id is None:
+            errors.append(f"Row {idx+1}: major not resolved")
+            continue
+        if typ_id is None:
+            errors.append(f"Row {idx+1}: type not resolved")
+            continue
+        if is_positive is None:
+            errors.append(f"Row {idx+1}: is_positive required")
+            continue
+        if status is None:
+            status = 1
+
+        merged[(name, maj_id, typ_id)] = {
+            "indicator_name": name,
+            "unit": unit,
+            "major_id": maj_id,
+            "type_id": typ_id,
+            "is_positive": int(is_positive),
+            "status": int(status),
+            "version": int(version),
+            "description": desc,
+        }
+
+    if errors:
+        raise HTTPException(status_code=400, detail={"message": "Validation failed", "errors": errors[:10]})
+
+    # upsert by indicator_name + major_id + type_id（一次查询取回已有指标）
+    existing: dict[tuple, int] = {}
+    names = {k[0] for k in merged}
+    if names:
+        stmt = select(Indicator.indicator_id, Indicator.indicator_name, Indicator.major_id, Indicator.type_id).where(
+            Indicator.indicator_name.in_(names)
+        )
+        for iid, name, maj_id, typ_id in (await session.execute(stmt)).all():
+            existing.setdefault((name, maj_id, typ_id), iid)
+
+    # 与逐行处理一致：文件内重复出现的新指标，首次计为新增，其余计为更新
+    created = sum(1 for key in merged if key not in existing)
+    updated = len(records) - created
+
+    rows = [{"indicator_id": existing.get(key), **row} for key, row in merged.items()]
+    await _bulk_upsert(
+        session,
+        Indicator,
+        rows,
+        overwrite=("unit", "is_positive", "status", "version", "description"),
+    )
+    await session.commit()
+    await bump_data_version()
+    await invalidate_dims()
+    return created, updated
@@ -106,7 +106,7 @@ from typing import Optional
 
 from models.database import User
 from models.user_schemas import UserCreate, UserUpdate, UserOut
-from core.security import get_password_hash, verify_password, create_access_token
+from core.security import get_password_hash, verify_password, create_access_token, invalidate_principal
 
 
 async def get_user_by_id(user_id: int, session: AsyncSession) -> UserOut | None:
@@ -156,6 +156,12 @@ async def update_user(username: str, user_in: UserUpdate, session: AsyncSession)
 
     if user_in.username is not None:
         db_user.username = user_in.username
+    # 只有状态、角色、密码变化才需要让各 worker 的鉴权缓存失效，资料字段不缓存
+    auth_changed = (
+        user_in.password is not None
+        or (user_in.role_id is not None and user_in.role_id != db_user.role_id)
+        or (user_in.status is not None and user_in.status != db_user.status)
+    )
     if user_in.password is not None:
         db_user.password = get_password_hash(user_in.password)
     if user_in.phone is not None:
@@ -172,6 +178,8 @@ async def update_user(username: str, user_in: UserUpdate, session: AsyncSession)
         await session.rollback()
         raise HTTPException(status_code=400, detail="Username already exists")
 
+    if auth_changed:
+        await invalidate_principal(db_user.id)
     return UserOut.model_validate(db_user)
 
 
@@ -186,6 +194,12 @@ async def update_user_by_id(user_id: int, user_in: UserUpdate, session: AsyncSes
     if user_in.username is not None and user_in.username != db_user.username:
         raise HTTPException(status_code=400, detail="Changing username is not allowed via this endpoint")
 
+    # 只有状态、角色、密码变化才需要让各 worker 的鉴权缓存失效，资料字段不缓存
+    auth_changed = (
+        user_in.password is not None
+        or (user_in.role_id is not None and user_in.role_id != db_user.role_id)
+        or (user_in.status is not None and user_in.status != db_user.status)
+    )
     if user_in.password is not None:
         db_user.password = get_password_hash(user_in.password)
     if user_in.phone is not None:
@@ -202,6 +216,8 @@ async def update_user_by_id(user_id: int, user_in: UserUpdate, session: AsyncSes
         await session.rollback()
         raise HTTPException(status_code=400, detail="Update failed due to constraint error")
 
+    if auth_changed:
+        await invalidate_principal(user_id)
     return UserOut.model_validate(db_user)
 
 
@@ -214,6 +230,7 @@ async def delete_user(username: str, session: AsyncSession) -> None:
 
     await session.delete(db_user)
     await session.commit()
+    await invalidate_principal(db_user.id)
 
 
 # ✅ 新增：按 id 删除（推荐）
@@ -224,6 +241,7 @@ async def delete_user_by_id(user_id: int, session: AsyncSession) -> None:
         raise HTTPException(status_code=404, detail="User not found")
     await session.delete(db_user)
     await session.commit()
+    await invalidate_principal(user_id)
 
 
 # async def authenticate_user(username: str, password: str, session: AsyncSession) -> str:
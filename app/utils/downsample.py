@@ -0,0 +1,35 @@
+# =============================
+# app/utils/downsample.py
+# =============================
+# 折线图降采样：LTTB（Largest-Triangle-Three-Buckets）。
+# 保留首尾点，其余点均分为 n_out-2 个桶，每个桶选出与「上一个选中点、下一个桶均值点」构成三角形面积最大的点，
+# 结果都是原始数据点，能保住峰谷形态。
+import numpy as np
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    返回被保留点的下标（升序）；x 须升序，点数不超过 n_out 或 n_out < 3 时原样返回全部下标
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    every = (n - 2) / (n_out - 2)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        # 下一个桶的均值点（最后一个桶用末点）
+        nlo, nhi = hi, min(int((i + 2) * every) + 1, n)
+        if nlo >= nhi:
+            nlo, nhi = n - 1, n
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
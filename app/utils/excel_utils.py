@@ -1,15 +1,42 @@
+import importlib.util
 import io
-from collections import defaultdict
 
-import pandas as pd
-
-
-def _na_to_none(v):
-    return None if pd.isna(v) else v
+from typing import Optional
 
+import numpy as np
+import pandas as pd
 
-def _normalize_records(records: list[dict]) -> list[dict]:
-    return [{k: _na_to_none(v) for k, v in r.items()} for r in records]
+# 安装了 python-calamine（Rust 实现）时用它读 Excel，比 openpyxl 快数倍，且同时支持 .xls / .xlsx
+EXCEL_READ_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+# 上传文件中按文本读取的列（其余列由读取引擎推断：纯数值列直接得到 float64）
+_TEXT_COLUMNS = ("indicator_name", "district_name", "center_name", "type_name")
+
+
+def frame_records(df: pd.DataFrame) -> list[dict]:
+    # 整表一次性把 NaN / NaT 换成 None（先转 object，避免 None 在数值列中又被还原成 NaN）
+    df = df.astype(object)
+    return df.where(df.notna(), None).to_dict(orient="records")
+
+
+def _read_upload_frame(contents: bytes, upload_columns: dict[str, str], required_cols: list[str]) -> pd.DataFrame:
+    """
+    只读取已映射的列（表头去空格后匹配），名称类列按文本读取，列名转换为字段名并校验必填列
+    """
+    # dtype 需按原始表头指定：先只读表头，去空格后再匹配名称类列
+    header = pd.read_excel(io.BytesIO(contents), engine=EXCEL_READ_ENGINE, nrows=0).columns
+    text_headers = [c for c in header if upload_columns.get(str(c).strip()) in _TEXT_COLUMNS]
+    df = pd.read_excel(
+        io.BytesIO(contents),
+        engine=EXCEL_READ_ENGINE,
+        usecols=lambda c: str(c).strip() in upload_columns,
+        dtype={c: str for c in text_headers},
+    )
+    df.rename(columns={c: upload_columns[str(c).strip()] for c in df.columns}, inplace=True)
+    for col in required_cols:
+        if col not in df.columns:
+            raise ValueError(f"Missing required column: {col}")
+    return df
 
 
 def build_template_xlsx(columns: list[str], desc_row: dict, sample_row: dict, sheet_name: str = "模板") -> bytes:
@@ -20,58 +47,58 @@ def build_template_xlsx(columns: list[str], desc_row: dict, sample_row: dict, sh
     return buf.getvalue()
 
 
-def parse_indicator_upload_records(contents: bytes) -> tuple[list[dict], int]:
-    df = pd.read_excel(io.BytesIO(contents))
-    rename_map = {
-        "指标名称": "indicator_name",
-        "区县": "district_name",
-        "统计日期": "stat_date",
-        "完成值": "value",
-        "基准值": "benchmark",
-        "挑战值": "challenge",
-        "豁免值": "exemption",
-        "零容忍值": "zero_tolerance",
-        "得分": "score",
-        "类型ID": "type_id",
-        "类型名称": "type_name",
-    }
-    df.rename(columns={c: rename_map.get(str(c).strip(), c) for c in df.columns}, inplace=True)
-    required_cols = ["indicator_name", "district_name", "stat_date", "value"]
-    for col in required_cols:
-        if col not in df.columns:
-            raise ValueError(f"Missing required column: {col}")
+# 上传文件表头 -> 字段名
+INDICATOR_UPLOAD_COLUMNS = {
+    "指标名称": "indicator_name",
+    "区县": "district_name",
+    "统计日期": "stat_date",
+    "完成值": "value",
+    "基准值": "benchmark",
+    "挑战值": "challenge",
+    "豁免值": "exemption",
+    "零容忍值": "zero_tolerance",
+    "得分": "score",
+    "类型ID": "type_id",
+    "类型名称": "type_name",
+}
+
+CENTER_UPLOAD_COLUMNS = {
+    "指标名称": "indicator_name",
+    "支撑中心": "center_name",
+    "统计日期": "stat_date",
+    "完成值": "value",
+    "基准值": "benchmark",
+    "挑战值": "challenge",
+    "得分": "score",
+    "类型ID": "type_id",
+    "类型名称": "type_name",
+}
+
+
+def read_indicator_upload_frame(contents: bytes) -> pd.DataFrame:
+    df = _read_upload_frame(contents, INDICATOR_UPLOAD_COLUMNS, ["indicator_name", "district_name", "stat_date", "value"])
     df["stat_date"] = pd.to_datetime(df["stat_date"], errors="coerce").dt.date
-    df = df.where(pd.notna(df), None)
-    records = _normalize_records(df.to_dict(orient="records"))
-    return records, len(df)
+    return df
 
 
-def parse_center_upload_records(contents: bytes) -> tuple[list[dict], int]:
-    df = pd.read_excel(io.BytesIO(contents))
-    rename_map = {
-        "指标名称": "indicator_name",
-        "支撑中心": "center_name",
-        "统计日期": "stat_date",
-        "完成值": "value",
-        "基准值": "benchmark",
-        "挑战值": "challenge",
-        "得分": "score",
-        "类型ID": "type_id",
-        "类型名称": "type_name",
-    }
-    df.rename(columns={c: rename_map.get(str(c).strip(), c) for c in df.columns}, inplace=True)
-    required_cols = ["indicator_name", "center_name", "stat_date", "value"]
-    for col in required_cols:
-        if col not in df.columns:
-            raise ValueError(f"Missing required column: {col}")
+def read_center_upload_frame(contents: bytes) -> pd.DataFrame:
+    df = _read_upload_frame(contents, CENTER_UPLOAD_COLUMNS, ["indicator_name", "center_name", "stat_date", "value"])
     df["stat_date"] = pd.to_datetime(df["stat_date"], errors="coerce").dt.date
-    df = df.where(pd.notna(df), None)
-    records = _normalize_records(df.to_dict(orient="records"))
-    return records, len(df)
+    return df
+
+
+def parse_indicator_upload_records(contents: bytes) -> tuple[list[dict], int]:
+    df = read_indicator_upload_frame(contents)
+    return frame_records(df), len(df)
+
+
+def parse_center_upload_records(contents: bytes) -> tuple[list[dict], int]:
+    df = read_center_upload_frame(contents)
+    return frame_records(df), len(df)
 
 
 def parse_indicator_manage_upload_records(contents: bytes) -> tuple[list[dict], int]:
-    df = pd.read_excel(io.BytesIO(contents))
+    df = pd.read_excel(io.BytesIO(contents), engine=EXCEL_READ_ENGINE)
     rename_map = {
         "指标名称": "indicator_name",
         "单位": "unit",
@@ -87,176 +114,200 @@ def parse_indicator_manage_upload_records(contents: bytes) -> tuple[list[dict],
     df.rename(columns={c: rename_map.get(str(c).strip(), c) for c in df.columns}, inplace=True)
     if "indicator_name" not in df.columns:
         raise ValueError("Missing required column: indicator_name")
-    df = df.where(pd.notna(df), None)
-    records = _normalize_records(df.to_dict(orient="records"))
-    return records, len(df)
-
-
-def build_export_xlsx(rows: list[dict], columns_rename: dict[str, str], sheet_name: str = "导出") -> bytes:
-    if not rows:
-        rows = [{"_": ""}]
-    df = pd.DataFrame(rows)
-    df = df.rename(columns=columns_rename)
+    return frame_records(df), len(df)
+
+
+def build_upload_error_xlsx(error_rows: dict[int, dict], errors: list[tuple[int, str]], upload_columns: dict[str, str]) -> bytes:
+    """
+    上传校验错误清单：每个失败行一行，保留原始各列，附 Excel 行号（含表头）与错误原因；
+    error_rows 为 {行下标: 原始行}
+    """
+    header = {v: k for k, v in upload_columns.items()}
+    rows = []
+    for index, reason in errors:
+        r = error_rows.get(index) or {}
+        row = {"行号": index + 2}
+        row.update({header.get(k, k): v for k, v in r.items()})
+        row["错误原因"] = reason
+        rows.append(row)
+    df = pd.DataFrame(rows or [{"行号": None, "错误原因": None}])
     buf = io.BytesIO()
     with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name=sheet_name)
+        df.to_excel(writer, index=False, sheet_name="错误明细")
     return buf.getvalue()
 
 
-def build_center_pivot_xlsx(rows: list[dict]) -> bytes:
-    if not rows:
-        buf = io.BytesIO()
-        with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-            pd.DataFrame({"提示": ["无数据"]}).to_excel(writer, index=False, sheet_name="空")
-        return buf.getvalue()
+def pivot_indicator_meta(rows) -> tuple[list[int], dict[int, str], dict[int, int]]:
+    """
+    透视表的指标列：按首次出现顺序排列，名称 / 方向取最后一次出现的值
+    """
+    long = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+    if long.empty:
+        return [], {}, {}
+    iids = long["indicator_id"].astype(int)
+    ordered_ind_ids = iids.drop_duplicates().tolist()
+    last = long.assign(indicator_id=iids).drop_duplicates("indicator_id", keep="last").set_index("indicator_id")
+    name_map = {
+        iid: str(name) if name is not None and not pd.isna(name) and name != "" else f"指标{iid}"
+        for iid, name in last["indicator_name"].items()
+    }
+    pos = last["is_positive"] if "is_positive" in last.columns else pd.Series(1, index=last.index)
+    pos_map = {iid: int(p) if p is not None and not pd.isna(p) else 1 for iid, p in pos.items()}
+    return ordered_ind_ids, name_map, pos_map
+
+
+# 透视实体：实体ID列、(列名, 行属性列, 默认值) 的标签列；标签列中前一列在合计行留空，后一列写合计行名称
+_PIVOT_ENTITIES = {
+    "district": ("district_id", (("圈层", "circle_id", 0), ("区县", "district_name", ""))),
+    "center": ("center_id", (("区县", "district_name", ""), ("支撑中心", "center_name", ""))),
+}
+
+
+def _row_columns(date_rows, names: tuple[str, ...]) -> dict[str, np.ndarray]:
+    # 取出需要的列为 numpy 数组（接受 DataFrame 或 dict 行列表），缺失的列为全 None
+    if isinstance(date_rows, pd.DataFrame):
+        n = len(date_rows)
+        return {c: date_rows[c].to_numpy() if c in date_rows.columns else np.full(n, None, dtype=object) for c in names}
+    return {c: np.array([r.get(c) for r in date_rows], dtype=object) for c in names}
+
+
+def pivot_matrix(date_rows, entity: str, ordered_ind_ids: list[int], pos_map: dict[int, int]) -> Optional[dict]:
+    """
+    单个统计日期的 实体×指标 矩阵（透视导出与 JSON 透视接口共用）：
+      entity_ids / labels：实体 ID 升序及两列标签（区县：圈层、区县名；支撑中心：区县名、中心名）；
+      values / scores：实体数 × 指标数，未上报为 NaN；
+      total_*：各指标均值（成都总计）；best_*：完成值按 is_positive 取最大 / 最小，得分取最大（全市最优值）。
+    同一 (实体, 指标) 出现多行时取最后一行；没有数据时返回 None。
+    """
+    id_col, labels = _PIVOT_ENTITIES[entity]
+    (_, blank_attr, blank_default), (_, name_attr, name_default) = labels
+    cols = _row_columns(date_rows, (id_col, "indicator_id", "value", "score", blank_attr, name_attr))
+    n = len(cols[id_col])
+    if n == 0:
+        return None
+
+    # 实体、指标分别编码为行号 / 列号，(实体, 指标) 重复时只保留最后一行
+    entity_ids, ent_pos = np.unique(cols[id_col].astype(np.int64), return_inverse=True)
+    ind_pos = pd.Index(ordered_ind_ids).get_indexer(cols["indicator_id"].astype(np.int64))
+    k = len(ordered_ind_ids)
+    cell = ent_pos * (k + 1) + (ind_pos + 1)
+    _, last_rev = np.unique(cell[::-1], return_index=True)
+    last = n - 1 - last_rev
+    last = last[ind_pos[last] >= 0]
+
+    values = np.full((len(entity_ids), k), np.nan)
+    scores = np.full((len(entity_ids), k), np.nan)
+    for target, col in ((values, "value"), (scores, "score")):
+        target[ent_pos[last], ind_pos[last]] = pd.to_numeric(cols[col], errors="coerce").astype(float)[last]
+
+    # 合计行：整列向量化归约（跳过空值），完成值的最优值按 is_positive 掩码在最大 / 最小之间选择
+    is_positive = np.array([pos_map.get(iid, 1) == 1 for iid in ordered_ind_ids], dtype=bool)
+    v, sc = pd.DataFrame(values), pd.DataFrame(scores)
+
+    # 标签取每个实体最后一行的值
+    _, first_rev = np.unique(ent_pos[::-1], return_index=True)
+    attr_rows = n - 1 - first_rev
+    return {
+        "entity_ids": entity_ids.tolist(),
+        "labels": (
+            _label_column(cols[blank_attr][attr_rows], blank_default),
+            _label_column(cols[name_attr][attr_rows], name_default),
+        ),
+        "values": values,
+        "scores": scores,
+        "total_values": v.mean().to_numpy(),
+        "total_scores": sc.mean().to_numpy(),
+        "best_values": np.where(is_positive, v.max().to_numpy(), v.min().to_numpy()),
+        "best_scores": sc.max().to_numpy(),
+    }
 
-    ordered_ind_ids: list[int] = []
-    name_map: dict[int, str] = {}
-    pos_map: dict[int, int] = {}
-    seen = set()
-    for r in rows:
-        iid = int(r.get("indicator_id"))
-        if iid not in seen:
-            ordered_ind_ids.append(iid)
-            seen.add(iid)
-        name_map[iid] = str(r.get("indicator_name") or f"指标{iid}")
-        pos_map[iid] = int(r.get("is_positive") if r.get("is_positive") is not None else 1)
-
-    group_by_date: dict[str, list[dict]] = defaultdict(list)
-    for r in rows:
-        group_by_date[str(r.get("stat_date"))].append(r)
 
-    buf = io.BytesIO()
-    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-        for stat_date, date_rows in sorted(group_by_date.items()):
-            agg: dict[int, dict[int, dict[str, float | None]]] = defaultdict(dict)
-            extra_cols: dict[int, tuple[str, str]] = {}
-            for r in date_rows:
-                cid = int(r.get("center_id"))
-                iid = int(r.get("indicator_id"))
-                val = r.get("value")
-                sc = r.get("score")
-                agg[cid][iid] = {
-                    "value": float(val) if val is not None else None,
-                    "score": float(sc) if sc is not None else None,
-                }
-                extra_cols[cid] = (str(r.get("district_name") or ""), str(r.get("center_name") or ""))
-
-            data = []
-            for cid, vals in agg.items():
-                dname, cname = extra_cols.get(cid, ("", ""))
-                row = {"中心ID": cid, "区县": dname, "支撑中心": cname}
-                for iid in ordered_ind_ids:
-                    col_name = name_map.get(iid, f"指标{iid}")
-                    v = vals.get(iid) or {}
-                    row[col_name] = v.get("value")
-                    row[f"{col_name}-得分"] = v.get("score")
-                data.append(row)
-
-            df = pd.DataFrame(data)
-            df = df.sort_values(by=["中心ID"]).reset_index(drop=True)
-            if "中心ID" in df.columns:
-                df = df.drop(columns=["中心ID"])
-
-            if not df.empty:
-                total_row = {"区县": "", "支撑中心": "成都总计"}
-                best_row = {"区县": "", "支撑中心": "全市最优值"}
-                for iid in ordered_ind_ids:
-                    col_v = name_map.get(iid, f"指标{iid}")
-                    col_s = f"{col_v}-得分"
-                    series_v = pd.to_numeric(df[col_v], errors="coerce")
-                    series_s = pd.to_numeric(df[col_s], errors="coerce")
-                    total_row[col_v] = float(series_v.mean(skipna=True)) if series_v.size else None
-                    total_row[col_s] = float(series_s.mean(skipna=True)) if series_s.size else None
-                    if pos_map.get(iid, 1) == 1:
-                        best_row[col_v] = float(series_v.max(skipna=True)) if series_v.size else None
-                    else:
-                        best_row[col_v] = float(series_v.min(skipna=True)) if series_v.size else None
-                    best_row[col_s] = float(series_s.max(skipna=True)) if series_s.size else None
-                df = pd.concat([df, pd.DataFrame([total_row, best_row])], ignore_index=True)
+def _nullable(a: np.ndarray) -> list:
+    # NaN -> None（JSON null）
+    out = a.astype(object)
+    out[np.isnan(a)] = None
+    return out.tolist()
+
+
+def pivot_payload(groups: list[tuple], entity: str, ordered_ind_ids: list[int], pos_map: dict[int, int]) -> list[dict]:
+    """
+    [(统计日期, 当日行)] -> 每个日期一份可直接序列化的紧凑矩阵（GET /pivot 使用），
+    行为实体、列为指标（顺序同 ordered_ind_ids），缺失值为 None
+    """
+    _, labels = _PIVOT_ENTITIES[entity]
+    out = []
+    for stat_date, date_rows in groups:
+        m = pivot_matrix(date_rows, entity, ordered_ind_ids, pos_map)
+        if m is None:
+            continue
+        out.append({
+            "stat_date": stat_date,
+            "entity_ids": m["entity_ids"],
+            "labels": {attr: col for (_, attr, _), col in zip(labels, m["labels"])},
+            "values": _nullable(m["values"]),
+            "scores": _nullable(m["scores"]),
+            "total": {"values": _nullable(m["total_values"]), "scores": _nullable(m["total_scores"])},
+            "best": {"values": _nullable(m["best_values"]), "scores": _nullable(m["best_scores"])},
+        })
+    return out
+
+
+def pivot_frame(date_rows, entity: str, ordered_ind_ids: list[int], name_map: dict[int, str], pos_map: dict[int, int]) -> pd.DataFrame:
+    """
+    单个统计日期的 实体×指标 透视表：每个指标两列（完成值、得分），实体按 ID 升序，
+    末尾追加「成都总计」「全市最优值」两行（见 pivot_matrix）
+    """
+    m = pivot_matrix(date_rows, entity, ordered_ind_ids, pos_map)
+    if m is None:
+        return pd.DataFrame()
+    (blank_label, _, _), (name_label, _, _) = _PIVOT_ENTITIES[entity][1]
+    values = np.vstack([m["values"], m["total_values"], m["best_values"]])
+    scores = np.vstack([m["scores"], m["total_scores"], m["best_scores"]])
+    columns: dict = {
+        blank_label: m["labels"][0] + ["", ""],
+        name_label: m["labels"][1] + ["成都总计", "全市最优值"],
+    }
+    for j, iid in enumerate(ordered_ind_ids):
+        col_name = name_map.get(iid, f"指标{iid}")
+        columns[col_name] = values[:, j]
+        columns[f"{col_name}-得分"] = scores[:, j]
+    return pd.DataFrame(columns)
 
-            df.to_excel(writer, index=False, sheet_name=str(stat_date))
-            ws = writer.sheets[str(stat_date)]
-            from openpyxl.styles import Font
-            bold = Font(bold=True)
-            for cell in ws[1]:
-                cell.font = bold
 
-    return buf.getvalue()
+def _label_column(values: np.ndarray, default) -> list:
+    # 与原逐行逻辑一致：空值取默认值，圈层转 int、名称转 str
+    cast = int if isinstance(default, int) else str
+    return [cast(v) if v is not None and not pd.isna(v) and v != "" else default for v in values.tolist()]
 
 
-def build_district_pivot_xlsx(rows: list[dict]) -> bytes:
+def center_pivot_frame(date_rows, ordered_ind_ids: list[int], name_map: dict[int, str], pos_map: dict[int, int]) -> pd.DataFrame:
+    """
+    单个统计日期的 支撑中心×指标 透视表（含成都总计、全市最优值两行）
+    """
+    return pivot_frame(date_rows, "center", ordered_ind_ids, name_map, pos_map)
+
+
+def district_pivot_frame(date_rows, ordered_ind_ids: list[int], name_map: dict[int, str], pos_map: dict[int, int]) -> pd.DataFrame:
+    """
+    单个统计日期的 区县×指标 透视表（含成都总计、全市最优值两行）
+    """
+    return pivot_frame(date_rows, "district", ordered_ind_ids, name_map, pos_map)
+
+
+def _build_pivot_xlsx(rows: list[dict], frame_builder) -> bytes:
     if not rows:
         buf = io.BytesIO()
         with pd.ExcelWriter(buf, engine="openpyxl") as writer:
             pd.DataFrame({"提示": ["无数据"]}).to_excel(writer, index=False, sheet_name="空")
         return buf.getvalue()
 
-    ordered_ind_ids: list[int] = []
-    name_map: dict[int, str] = {}
-    pos_map: dict[int, int] = {}
-    seen = set()
-    for r in rows:
-        iid = int(r.get("indicator_id"))
-        if iid not in seen:
-            ordered_ind_ids.append(iid)
-            seen.add(iid)
-        name_map[iid] = str(r.get("indicator_name") or f"指标{iid}")
-        pos_map[iid] = int(r.get("is_positive") if r.get("is_positive") is not None else 1)
-
-    group_by_date: dict[str, list[dict]] = defaultdict(list)
-    for r in rows:
-        group_by_date[str(r.get("stat_date"))].append(r)
+    long = pd.DataFrame(rows)
+    ordered_ind_ids, name_map, pos_map = pivot_indicator_meta(long)
 
     buf = io.BytesIO()
     with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-        for stat_date, date_rows in sorted(group_by_date.items()):
-            agg: dict[int, dict[int, dict[str, float | None]]] = defaultdict(dict)
-            extra_cols: dict[int, tuple[int, str]] = {}
-            for r in date_rows:
-                did = int(r.get("district_id"))
-                iid = int(r.get("indicator_id"))
-                val = r.get("value")
-                sc = r.get("score")
-                agg[did][iid] = {
-                    "value": float(val) if val is not None else None,
-                    "score": float(sc) if sc is not None else None,
-                }
-                extra_cols[did] = (int(r.get("circle_id") or 0), str(r.get("district_name") or ""))
-
-            data = []
-            for did, vals in agg.items():
-                circle_id, dname = extra_cols.get(did, (0, ""))
-                row = {"区县ID": did, "圈层": circle_id, "区县": dname}
-                for iid in ordered_ind_ids:
-                    col_name = name_map.get(iid, f"指标{iid}")
-                    v = vals.get(iid) or {}
-                    row[col_name] = v.get("value")
-                    row[f"{col_name}-得分"] = v.get("score")
-                data.append(row)
-
-            df = pd.DataFrame(data)
-            df = df.sort_values(by=["区县ID"]).reset_index(drop=True)
-            if "区县ID" in df.columns:
-                df = df.drop(columns=["区县ID"])
-
-            if not df.empty:
-                total_row = {"圈层": "", "区县": "成都总计"}
-                best_row = {"圈层": "", "区县": "全市最优值"}
-                for iid in ordered_ind_ids:
-                    col_v = name_map.get(iid, f"指标{iid}")
-                    col_s = f"{col_v}-得分"
-                    series_v = pd.to_numeric(df[col_v], errors="coerce")
-                    series_s = pd.to_numeric(df[col_s], errors="coerce")
-                    total_row[col_v] = float(series_v.mean(skipna=True)) if series_v.size else None
-                    total_row[col_s] = float(series_s.mean(skipna=True)) if series_s.size else None
-                    if pos_map.get(iid, 1) == 1:
-                        best_row[col_v] = float(series_v.max(skipna=True)) if series_v.size else None
-                    else:
-                        best_row[col_v] = float(series_v.min(skipna=True)) if series_v.size else None
-                    best_row[col_s] = float(series_s.max(skipna=True)) if series_s.size else None
-                df = pd.concat([df, pd.DataFrame([total_row, best_row])], ignore_index=True)
-
+        for stat_date, date_rows in long.groupby(long["stat_date"].astype(str), sort=True):
+            df = frame_builder(date_rows, ordered_ind_ids, name_map, pos_map)
             df.to_excel(writer, index=False, sheet_name=str(stat_date))
             ws = writer.sheets[str(stat_date)]
             from openpyxl.styles import Font
@@ -265,3 +316,11 @@ def build_district_pivot_xlsx(rows: list[dict]) -> bytes:
                 cell.font = bold
 
     return buf.getvalue()
+
+
+def build_center_pivot_xlsx(rows: list[dict]) -> bytes:
+    return _build_pivot_xlsx(rows, center_pivot_frame)
+
+
+def build_district_pivot_xlsx(rows: list[dict]) -> bytes:
+    return _build_pivot_xlsx(rows, district_pivot_frame)
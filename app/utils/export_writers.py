@@ -0,0 +1,301 @@
+import csv
+import io
+import math
+import tempfile
+from typing import Iterator, Optional
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from core.config import settings
+
+_READ_CHUNK = 64 * 1024
+
+
+def _cell_value(v):
+    if v is None:
+        return None
+    if isinstance(v, float) and math.isnan(v):
+        return None
+    return v
+
+
+def _iter_file(f, chunk_size: int = _READ_CHUNK) -> Iterator[bytes]:
+    try:
+        f.seek(0)
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        f.close()
+
+
+class XlsxStreamWriter:
+    """
+    基于 openpyxl write-only 模式的增量写入器：行写入后即落到临时文件，
+    内存占用与导出总行数无关。xlsx 为 zip 容器，需 close() 后才能输出字节。
+    """
+
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    extension = "xlsx"
+
+    def __init__(self):
+        self._wb = Workbook(write_only=True)
+        self._ws = None
+        self._bold = Font(bold=True)
+
+    def start_sheet(self, title: str, columns: list[str], types: Optional[list[str]] = None, bold_header: bool = False):
+        self._ws = self._wb.create_sheet(title=str(title)[:31])
+        if bold_header:
+            header = []
+            for c in columns:
+                cell = WriteOnlyCell(self._ws, value=c)
+                cell.font = self._bold
+                header.append(cell)
+            self._ws.append(header)
+        else:
+            self._ws.append(list(columns))
+
+    def write_rows(self, rows: list[list]):
+        for r in rows:
+            self._ws.append([_cell_value(v) for v in r])
+
+    def write_frame(
+        self, title: str, df: pd.DataFrame, sheet_column: str = "Sheet", bold_header: bool = True, types: Optional[list[str]] = None
+    ):
+        self.start_sheet(title, [str(c) for c in df.columns], bold_header=bold_header)
+        self.write_rows(df.itertuples(index=False, name=None))
+
+    def drain(self) -> bytes:
+        return b""
+
+    def close(self) -> Iterator[bytes]:
+        if not self._wb.worksheets:
+            self.start_sheet("空", ["提示"])
+            self.write_rows([["无数据"]])
+        f = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        self._wb.save(f)
+        return _iter_file(f)
+
+
+class CsvStreamWriter:
+    """
+    CSV 增量写入器：每批写入后 drain() 即可取走已编码的字节，真正边查边发。
+    多个 Sheet（透视表按日期分页）合并为一张表，首列为 sheet_column。
+    """
+
+    media_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def __init__(self):
+        self._buf = io.StringIO()
+        self._csv = csv.writer(self._buf)
+        # UTF-8 BOM，Excel 直接打开不乱码
+        self._pending = b"\xef\xbb\xbf"
+        self._header_written = False
+
+    def start_sheet(self, title: str, columns: list[str], types: Optional[list[str]] = None, bold_header: bool = False):
+        if not self._header_written:
+            self._csv.writerow(columns)
+            self._header_written = True
+
+    def write_rows(self, rows: list[list]):
+        self._csv.writerows([_cell_value(v) for v in r] for r in rows)
+
+    def write_frame(
+        self, title: str, df: pd.DataFrame, sheet_column: str = "Sheet", bold_header: bool = True, types: Optional[list[str]] = None
+    ):
+        df = df.copy()
+        df.insert(0, sheet_column, str(title))
+        df.to_csv(self._buf, header=not self._header_written, index=False)
+        self._header_written = True
+
+    def drain(self) -> bytes:
+        data = self._pending + self._buf.getvalue().encode("utf-8")
+        self._pending = b""
+        self._buf.seek(0)
+        self._buf.truncate()
+        return data
+
+    def close(self) -> Iterator[bytes]:
+        if not self._header_written:
+            self._csv.writerow(["提示"])
+            self._csv.writerow(["无数据"])
+        data = self.drain()
+        return iter([data] if data else [])
+
+
+class _ByteSink:
+    """
+    供 ParquetWriter 写入的内存缓冲，drain() 取走已写出的 row group 字节
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._pos = 0
+        self.closed = False
+
+    def write(self, b) -> int:
+        self._buf += b
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = bytes(self._buf)
+        self._buf.clear()
+        return data
+
+
+class ParquetStreamWriter:
+    """
+    Parquet 增量写入器（依赖 pyarrow，可选）：行数攒满 PARQUET_ROW_GROUP_SIZE 写出一个 row group，
+    写出的字节可立即 drain()，只有文件尾（footer）在 close() 时输出。
+    types 取值 str/int/float/date（start_sheet 为明细列，write_frame 为含 sheet_column 的整表列），
+    调用方按 SQLAlchemy 列类型给出，schema 据此预先确定；未给出时才按首批数据推断。
+    """
+
+    media_type = "application/vnd.apache.parquet"
+    extension = "parquet"
+
+    def __init__(self, row_group_size: Optional[int] = None):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._pq = pq
+        self._row_group_size = row_group_size or settings.PARQUET_ROW_GROUP_SIZE
+        self._sink = _ByteSink()
+        self._writer = None
+        self._schema = None
+        self._columns: list[str] = []
+        self._types: Optional[list[str]] = None
+        self._rows: list[list] = []
+        self._frame_types: Optional[list[str]] = None
+        self._frames: list[pd.DataFrame] = []
+        self._frame_rows = 0
+
+    def _arrow_type(self, t: Optional[str]):
+        pa = self._pa
+        return {"str": pa.string(), "int": pa.int64(), "float": pa.float64(), "date": pa.date32()}.get(t)
+
+    def _write_table(self, table):
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = self._pq.ParquetWriter(self._sink, self._schema, compression="snappy")
+        elif table.schema != self._schema:
+            table = table.cast(self._schema)
+        self._writer.write_table(table, row_group_size=self._row_group_size)
+
+    def start_sheet(self, title: str, columns: list[str], types: Optional[list[str]] = None, bold_header: bool = False):
+        if not self._columns:
+            self._columns = list(columns)
+            self._types = list(types) if types else None
+
+    def _flush_rows(self):
+        if not self._rows:
+            return
+        pa = self._pa
+        cols = list(zip(*self._rows))
+        arrays = []
+        for i, name in enumerate(self._columns):
+            t = self._arrow_type(self._types[i]) if self._types else None
+            values = cols[i]
+            if t == pa.float64():
+                values = [None if v is None else float(v) for v in values]
+            elif t == pa.string():
+                values = [None if v is None else str(v) for v in values]
+            arrays.append(pa.array(values, type=t))
+        self._write_table(pa.Table.from_arrays(arrays, names=self._columns))
+        self._rows = []
+
+    def write_rows(self, rows: list[list]):
+        self._rows.extend([_cell_value(v) for v in r] for r in rows)
+        if len(self._rows) >= self._row_group_size:
+            self._flush_rows()
+
+    def _flush_frames(self):
+        if not self._frames:
+            return
+        pa = self._pa
+        df = pd.concat(self._frames, ignore_index=True)
+        types = self._frame_types if self._frame_types and len(self._frame_types) == len(df.columns) else None
+        for i, c in enumerate(df.columns):
+            t = types[i] if types else None
+            if t == "date" or (df[c].dtype != object and t != "str"):
+                continue
+            vals = df[c].replace("", None)
+            if t in ("int", "float"):
+                df[c] = pd.to_numeric(vals, errors="coerce").astype("float64")
+                continue
+            if t is None:
+                # 未给出类型的对象列（Decimal、合计行的空字符串等混合值）：能整体转数值则转 float，否则统一为字符串
+                nums = pd.to_numeric(vals, errors="coerce")
+                if nums.notna().sum() == vals.notna().sum():
+                    df[c] = nums.astype("float64")
+                    continue
+            df[c] = vals.map(lambda v: None if v is None or (isinstance(v, float) and math.isnan(v)) else str(v))
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            if types:
+                # schema 由调用方给出的列类型确定：首批中全空的列不会被推断为 null 类型
+                schema = pa.schema([pa.field(c, self._arrow_type(t) or pa.string()) for c, t in zip(df.columns, types)])
+            else:
+                # 首批中全空的列推断为 null 类型，按 pandas dtype 指定为 string / float64
+                schema = pa.schema([
+                    f.with_type(pa.string() if df[f.name].dtype == object else pa.float64()) if pa.types.is_null(f.type) else f
+                    for f in table.schema
+                ])
+            table = table.cast(schema)
+        self._write_table(table)
+        self._frames = []
+        self._frame_rows = 0
+
+    def write_frame(
+        self, title: str, df: pd.DataFrame, sheet_column: str = "Sheet", bold_header: bool = True, types: Optional[list[str]] = None
+    ):
+        df = df.copy()
+        df.columns = [str(c) for c in df.columns]
+        df.insert(0, sheet_column, str(title))
+        if self._frame_types is None and types:
+            self._frame_types = list(types)
+        self._frames.append(df)
+        self._frame_rows += len(df)
+        if self._frame_rows >= self._row_group_size:
+            self._flush_frames()
+
+    def drain(self) -> bytes:
+        return self._sink.drain()
+
+    def close(self) -> Iterator[bytes]:
+        self._flush_rows()
+        self._flush_frames()
+        if self._writer is None:
+            columns = self._columns or ["提示"]
+            pa = self._pa
+            self._write_table(pa.table({c: pa.array([], type=pa.string()) for c in columns}))
+        self._writer.close()
+        data = self._sink.drain()
+        return iter([data] if data else [])
+
+
+EXPORT_WRITERS = {
+    "xlsx": XlsxStreamWriter,
+    "csv": CsvStreamWriter,
+    "parquet": ParquetStreamWriter,
+}
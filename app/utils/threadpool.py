@@ -1,14 +1,55 @@
 import asyncio
 import functools
-from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 from core.config import settings
 
 _executor = ThreadPoolExecutor(max_workers=settings.PANDAS_THREAD_WORKERS)
 _semaphore = asyncio.Semaphore(settings.PANDAS_JOB_CONCURRENCY)
 
+# PANDAS_EXECUTOR=process 时的进程池，首次使用时创建；
+# spawn 启动（不继承事件循环 / 连接池），每个子进程执行 PANDAS_PROCESS_MAX_TASKS 个任务后替换，限制内存增长
+_process_pool = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.PANDAS_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=settings.PANDAS_PROCESS_MAX_TASKS or None,
+        )
+    return _process_pool
+
 
 async def run_pandas(func, *args, **kwargs):
+    """
+    在线程池中执行：用于操作有状态对象的调用（流式 writer 的 write_rows / close 等）
+    """
     loop = asyncio.get_running_loop()
     async with _semaphore:
         return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+async def run_pandas_job(func, *args, **kwargs):
+    """
+    执行无状态的 pandas / openpyxl 任务（bytes / 记录进，bytes / DataFrame 出）。
+    PANDAS_EXECUTOR=process 时交给进程池，真正利用多核且不占用事件循环所在进程的 GIL；
+    func 须为模块级函数，参数与返回值须可 pickle。与 run_pandas 共用同一并发上限。
+    """
+    if settings.PANDAS_EXECUTOR != "process":
+        return await run_pandas(func, *args, **kwargs)
+    global _process_pool
+    loop = asyncio.get_running_loop()
+    async with _semaphore:
+        pool = _get_process_pool()
+        try:
+            return await loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+        except BrokenProcessPool:
+            # 子进程异常退出（如 OOM 被杀）会使整个池失效：丢弃后下次重建
+            if _process_pool is pool:
+                _process_pool = None
+            raise
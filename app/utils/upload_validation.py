@@ -0,0 +1,187 @@
+# =============================
+# app/utils/upload_validation.py
+# =============================
+# 上传数据的整表校验与键解析：解析后的 DataFrame 与指标 / 区县 / 支撑中心 / 考核类型维度表按名称关联，
+# 一次得到解析后的 ID、错误掩码与原因码，再按业务键合并文件内重复行。
+# 纯 pandas 计算、输入输出均可 pickle，在 run_pandas_job 中执行（可走进程池）。
+# 校验顺序与原因文案与逐行校验保持一致：每行只报告第一个失败原因。
+import numpy as np
+import pandas as pd
+
+from utils.excel_utils import read_indicator_upload_frame, read_center_upload_frame, frame_records
+
+# 原因码（0 = 通过）
+OK, IND_NOT_FOUND, ENTITY_NOT_FOUND, BAD_TYPE_ID, TYPE_NOT_FOUND, TYPE_MISMATCH, BAD_STAT_DATE = range(7)
+
+_VALUE_COLUMNS = ("value", "benchmark", "challenge", "exemption", "zero_tolerance", "score")
+
+
+def _positions(names: pd.Series, keys: pd.Series) -> pd.Series:
+    """
+    名称 -> 维度表行号（同名取最后一条，与 dict 索引一致），未命中为 NaN
+    """
+    pos = pd.Series(np.arange(len(keys)), index=keys.to_numpy())
+    pos = pos[~pos.index.duplicated(keep="last") & pos.index.notna()]
+    return names.astype(object).map(pos)
+
+
+def _take(table: pd.DataFrame, pos: pd.Series) -> pd.DataFrame:
+    # 按行号取维度列，与上传行逐行对齐；未命中的行为 NaN
+    return table.reindex(pos.fillna(-1).astype(int).to_numpy()).reset_index(drop=True)
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    if name in df.columns:
+        return df[name].reset_index(drop=True)
+    return pd.Series([None] * len(df), dtype=object)
+
+
+def _resolve_types(df: pd.DataFrame, types: pd.DataFrame) -> tuple[pd.Series, pd.Series, pd.Series, pd.Series]:
+    """
+    type_id 列优先（非空时须为整数），否则按 type_name 查找；返回 (provided_type_id, 非法ID掩码, 类型未找到掩码, 去空格类型名)
+    """
+    raw_id = _column(df, "type_id")
+    has_id = raw_id.notna()
+    num_id = pd.to_numeric(raw_id, errors="coerce")
+    bad_id = has_id & num_id.isna()
+
+    raw_name = _column(df, "type_name")
+    use_name = ~has_id & raw_name.notna()
+    tname = raw_name.where(use_name).astype(object).map(lambda v: str(v).strip(), na_action="ignore")
+    name_id = _take(types, _positions(tname, types["type_name"]))["type_id"].astype(float)
+    type_not_found = use_name & name_id.isna()
+
+    provided = np.trunc(num_id).where(has_id & ~bad_id, name_id)
+    return provided, bad_id, type_not_found, tname
+
+
+def _first_error(conditions: list[tuple[int, pd.Series]], n: int) -> np.ndarray:
+    if n == 0:
+        return np.zeros(0, dtype=np.int8)
+    return np.select([c.to_numpy(dtype=bool) for _, c in conditions], [code for code, _ in conditions], OK).astype(np.int8)
+
+
+def _messages(codes: np.ndarray, ind_name: pd.Series, entity_label: str, entity_name: pd.Series, tname: pd.Series) -> list[tuple[int, str]]:
+    errors = []
+    for i in np.flatnonzero(codes):
+        code = codes[i]
+        if code == IND_NOT_FOUND:
+            errors.append((int(i), f"Indicator '{_display(ind_name.iat[i])}' not found"))
+        elif code == ENTITY_NOT_FOUND:
+            errors.append((int(i), f"{entity_label} '{_display(entity_name.iat[i])}' not found"))
+        elif code == BAD_TYPE_ID:
+            errors.append((int(i), "Invalid type_id value"))
+        elif code == TYPE_NOT_FOUND:
+            errors.append((int(i), f"Evaluation type '{tname.iat[i]}' not found"))
+        elif code == TYPE_MISMATCH:
+            errors.append((int(i), "type_id mismatch with indicator definition"))
+        else:
+            errors.append((int(i), "Invalid stat_date value"))
+    return errors
+
+
+def _display(v):
+    return None if pd.isna(v) else v
+
+
+def _merge_duplicates(out: pd.DataFrame, keys: list[str], keep_cols: tuple[str, ...]) -> pd.DataFrame:
+    """
+    文件内重复键：后出现的行覆盖前者，keep_cols 取最后一个非空值（等价于逐行合并时空值沿用前者）
+    """
+    last = out.drop_duplicates(keys, keep="last").set_index(keys)
+    if len(last) < len(out):
+        filled = out.groupby(keys, sort=False)[list(keep_cols)].last()
+        last[list(keep_cols)] = filled.reindex(last.index)
+    return last.reset_index()
+
+
+def _to_merged(out: pd.DataFrame, keys: list[str]) -> dict[tuple, dict]:
+    rows = frame_records(out)
+    return {tuple(r[k] for k in keys): r for r in rows}
+
+
+def _resolve(df: pd.DataFrame, tables: dict, entity: str):
+    n = len(df)
+    df = df.reset_index(drop=True)
+    ind_name = _column(df, "indicator_name")
+    inds = pd.DataFrame(tables["indicators"], columns=["indicator_id", "indicator_name", "ind_type_id", "major_id", "is_positive"])
+    ind = _take(inds, _positions(ind_name, inds["indicator_name"]))
+    ind_missing = ind["indicator_id"].isna()
+
+    if entity == "district":
+        entity_name = _column(df, "district_name")
+        dists = pd.DataFrame(tables["districts"], columns=["district_id", "district_name", "simple_name", "circle_id"])
+        # 先按全称、再按简称查找；空名称视为未找到
+        pos = _positions(entity_name, dists["district_name"]).fillna(_positions(entity_name, dists["simple_name"]))
+        ent = _take(dists, pos)
+        ent_missing = ent["district_id"].isna() | (entity_name.astype(object) == "")
+        entity_label, id_col = "District", "district_id"
+    else:
+        entity_name = _column(df, "center_name")
+        centers = pd.DataFrame(tables["centers"], columns=["center_id", "center_name"])
+        ent = _take(centers, _positions(entity_name, centers["center_name"]))
+        ent_missing = ent["center_id"].isna()
+        entity_label, id_col = "Center", "center_id"
+
+    types = pd.DataFrame(tables["types"], columns=["type_id", "type_name"])
+    provided, bad_id, type_not_found, tname = _resolve_types(df, types)
+    mismatch = provided.notna() & ind["ind_type_id"].notna() & (provided != ind["ind_type_id"])
+    stat_date = _column(df, "stat_date")
+
+    codes = _first_error([
+        (IND_NOT_FOUND, ind_missing),
+        (ENTITY_NOT_FOUND, ent_missing),
+        (BAD_TYPE_ID, bad_id),
+        (TYPE_NOT_FOUND, type_not_found),
+        (TYPE_MISMATCH, mismatch),
+        (BAD_STAT_DATE, stat_date.isna()),
+    ], n)
+    errors = _messages(codes, ind_name, entity_label, entity_name, tname)
+
+    ok = codes == OK
+    # 与逐行逻辑一致：provided_type_id or ind.type_id（0 / 空都回落到指标定义）
+    type_id = provided.where(provided.notna() & (provided != 0), ind["ind_type_id"])
+    out = pd.DataFrame({
+        "indicator_id": ind["indicator_id"],
+        "indicator_name": ind["indicator_name"],
+        "type_id": type_id,
+        "major_id": ind["major_id"],
+        "is_positive": ind["is_positive"],
+    })
+    if entity == "district":
+        out["circle_id"] = ent["circle_id"].fillna(0)
+        out["district_id"] = ent["district_id"]
+        out["district_name"] = ent["district_name"]
+        value_cols = _VALUE_COLUMNS
+        keep_cols = ("exemption", "zero_tolerance", "score")
+    else:
+        out["center_id"] = ent["center_id"]
+        out["center_name"] = ent["center_name"]
+        value_cols = ("value", "benchmark", "challenge", "score")
+        keep_cols = ("score",)
+    out["stat_date"] = stat_date
+    for c in value_cols:
+        out[c] = _column(df, c)
+
+    out = out[ok]
+    int_cols = ["indicator_id", id_col, "type_id", "major_id", "is_positive"] + (["circle_id"] if entity == "district" else [])
+    out = out.astype({c: "Int64" for c in int_cols})
+    keys = ["indicator_id", id_col, "stat_date"]
+    merged = _to_merged(_merge_duplicates(out, keys, keep_cols), keys)
+
+    error_rows = dict(zip(np.flatnonzero(~ok).tolist(), frame_records(df[~ok])))
+    return merged, errors, error_rows, n
+
+
+def prepare_indicator_upload(contents: bytes, tables: dict):
+    """
+    解析并校验区县指标上传文件，返回 (合并后的行 {键: 行}, [(行下标, 原因)], {行下标: 失败行原始值}, 总行数)
+    """
+    return _resolve(read_indicator_upload_frame(contents), tables, "district")
+
+
+def prepare_center_upload(contents: bytes, tables: dict):
+    """
+    解析并校验支撑中心指标上传文件，返回值同 prepare_indicator_upload
+    """
+    return _resolve(read_center_upload_frame(contents), tables, "center")
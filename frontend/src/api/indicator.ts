@@ -195,10 +195,37 @@ export const getIndicatorsByType = (type_id: number) => {
   return service.get<any, IndicatorSimple[]>('/metrics/indicators_by_type', { params: { type_id } })
 }
 
-export const getIndicatorSeries = (params: { indicator_id: number, district_id?: number, start_date?: string, end_date?: string, size?: number }) => {
+export type SeriesBucket = 'day' | 'week' | 'month' | 'quarter'
+export type SeriesAgg = 'avg' | 'last' | 'min' | 'max'
+
+export const getIndicatorSeries = (params: { indicator_id: number, district_id?: number, start_date?: string, end_date?: string, size?: number, bucket?: SeriesBucket, agg?: SeriesAgg, max_points?: number }) => {
   return service.get<any, IndicatorDataResponse>('/metrics/series', { params })
 }
 
+export interface SeriesBatchQuery {
+  entity?: 'district' | 'center'
+  indicator_ids: number[]
+  district_ids?: number[]
+  center_ids?: number[]
+  start_date?: string
+  end_date?: string
+  bucket?: SeriesBucket
+  agg?: SeriesAgg
+  max_points?: number
+}
+
+export interface SeriesColumns {
+  indicator_id: number
+  entity_id: number
+  stat_date: string[]
+  value: Array<number | null>
+  score: Array<number | null>
+}
+
+export const getSeriesBatch = (data: SeriesBatchQuery) => {
+  return service.post<any, { entity: string, series: SeriesColumns[] }>('/metrics/series/batch', data)
+}
+
 export const getIndicatorSuggestions = (params: { q: string, type_id?: number, size?: number }) => {
   return service.get<any, IndicatorSimple[]>('/metrics/indicators/search', { params })
 }
@@ -368,6 +395,6 @@ export const getCenterLatestById = (params: { indicator_id?: number; indicator_n
   return service.get<any, CenterLatestItem[]>('/metrics/center/by_name_or_id', { params })
 }
 
-export const getCenterSeries = (params: { indicator_id: number; center_id?: number; start_date?: string; end_date?: string; size?: number }) => {
+export const getCenterSeries = (params: { indicator_id: number; center_id?: number; start_date?: string; end_date?: string; size?: number; bucket?: SeriesBucket; agg?: SeriesAgg; max_points?: number }) => {
   return service.get<any, CenterDataResponse>('/metrics/center/series', { params })
 }
@@ -0,0 +1,95 @@
+"""
+批量数据接口响应编码基准：一页 N 行（默认 1000）IndicatorDataOut，比较
+  - json：默认路径（按 response_model 校验整页后 dump_json，等同 FastAPI 的输出）
+  - columnar+json：列式 JSON，字符串 / 日期列字典编码
+  - columnar+msgpack：同结构 MessagePack（未安装 msgpack 时跳过）
+  - arrow：Arrow IPC 流（未安装 pyarrow 时跳过）
+  - json fields=...：列投影的 dict 行（服务层 fields= 返回的形态）直接序列化
+输出每种编码的序列化耗时、字节数与 gzip 后字节数。
+
+用法：python scripts/bench_encodings.py [--rows 1000] [--repeat 20] [--fields indicator_id,stat_date,value]
+"""
+import argparse
+import datetime
+import gzip
+import random
+import sys
+import time
+from pathlib import Path
+
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from core.content_negotiation import MEDIA_TYPES, COLUMNAR_JSON, COLUMNAR_MSGPACK, ARROW_STREAM, encode_page
+from models.metrics_schemas import IndicatorDataOut, IndicatorDataResponse
+
+
+def _make_page(rows: int) -> dict:
+    rnd = random.Random(0)
+    start = datetime.date(2025, 1, 1)
+    items = []
+    for i in range(rows):
+        d = i % 22 + 1
+        ind = i // 22 % 40 + 1
+        items.append(IndicatorDataOut(
+            id=i + 1,
+            indicator_id=ind,
+            indicator_name=f"网络质量指标{ind}（月累计）",
+            type_id=1,
+            major_id=2,
+            is_positive=1,
+            circle_id=d % 3 + 1,
+            district_id=d,
+            district_name=f"区县{d}",
+            stat_date=start + datetime.timedelta(days=i // 880),
+            value=round(rnd.random() * 100, 4),
+            benchmark=95.0,
+            challenge=98.0,
+            exemption=None,
+            zero_tolerance=None,
+            score=round(rnd.random() * 10, 2),
+        ))
+    return {"items": items, "total": 123456}
+
+
+def _bench(name: str, fn, repeat: int) -> None:
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - t0)
+    print(f"{name:<18} {best * 1000:8.2f} ms  {len(body):>9,} B  gzip {len(gzip.compress(body)):>8,} B")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--fields", default="indicator_id,stat_date,value")
+    args = parser.parse_args()
+
+    page = _make_page(args.rows)
+    adapter = TypeAdapter(IndicatorDataResponse)
+    print(f"rows: {args.rows:,}")
+    _bench("json", lambda: adapter.dump_json(adapter.validate_python(page, from_attributes=True)), args.repeat)
+    for name, media_type in (("columnar+json", COLUMNAR_JSON), ("columnar+msgpack", COLUMNAR_MSGPACK), ("arrow", ARROW_STREAM)):
+        if media_type not in MEDIA_TYPES:
+            print(f"{name:<18} skipped (optional dependency not installed)")
+            continue
+        _bench(name, lambda: encode_page(media_type, page, IndicatorDataOut), args.repeat)
+
+    # 列投影：数据库只返回这几列，行以 dict 直接序列化（行元组 -> dict 的开销计入）
+    fields = args.fields.split(",")
+    tuples = [tuple(getattr(it, f) for f in fields) for it in page["items"]]
+    _bench(
+        f"json fields={len(fields)}",
+        lambda: to_json({"items": [dict(zip(fields, t)) for t in tuples], "total": page["total"]}),
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+JSON 响应序列化基准：一页 N 行（默认 1000）IndicatorDataResponse，比较
+  - jsonable_encoder+json：原路径（无 response_model 的路由 / 响应缓存：jsonable_encoder 后标准库 json.dumps，
+                           行内 value 等为 ORM 取回的 Decimal）
+  - response_model+json：FastAPI 旧版本对 response_model 路由的处理（校验 -> dump_python(mode=json) -> json.dumps）
+  - response_model+dump_json：FastAPI 新版本的直接序列化（校验 -> pydantic-core dump_json）
+  - FastJSONResponse：core.json_response.json_dumps 直接输出同一份 Decimal 行（orjson，Decimal / date 原生处理）
+  - validated_response：已校验的 IndicatorDataOut 行按 model_construct 拼页后直接输出（跳过再次校验）
+并校验各路径输出的 JSON 内容一致。
+
+用法：python scripts/bench_json_response.py [--rows 1000] [--repeat 20] [--decimal float|str]
+"""
+import argparse
+import json
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_encodings import _make_page
+from core.config import settings
+from core.json_response import json_dumps, validated_response
+from models.metrics_schemas import IndicatorDataResponse
+
+_DECIMAL_FIELDS = ("value", "benchmark", "challenge", "exemption", "zero_tolerance", "score")
+
+
+def _decimal_rows(page: dict) -> dict:
+    # 模拟 ORM / Core 行：DECIMAL(18,4) 列为 Decimal
+    items = []
+    for it in page["items"]:
+        row = it.model_dump()
+        for k in _DECIMAL_FIELDS:
+            if row[k] is not None:
+                row[k] = Decimal(f"{row[k]:.4f}")
+        items.append(row)
+    return {"items": items, "total": page["total"]}
+
+
+def _bench(name: str, fn, repeat: int) -> bytes:
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - t0)
+    print(f"{name:<26} {best * 1000:8.2f} ms  {len(body):>9,} B")
+    return body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--decimal", choices=("float", "str"), default="float")
+    args = parser.parse_args()
+    settings.JSON_DECIMAL_MODE = args.decimal
+
+    page = _make_page(args.rows)
+    rows = _decimal_rows(page)
+    adapter = TypeAdapter(IndicatorDataResponse)
+    print(f"rows: {args.rows:,}  JSON_DECIMAL_MODE={args.decimal}")
+
+    bodies = {
+        "jsonable_encoder+json": _bench(
+            "jsonable_encoder+json",
+            lambda: json.dumps(jsonable_encoder(rows), ensure_ascii=False).encode("utf-8"),
+            args.repeat,
+        ),
+        "response_model+json": _bench(
+            "response_model+json",
+            lambda: json.dumps(adapter.dump_python(adapter.validate_python(page, from_attributes=True), mode="json")).encode(),
+            args.repeat,
+        ),
+        "response_model+dump_json": _bench(
+            "response_model+dump_json",
+            lambda: adapter.dump_json(adapter.validate_python(page, from_attributes=True)),
+            args.repeat,
+        ),
+        "FastJSONResponse": _bench("FastJSONResponse", lambda: json_dumps(rows), args.repeat),
+        "validated_response": _bench(
+            "validated_response",
+            lambda: validated_response(IndicatorDataResponse.model_construct(**page)).body,
+            args.repeat,
+        ),
+    }
+
+    # 内容一致性（Decimal 按 str 输出时数值列为字符串，只比较 float 模式）
+    if args.decimal == "float":
+        ref = json.loads(bodies["response_model+dump_json"])
+        for name, body in bodies.items():
+            data = json.loads(body)
+            data.setdefault("next_cursor", None)
+            assert data == ref, name
+        print("outputs identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+透视表（export_v2）基准：50 个指标 × 22 个区县 / 支撑中心 × 90 天，比较
+  - legacy：改造前的逐行 dict 聚合 + 逐列 pd.to_numeric 计算合计行
+  - engine：pivot_frame（pivot + 向量化归约，is_positive 掩码选最优值）
+分别统计「只构建 DataFrame」与「构建并写出整本 xlsx」的耗时，并校验两者结果一致。
+
+用法：python scripts/bench_pivot.py [--indicators 50] [--entities 22] [--days 90] [--skip-xlsx]
+"""
+import argparse
+import datetime
+import io
+import random
+import sys
+import time
+from collections import defaultdict
+from decimal import Decimal
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.utils.excel_utils import (
+    pivot_indicator_meta,
+    district_pivot_frame,
+    center_pivot_frame,
+    build_district_pivot_xlsx,
+    build_center_pivot_xlsx,
+)
+
+
+# ---------- 改造前的实现（仅供对比） ----------
+
+def _legacy_total_best(df, label_cols, ordered_ind_ids, name_map, pos_map):
+    if df.empty:
+        return df
+    blank_col, label_col = label_cols
+    total_row = {blank_col: "", label_col: "成都总计"}
+    best_row = {blank_col: "", label_col: "全市最优值"}
+    for iid in ordered_ind_ids:
+        col_v = name_map.get(iid, f"指标{iid}")
+        col_s = f"{col_v}-得分"
+        series_v = pd.to_numeric(df[col_v], errors="coerce")
+        series_s = pd.to_numeric(df[col_s], errors="coerce")
+        total_row[col_v] = float(series_v.mean(skipna=True)) if series_v.size else None
+        total_row[col_s] = float(series_s.mean(skipna=True)) if series_s.size else None
+        if pos_map.get(iid, 1) == 1:
+            best_row[col_v] = float(series_v.max(skipna=True)) if series_v.size else None
+        else:
+            best_row[col_v] = float(series_v.min(skipna=True)) if series_v.size else None
+        best_row[col_s] = float(series_s.max(skipna=True)) if series_s.size else None
+    return pd.concat([df, pd.DataFrame([total_row, best_row])], ignore_index=True)
+
+
+def _legacy_frame(date_rows, ordered_ind_ids, name_map, pos_map, entity):
+    id_col, id_label, label_cols = (
+        ("district_id", "区县ID", ("圈层", "区县")) if entity == "district" else ("center_id", "中心ID", ("区县", "支撑中心"))
+    )
+    agg = defaultdict(dict)
+    extra = {}
+    for r in date_rows:
+        eid = int(r.get(id_col))
+        iid = int(r.get("indicator_id"))
+        val, sc = r.get("value"), r.get("score")
+        agg[eid][iid] = {"value": float(val) if val is not None else None, "score": float(sc) if sc is not None else None}
+        if entity == "district":
+            extra[eid] = (int(r.get("circle_id") or 0), str(r.get("district_name") or ""))
+        else:
+            extra[eid] = (str(r.get("district_name") or ""), str(r.get("center_name") or ""))
+    data = []
+    for eid, vals in agg.items():
+        a, b = extra[eid]
+        row = {id_label: eid, label_cols[0]: a, label_cols[1]: b}
+        for iid in ordered_ind_ids:
+            col = name_map.get(iid, f"指标{iid}")
+            v = vals.get(iid) or {}
+            row[col] = v.get("value")
+            row[f"{col}-得分"] = v.get("score")
+        data.append(row)
+    df = pd.DataFrame(data).sort_values(by=[id_label]).reset_index(drop=True).drop(columns=[id_label])
+    return _legacy_total_best(df, label_cols, ordered_ind_ids, name_map, pos_map)
+
+
+def _legacy_xlsx(rows, entity):
+    ordered_ind_ids, name_map, pos_map = pivot_indicator_meta(rows)
+    by_date = defaultdict(list)
+    for r in rows:
+        by_date[str(r.get("stat_date"))].append(r)
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        for stat_date, date_rows in sorted(by_date.items()):
+            _legacy_frame(date_rows, ordered_ind_ids, name_map, pos_map, entity).to_excel(
+                writer, index=False, sheet_name=stat_date
+            )
+    return buf.getvalue()
+
+
+# ---------- 基准 ----------
+
+def _make_rows(n_ind: int, n_ent: int, days: int) -> list[dict]:
+    rnd = random.Random(0)
+    start = datetime.date(2025, 1, 1)
+    rows = []
+    for d in range(days):
+        stat_date = start + datetime.timedelta(days=d)
+        for e in range(1, n_ent + 1):
+            for i in range(1, n_ind + 1):
+                rows.append({
+                    "district_id": e,
+                    "center_id": e,
+                    "district_name": f"区县{e}",
+                    "center_name": f"支撑中心{e}",
+                    "circle_id": e % 3 + 1,
+                    "indicator_id": i,
+                    "indicator_name": f"指标{i}",
+                    "is_positive": i % 2,
+                    "stat_date": stat_date,
+                    "value": Decimal(f"{rnd.random():.4f}") if rnd.random() > 0.05 else None,
+                    "score": Decimal(f"{rnd.random() * 100:.2f}") if rnd.random() > 0.2 else None,
+                })
+    return rows
+
+
+def _timeit(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--indicators", type=int, default=50)
+    parser.add_argument("--entities", type=int, default=22)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--skip-xlsx", action="store_true")
+    args = parser.parse_args()
+
+    rows = _make_rows(args.indicators, args.entities, args.days)
+    print(f"rows: {len(rows):,} ({args.indicators} indicators × {args.entities} entities × {args.days} days)")
+    meta = pivot_indicator_meta(rows)
+    by_date = defaultdict(list)
+    for r in rows:
+        by_date[r["stat_date"]].append(r)
+
+    for entity, frame_fn, xlsx_fn in (
+        ("district", district_pivot_frame, build_district_pivot_xlsx),
+        ("center", center_pivot_frame, build_center_pivot_xlsx),
+    ):
+        for date_rows in list(by_date.values())[:3]:
+            pd.testing.assert_frame_equal(_legacy_frame(date_rows, *meta, entity), frame_fn(date_rows, *meta))
+
+        t_old = _timeit(lambda: [_legacy_frame(g, *meta, entity) for g in by_date.values()])
+        t_new = _timeit(lambda: [frame_fn(g, *meta) for g in by_date.values()])
+        print(f"[{entity}] frames  legacy={t_old:.3f}s  engine={t_new:.3f}s  speedup={t_old / t_new:.2f}x")
+        if not args.skip_xlsx:
+            t_old = _timeit(lambda: _legacy_xlsx(rows, entity))
+            t_new = _timeit(lambda: xlsx_fn(rows))
+            print(f"[{entity}] xlsx    legacy={t_old:.3f}s  engine={t_new:.3f}s  speedup={t_old / t_new:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+-- v2.0
+-- 支撑中心指标最新值表：每个 (指标, 支撑中心) 最新统计日期的一行，由写入路径同步维护；
+-- 回填后执行 python manage.py rebuild-latest 重建
+CREATE TABLE IF NOT EXISTS indicator_center_latest (
+    indicator_id   INT NOT NULL COMMENT '指标ID',
+    center_id      INT NOT NULL COMMENT '支撑中心ID',
+    data_id        BIGINT NOT NULL COMMENT '来源 indicator_center_data.id',
+    indicator_name VARCHAR(100) NOT NULL COMMENT '指标名称',
+    type_id        INT NULL COMMENT '类型ID（evaluation_types）',
+    major_id       INT NULL COMMENT '专业ID（majors）',
+    is_positive    TINYINT NOT NULL COMMENT '1.正向、0.负向、2.其他',
+    center_name    VARCHAR(32) NOT NULL COMMENT '支撑中心名称',
+    stat_date      DATE NOT NULL COMMENT '最新统计日期',
+    value          DECIMAL(18,4) NULL COMMENT '指标值',
+    benchmark      DECIMAL(18,4) NULL COMMENT '基准值',
+    challenge      DECIMAL(18,4) NULL COMMENT '挑战值',
+    exemption      DECIMAL(18,4) NULL COMMENT '豁免值',
+    zero_tolerance DECIMAL(18,4) NULL COMMENT '零容忍值',
+    score          DECIMAL(18,4) NULL COMMENT '得分',
+    update_time    DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+
+    PRIMARY KEY (indicator_id, center_id),
+    KEY ix_center_latest_center (center_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
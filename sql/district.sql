@@ -80,6 +80,7 @@ CREATE TABLE IF NOT EXISTS indicator (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- 8. 指标数据表（修正CHECK+COMMENT语法，适配5.7）
+--    热点过滤索引（uk_iid_did_date / ix_did_date / ix_date）由 sql/migrations/002 添加：python manage.py migrate
 CREATE TABLE IF NOT EXISTS indicator_data_v2 (
     id           BIGINT AUTO_INCREMENT COMMENT '主键',
     indicator_id INT NOT NULL COMMENT '指标ID，关联 indicator（逻辑外键）',
@@ -105,4 +106,29 @@ CREATE TABLE IF NOT EXISTS indicator_data_v2 (
     UNIQUE KEY uk_circle_did_iid_date (circle_id, district_id, indicator_id, stat_date),
     KEY ix_circle_iid_date (circle_id, indicator_id, stat_date, district_id),
     KEY ix_iid_date (indicator_id, stat_date, circle_id, district_id)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
\ No newline at end of file
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+-- 9. 指标最新值表：每个 (指标, 区县) 最新统计日期的一行，由写入路径同步维护，
+--    /snapshot、/by_majors、/by-type 直接读取；回填后执行 python manage.py rebuild-latest 重建
+CREATE TABLE IF NOT EXISTS indicator_latest (
+    indicator_id   INT NOT NULL COMMENT '指标ID',
+    district_id    INT NOT NULL COMMENT '区县ID',
+    data_id        BIGINT NOT NULL COMMENT '来源 indicator_data_v2.id',
+    indicator_name VARCHAR(100) NOT NULL COMMENT '指标名称',
+    type_id        INT NULL COMMENT '类型ID（evaluation_types）',
+    major_id       INT NULL COMMENT '专业ID（majors）',
+    is_positive    TINYINT NOT NULL COMMENT '1.正向、0.负向、2.其他',
+    circle_id      INT NOT NULL COMMENT '圈层ID',
+    district_name  VARCHAR(32) NOT NULL COMMENT '区县名字',
+    stat_date      DATE NOT NULL COMMENT '最新统计日期',
+    value          DECIMAL(18,4) NULL COMMENT '指标值',
+    benchmark      DECIMAL(18,4) NULL COMMENT '基准值',
+    challenge      DECIMAL(18,4) NULL COMMENT '挑战值',
+    exemption      DECIMAL(18,4) NULL COMMENT '豁免值',
+    zero_tolerance DECIMAL(18,4) NULL COMMENT '零容忍值',
+    score          DECIMAL(18,4) NULL COMMENT '得分',
+    update_time    DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+
+    PRIMARY KEY (indicator_id, district_id),
+    KEY ix_latest_district (district_id),
+    KEY ix_latest_circle (circle_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
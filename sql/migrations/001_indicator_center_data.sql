@@ -0,0 +1,24 @@
+-- 001 支撑中心指标数据表（此前仓库中没有 DDL）。
+-- 主键带 stat_date，与 indicator_data_v2 一致（便于按统计日期分区）；二级索引见 003。
+-- 已存在的表不做修改（CREATE TABLE IF NOT EXISTS）。
+CREATE TABLE IF NOT EXISTS indicator_center_data (
+    id             BIGINT AUTO_INCREMENT COMMENT '主键',
+    indicator_id   INT NOT NULL COMMENT '指标ID，关联 indicator（逻辑外键）',
+    indicator_name VARCHAR(100) NOT NULL COMMENT '指标名称',
+    type_id        INT NULL COMMENT '类型ID（evaluation_types）',
+    major_id       INT NULL COMMENT '专业ID（majors）',
+    is_positive    TINYINT NOT NULL COMMENT '1.正向、0.负向、2.其他',
+    center_id      INT NOT NULL COMMENT '支撑中心ID，关联 centers（逻辑外键）',
+    center_name    VARCHAR(32) NOT NULL COMMENT '支撑中心名称',
+    stat_date      DATE NOT NULL COMMENT '统计日期',
+    value          DECIMAL(18,4) NULL COMMENT '指标值',
+    benchmark      DECIMAL(18,4) NULL COMMENT '基准值',
+    challenge      DECIMAL(18,4) NULL COMMENT '挑战值',
+    exemption      DECIMAL(18,4) NULL COMMENT '豁免值',
+    zero_tolerance DECIMAL(18,4) NULL COMMENT '零容忍值',
+    score          DECIMAL(18,4) NULL COMMENT '得分',
+    create_time    DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+    update_time    DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+
+    PRIMARY KEY (id, stat_date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,11 @@
+-- 002 区县指标数据表的热点过滤索引。
+--   uk_iid_did_date：导入 upsert 的自然键 (指标, 区县, 统计日期)，同时支撑 indicator_id + district_id + 日期区间 查询；
+--   ix_did_date：只按区县（+ 日期区间）查询；
+--   ix_date：只按日期区间查询（导出 / 透视 / 最新日期）。
+-- 唯一键添加前请确认没有重复的 (indicator_id, district_id, stat_date)：
+--   SELECT indicator_id, district_id, stat_date, COUNT(*) FROM indicator_data_v2
+--   GROUP BY indicator_id, district_id, stat_date HAVING COUNT(*) > 1;
+-- 每个索引单独一条 ALTER：索引名已存在时迁移脚本跳过该条（manage.py migrate）。
+ALTER TABLE indicator_data_v2 ADD UNIQUE KEY uk_iid_did_date (indicator_id, district_id, stat_date), ALGORITHM=INPLACE, LOCK=NONE;
+ALTER TABLE indicator_data_v2 ADD KEY ix_did_date (district_id, stat_date), ALGORITHM=INPLACE, LOCK=NONE;
+ALTER TABLE indicator_data_v2 ADD KEY ix_date (stat_date), ALGORITHM=INPLACE, LOCK=NONE;
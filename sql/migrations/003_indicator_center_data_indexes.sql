@@ -0,0 +1,7 @@
+-- 003 支撑中心指标数据表的热点过滤索引（含义同 002）。
+-- 唯一键添加前请确认没有重复的 (indicator_id, center_id, stat_date)：
+--   SELECT indicator_id, center_id, stat_date, COUNT(*) FROM indicator_center_data
+--   GROUP BY indicator_id, center_id, stat_date HAVING COUNT(*) > 1;
+ALTER TABLE indicator_center_data ADD UNIQUE KEY uk_iid_cid_date (indicator_id, center_id, stat_date), ALGORITHM=INPLACE, LOCK=NONE;
+ALTER TABLE indicator_center_data ADD KEY ix_cid_date (center_id, stat_date), ALGORITHM=INPLACE, LOCK=NONE;
+ALTER TABLE indicator_center_data ADD KEY ix_date (stat_date), ALGORITHM=INPLACE, LOCK=NONE;
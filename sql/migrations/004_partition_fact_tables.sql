@@ -0,0 +1,67 @@
+-- 004 事实表按 stat_date 月分区（RANGE COLUMNS，DATE 列直接比较即可裁剪）。
+--   p_hist：2025 年以前的历史数据；pYYYYMM：当月数据（VALUES LESS THAN 次月 1 日）；p_max：兜底（应保持为空）。
+--   之后由 python manage.py partitions 定期从 p_max 拆出未来月份（PARTITION_AHEAD_MONTHS），
+--   并按 PARTITION_RETAIN_MONTHS 把过期分区交换到归档表后删除。
+-- 前提：
+--   - 主键与所有唯一键都包含 stat_date（indicator_data_v2 的 (id, stat_date) / uk_*，001 ~ 003 建立的键均满足）；
+--     早于 001 手工建立、主键只有 id 的 indicator_center_data 需先执行：
+--     ALTER TABLE indicator_center_data DROP PRIMARY KEY, ADD PRIMARY KEY (id, stat_date);
+--   - 分区会重建整表并在期间阻塞写入，数据量大时请在低峰期执行。
+ALTER TABLE indicator_data_v2 PARTITION BY RANGE COLUMNS(stat_date) (
+    PARTITION p_hist VALUES LESS THAN ('2025-01-01'),
+    PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+    PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+    PARTITION p202503 VALUES LESS THAN ('2025-04-01'),
+    PARTITION p202504 VALUES LESS THAN ('2025-05-01'),
+    PARTITION p202505 VALUES LESS THAN ('2025-06-01'),
+    PARTITION p202506 VALUES LESS THAN ('2025-07-01'),
+    PARTITION p202507 VALUES LESS THAN ('2025-08-01'),
+    PARTITION p202508 VALUES LESS THAN ('2025-09-01'),
+    PARTITION p202509 VALUES LESS THAN ('2025-10-01'),
+    PARTITION p202510 VALUES LESS THAN ('2025-11-01'),
+    PARTITION p202511 VALUES LESS THAN ('2025-12-01'),
+    PARTITION p202512 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+    PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+    PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+    PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+    PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+    PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+    PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+    PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+    PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+    PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+    PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+    PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p202701 VALUES LESS THAN ('2027-02-01'),
+    PARTITION p_max VALUES LESS THAN (MAXVALUE)
+);
+ALTER TABLE indicator_center_data PARTITION BY RANGE COLUMNS(stat_date) (
+    PARTITION p_hist VALUES LESS THAN ('2025-01-01'),
+    PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+    PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+    PARTITION p202503 VALUES LESS THAN ('2025-04-01'),
+    PARTITION p202504 VALUES LESS THAN ('2025-05-01'),
+    PARTITION p202505 VALUES LESS THAN ('2025-06-01'),
+    PARTITION p202506 VALUES LESS THAN ('2025-07-01'),
+    PARTITION p202507 VALUES LESS THAN ('2025-08-01'),
+    PARTITION p202508 VALUES LESS THAN ('2025-09-01'),
+    PARTITION p202509 VALUES LESS THAN ('2025-10-01'),
+    PARTITION p202510 VALUES LESS THAN ('2025-11-01'),
+    PARTITION p202511 VALUES LESS THAN ('2025-12-01'),
+    PARTITION p202512 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+    PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+    PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+    PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+    PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+    PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+    PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+    PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+    PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+    PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+    PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+    PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p202701 VALUES LESS THAN ('2027-02-01'),
+    PARTITION p_max VALUES LESS THAN (MAXVALUE)
+);
@@ -0,0 +1,47 @@
+-- 006 周 / 月 / 季预聚合表（services/rollup_service.py 维护，GET /rollup、/center/rollup 读取）：
+--   每个 (指标, 区县 / 支撑中心, 周期) 一行，周期按 dim_date 的 iso_year+iso_week / year+month / year+quarter 划分，
+--   period_start 为周一 / 月初 / 季初；value / score 的 avg、last（周期内最后统计日期的值）、min、max。
+--   写入路径在同一事务内只重算受影响的周期；建表后执行 python manage.py rebuild-rollup 回填历史数据。
+CREATE TABLE IF NOT EXISTS indicator_rollup (
+    indicator_id   INT          NOT NULL COMMENT '指标ID',
+    district_id    INT          NOT NULL COMMENT '区县ID',
+    period         VARCHAR(8)   NOT NULL COMMENT '周期：week / month / quarter',
+    period_start   DATE         NOT NULL COMMENT '周期起始日',
+    last_date      DATE         NOT NULL COMMENT '周期内最后统计日期',
+    days           SMALLINT     NOT NULL COMMENT '周期内数据天数',
+    value_avg      DECIMAL(18,4) NULL COMMENT '完成值均值',
+    value_last     DECIMAL(18,4) NULL COMMENT '完成值（最后统计日期）',
+    value_min      DECIMAL(18,4) NULL COMMENT '完成值最小值',
+    value_max      DECIMAL(18,4) NULL COMMENT '完成值最大值',
+    score_avg      DECIMAL(18,4) NULL COMMENT '得分均值',
+    score_last     DECIMAL(18,4) NULL COMMENT '得分（最后统计日期）',
+    score_min      DECIMAL(18,4) NULL COMMENT '得分最小值',
+    score_max      DECIMAL(18,4) NULL COMMENT '得分最大值',
+    update_time    DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+
+    PRIMARY KEY (indicator_id, district_id, period, period_start),
+    KEY ix_rollup_period (period, period_start),
+    KEY ix_rollup_district (district_id, period, period_start)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS indicator_center_rollup (
+    indicator_id   INT          NOT NULL COMMENT '指标ID',
+    center_id      INT          NOT NULL COMMENT '支撑中心ID',
+    period         VARCHAR(8)   NOT NULL COMMENT '周期：week / month / quarter',
+    period_start   DATE         NOT NULL COMMENT '周期起始日',
+    last_date      DATE         NOT NULL COMMENT '周期内最后统计日期',
+    days           SMALLINT     NOT NULL COMMENT '周期内数据天数',
+    value_avg      DECIMAL(18,4) NULL COMMENT '完成值均值',
+    value_last     DECIMAL(18,4) NULL COMMENT '完成值（最后统计日期）',
+    value_min      DECIMAL(18,4) NULL COMMENT '完成值最小值',
+    value_max      DECIMAL(18,4) NULL COMMENT '完成值最大值',
+    score_avg      DECIMAL(18,4) NULL COMMENT '得分均值',
+    score_last     DECIMAL(18,4) NULL COMMENT '得分（最后统计日期）',
+    score_min      DECIMAL(18,4) NULL COMMENT '得分最小值',
+    score_max      DECIMAL(18,4) NULL COMMENT '得分最大值',
+    update_time    DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+
+    PRIMARY KEY (indicator_id, center_id, period, period_start),
+    KEY ix_center_rollup_period (period, period_start),
+    KEY ix_center_rollup_center (center_id, period, period_start)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
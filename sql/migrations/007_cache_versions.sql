@@ -0,0 +1,9 @@
+-- 007 跨 worker 共享的缓存版本表（core/shared_version.py）：鉴权（perm）等进程内缓存按版本号失效。
+-- 新部署由 sql/user.sql 建表；已有库执行本迁移补建。表缺失时应用只记录告警，各 worker 退化为按 TTL 失效。
+CREATE TABLE IF NOT EXISTS cache_versions (
+    name        VARCHAR(32) PRIMARY KEY COMMENT '缓存名称，如 perm',
+    version     BIGINT NOT NULL DEFAULT 0 COMMENT '版本号',
+    update_time DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='共享缓存版本表';
+
+INSERT IGNORE INTO cache_versions (name, version) VALUES ('perm', 0);
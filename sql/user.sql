@@ -39,6 +39,15 @@ CREATE TABLE `user` (
     CONSTRAINT fk_user_role FOREIGN KEY (`role_id`) REFERENCES `roles`(`role_id`)
 )ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='用户信息表';
 
+-- 缓存版本表：权限/角色/用户状态变更时递增，各 worker 每秒至多查询一次以判断本地鉴权缓存是否失效
+CREATE TABLE `cache_versions` (
+  `name` VARCHAR(32) PRIMARY KEY COMMENT '缓存名称，如 perm',
+  `version` BIGINT NOT NULL DEFAULT 0 COMMENT '版本号',
+  `update_time` DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='共享缓存版本表';
+
+INSERT INTO cache_versions (name, version) VALUES ('perm', 0);
+
 INSERT INTO roles (role_code, role_name) VALUES
 ('admin', '超级管理员'),
 ('indicator_admin', '指标管理员'),